@@ -0,0 +1,104 @@
+"""
+Benchmark: events per second with the default `timedelta` clock and with the integer tick clock.
+
+Runs an algorithm on rings of increasing size, under a synchronous and an asynchronous model:
+- `learn`: the "Learn the Topology" algorithm, started at a single process;
+- `tokens`: every process circulates a token for a fixed number of hops, which keeps N events in the
+    queue at all times while doing almost no work in the handlers (i.e., it measures the simulator itself).
+
+Usage:
+    python benchmarks/bench_clock.py [--algorithm tokens] [--sizes 50 100 200] [--repeat 3]
+"""
+
+import argparse
+import time
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+from dapy.algo.learn import LearnGraphAlgorithm, Start
+from dapy.core import Algorithm, Asynchronous, Event, Message, Pid, Ring, State, Synchronous, SynchronyModel, System
+from dapy.sim import Settings, Simulator
+
+
+@dataclass(frozen=True)
+class Token(Message):
+    hops: int
+
+
+@dataclass(frozen=True)
+class TokenState(State):
+    received: int = 0
+
+
+@dataclass(frozen=True)
+class Tokens(Algorithm):
+    """
+    Every process sends a token to its successor on the ring, which forwards it for `max_hops` hops.
+    """
+    max_hops: int = 20
+
+    def initial_state(self, pid: Pid) -> TokenState:
+        return TokenState(pid)
+
+    def on_start(self, init_state: TokenState) -> tuple[TokenState, list[Event]]:
+        return init_state, [Token(target=self._next(init_state.pid), sender=init_state.pid, hops=0)]
+
+    def on_event(self, old_state: TokenState, event: Event) -> tuple[TokenState, list[Event]]:
+        new_state = old_state.cloned_with(received=old_state.received + 1)
+        if event.hops + 1 >= self.max_hops:
+            return new_state, []
+        return new_state, [Token(target=self._next(old_state.pid), sender=old_state.pid, hops=event.hops + 1)]
+
+    def _next(self, pid: Pid) -> Pid:
+        return Pid(pid.id % len(self.system.topology) + 1)
+
+
+def events_per_second(
+    algorithm: str, size: int, synchrony: SynchronyModel, settings: Settings, repeat: int
+) -> float:
+    """
+    Return the best rate (over `repeat` runs) at which events are processed.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        system = System(topology=Ring.of_size(size), synchrony=synchrony)
+        if algorithm == "learn":
+            sim = Simulator.from_system(system, LearnGraphAlgorithm(system), settings=settings, seed=0)
+            sim.start()
+            sim.schedule_event(timedelta(seconds=0), Start(target=Pid(1)))
+        else:
+            sim = Simulator.from_system(system, Tokens(system), settings=settings, seed=0)
+            sim.start()
+        steps = 0
+        start = time.perf_counter()
+        while not sim.is_finished():
+            sim.advance_step()
+            steps += 1
+        best = max(best, steps / (time.perf_counter() - start))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--algorithm", choices=["learn", "tokens"], default="tokens")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    models = {
+        "synchronous": Synchronous(fixed_delay=timedelta(milliseconds=1)),
+        "asynchronous": Asynchronous(),
+    }
+    print(f"{'model':<14} {'size':>6} {'timedelta ev/s':>16} {'ticks ev/s':>12} {'gain':>7}")
+    for name, synchrony in models.items():
+        for size in args.sizes:
+            base = events_per_second(args.algorithm, size, synchrony, Settings(), args.repeat)
+            ticks = events_per_second(
+                args.algorithm, size, synchrony, Settings(ticks_per_second=1_000_000), args.repeat
+            )
+            print(f"{name:<14} {size:>6} {base:>16,.0f} {ticks:>12,.0f} {ticks / base:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
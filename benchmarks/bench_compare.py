@@ -0,0 +1,88 @@
+"""
+Benchmark: hashing and equality of the core value types.
+
+Covers the comparisons done most often by simulations and by their traces:
+- `Pid`: equality, hashing and ordering (sorting);
+- `Channel`: hashing and equality of directed and undirected channels;
+- `ProcessSet`, `ChannelSet`: hashing and equality of large sets, identical or equal but distinct;
+- `State`: hashing and equality of `LearnState` instances, identical or equal but distinct;
+- `Configuration`: equality and `changed_from` between configurations derived from each other.
+
+Each line reports the number of operations per second (best of `--repeat` runs).
+
+Usage:
+    python benchmarks/bench_compare.py [--count 100000] [--size 2000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+from itertools import pairwise
+from typing import Callable
+
+from dapy.algo.learn import LearnState
+from dapy.core import Channel, ChannelSet, Pid, ProcessSet
+from dapy.sim import Configuration
+
+
+def operations_per_second(operation: Callable[[], object], count: int, repeat: int) -> float:
+    """
+    Return the best rate (over `repeat` runs) at which `operation` is called.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            operation()
+        best = max(best, count / (time.perf_counter() - start))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--size", type=int, default=2000, help="number of processes in sets and configurations")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pids = [Pid(i + 1) for i in range(args.size)]
+    p, q = pids[0], pids[1]
+    directed = Channel(p, q)
+    undirected, undirected_twin = Channel(q, p, directed=False), Channel(p, q, directed=False)
+    processes, processes_twin = ProcessSet(pids), ProcessSet(reversed(pids))
+    channels = ChannelSet(Channel(a, b) for a, b in pairwise(pids))
+    channels_twin = ChannelSet(Channel(a, b) for a, b in pairwise(pids))
+    state = LearnState(pid=p, neighbors_i=processes, proc_known_i=processes, channels_known_i=channels)
+    state_twin = LearnState(pid=p, neighbors_i=processes_twin, proc_known_i=processes_twin,
+                            channels_known_i=channels_twin)
+    config = Configuration.from_states(LearnState(pid=pid) for pid in pids)
+    derived = config.updated([LearnState(pid=pids[args.size // 2], part_i=True)])
+    rebuilt = Configuration.from_states(config)
+    unsorted = pids[::-1]
+
+    operations = {
+        "Pid ==": lambda: p == q,
+        "Pid hash": lambda: hash(p),
+        "Pid sort (x1000)": lambda: sorted(unsorted[:1000]),
+        "Channel hash (directed)": lambda: hash(directed),
+        "Channel hash (undirected)": lambda: hash(undirected),
+        "Channel == (undirected)": lambda: undirected == undirected_twin,
+        "ProcessSet hash": lambda: hash(processes),
+        "ProcessSet == (same)": lambda: processes == processes,
+        "ProcessSet == (equal)": lambda: processes == processes_twin,
+        "ChannelSet hash": lambda: hash(channels),
+        "ChannelSet == (equal)": lambda: channels == channels_twin,
+        "State hash": lambda: hash(state),
+        "State == (same)": lambda: state == state,
+        "State == (equal)": lambda: state == state_twin,
+        "Configuration == (derived)": lambda: config == derived,
+        "Configuration == (rebuilt)": lambda: config == rebuilt,
+        "changed_from (derived)": lambda: list(derived.changed_from(config)),
+    }
+    for name, operation in operations.items():
+        count = args.count // 100 if "x1000" in name or "rebuilt" in name else args.count
+        print(f"{name + ' /s':<32} {operations_per_second(operation, count, args.repeat):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
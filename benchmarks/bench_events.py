@@ -0,0 +1,78 @@
+"""
+Benchmark: memory per event and state, and throughput of `State.cloned_with`.
+
+Uses the messages and states of the "Learn the Topology" algorithm:
+- memory: bytes allocated per `PositionMsg`, `TimedEvent` and `LearnState` (measured with `tracemalloc`);
+- clones: number of `LearnState.cloned_with` calls per second, updating one and two attributes.
+
+Usage:
+    python benchmarks/bench_events.py [--count 100000] [--repeat 3]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from datetime import timedelta
+from typing import Callable
+
+from dapy.algo.learn import LearnState, PositionMsg
+from dapy.core import Pid, ProcessSet
+from dapy.sim import TimedEvent
+
+
+def bytes_per_object(make: Callable[[int], object], count: int) -> float:
+    """
+    Return the number of bytes allocated per object created by `make`.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [make(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list holding the objects is not part of their size
+    return (after - before) / len(objects) - 8
+
+
+def clones_per_second(clone: Callable[[LearnState], LearnState], count: int, repeat: int) -> float:
+    """
+    Return the best rate (over `repeat` runs) at which states are cloned.
+    """
+    state = LearnState(pid=Pid(1), neighbors_i=ProcessSet({Pid(2), Pid(3)}))
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            state = clone(state)
+        best = max(best, count / (time.perf_counter() - start))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    neighbors = ProcessSet({Pid(1), Pid(3)})
+    message = PositionMsg(target=Pid(1), sender=Pid(2), origin=Pid(2), neighbors=neighbors)
+    memory = {
+        "PositionMsg": lambda i: PositionMsg(target=Pid(1), sender=Pid(2), origin=Pid(2), neighbors=neighbors),
+        "TimedEvent": lambda i: TimedEvent(time=timedelta(seconds=1), event=message),
+        "LearnState": lambda i: LearnState(pid=Pid(1), neighbors_i=neighbors, part_i=True),
+    }
+    for name, make in memory.items():
+        print(f"{name + ' bytes':<28} {bytes_per_object(make, args.count):>12,.0f}")
+
+    clones = {
+        "cloned_with (1 attribute)": lambda state: state.cloned_with(part_i=not state.part_i),
+        "cloned_with (2 attributes)": lambda state: state.cloned_with(part_i=True, proc_known_i=state.neighbors_i),
+    }
+    for name, clone in clones.items():
+        print(f"{name + ' /s':<28} {clones_per_second(clone, args.count, args.repeat):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: events per second with each scheduler, under a synchronous model.
+
+First measures the schedulers alone (pop one event, push it back one fixed delay later), then runs the
+token-passing workload of `bench_clock.py` on rings of increasing size, with the heap scheduler and with
+the calendar (bucket) scheduler, using both the default and the integer clock.
+
+Usage:
+    python benchmarks/bench_scheduler.py [--sizes 100 1000 10000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+from datetime import timedelta
+
+from bench_clock import Tokens
+
+from dapy.core import Ring, Synchronous, System
+from dapy.sim import CalendarScheduler, HeapScheduler, Scheduler, Settings, Simulator
+
+
+def operations_per_second(size: int, scheduler: type[Scheduler], operations: int = 200_000) -> float:
+    """
+    Return the rate of pop/push pairs on a scheduler holding `size` events at a fixed delay from one another.
+    """
+    queue = scheduler()
+    for i in range(size):
+        queue.push(0, i)
+    start = time.perf_counter()
+    for _ in range(operations):
+        at, event = queue.pop()
+        queue.push(at + 1, event)
+    return operations / (time.perf_counter() - start)
+
+
+def events_per_second(size: int, scheduler: type[Scheduler], settings: Settings, repeat: int) -> float:
+    """
+    Return the best rate (over `repeat` runs) at which events are processed.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        system = System(topology=Ring.of_size(size), synchrony=Synchronous(fixed_delay=timedelta(milliseconds=1)))
+        sim = Simulator.from_system(system, Tokens(system), settings=settings, scheduler=scheduler())
+        sim.start()
+        steps = 0
+        start = time.perf_counter()
+        while not sim.is_finished():
+            sim.advance_step()
+            steps += 1
+        best = max(best, steps / (time.perf_counter() - start))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pending':>8} {'heap ops/s':>12} {'calendar ops/s':>15} {'gain':>7}")
+    for size in args.sizes:
+        heap = operations_per_second(size, HeapScheduler)
+        calendar = operations_per_second(size, CalendarScheduler)
+        print(f"{size:>8} {heap:>12,.0f} {calendar:>15,.0f} {calendar / heap:>6.2f}x")
+    print()
+
+    print(f"{'clock':<10} {'size':>6} {'heap ev/s':>12} {'calendar ev/s':>14} {'gain':>7}")
+    for clock, settings in [("timedelta", Settings()), ("ticks", Settings(ticks_per_second=1_000_000))]:
+        for size in args.sizes:
+            heap = events_per_second(size, HeapScheduler, settings, args.repeat)
+            calendar = events_per_second(size, CalendarScheduler, settings, args.repeat)
+            print(f"{clock:<10} {size:>6} {heap:>12,.0f} {calendar:>14,.0f} {calendar / heap:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
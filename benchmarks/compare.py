@@ -0,0 +1,64 @@
+"""
+Compare two result files of the benchmark suite (see `run.py`), e.g., of two commits.
+
+For each case present in both files, prints the ratio (new / old) of its events per second, peak memory and
+trace size, and flags the regressions: a throughput lower, or a peak memory or trace size higher, by more than
+`--threshold` (a fraction). Exits with status 1 if there is any regression.
+
+Usage:
+    python benchmarks/compare.py old.json new.json [--threshold 0.1]
+"""
+
+import argparse
+import json
+import sys
+
+from typing import Any
+
+# metric, and whether higher values are better
+METRICS = (("events_per_sec", True), ("peak_rss_kb", False), ("trace_bytes", False))
+
+
+def load(path: str) -> tuple[dict[str, Any], dict[tuple[str, int, str], dict[str, Any]]]:
+    """
+    Load a result file, as its environment and its results by case.
+    """
+    with open(path) as file:
+        report = json.load(file)
+    return report["environment"], {(r["topology"], r["size"], r["model"]): r for r in report["results"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change flagged as a regression")
+    args = parser.parse_args()
+
+    old_environment, old = load(args.old)
+    new_environment, new = load(args.new)
+    print(f"old: {old_environment.get('commit')} ({old_environment.get('date')})")
+    print(f"new: {new_environment.get('commit')} ({new_environment.get('date')})")
+    print(f"{'case':<48} " + " ".join(f"{metric:>16}" for metric, _ in METRICS))
+
+    regressions = 0
+    for case in sorted(old.keys() & new.keys()):
+        cells = []
+        for metric, higher_is_better in METRICS:
+            before, after = old[case][metric], new[case][metric]
+            ratio = after / before if before else float("inf") if after else 1.0
+            worse = ratio < 1 - args.threshold if higher_is_better else ratio > 1 + args.threshold
+            regressions += worse
+            cells.append(f"{ratio:>15.2f}x" if not worse else f"{ratio:>14.2f}x!")
+        topology, size, model = case
+        print(f"{f'{topology} {size} {model}':<48} " + " ".join(cells))
+
+    for name, missing in (("old", new.keys() - old.keys()), ("new", old.keys() - new.keys())):
+        if missing:
+            print(f"{len(missing)} case(s) missing from the {name} results", file=sys.stderr)
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
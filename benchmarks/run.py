@@ -0,0 +1,163 @@
+"""
+Benchmark suite: throughput, memory and trace size of `Simulator.run_to_completion`.
+
+Runs the "Learn the Topology" algorithm, started at `Pid(1)`, on each topology (`Ring`, `Star`, `CompleteGraph`
+and `Arbitrary`, a seeded Barabási-Albert graph) at increasing sizes, under each synchrony model. Every case
+runs in a fresh process, so that its peak memory does not depend on the cases run before it, and reports:
+- `events`: the number of events processed, and `events_per_sec`, the best rate over `--repeat` runs
+    (including the setup of the simulator);
+- `peak_rss_kb`: the peak resident set size of the process after the timed runs;
+- `trace_bytes`: the size of the trace of one more run, streamed to a compressed `FileTraceSink`.
+
+Delays are drawn from a fixed seed, so that two runs of a case process the same events.
+The results are written as JSON (see `compare.py` to compare two result files).
+
+Usage:
+    python benchmarks/run.py [--output results.json] [--sizes 8 16 32] [--topologies ring star]
+                             [--models synchronous asynchronous] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from dapy.algo.learn import LearnGraphAlgorithm, Start
+from dapy.core import (
+    Asynchronous, BarabasiAlbert, CompleteGraph, NetworkTopology, PartiallySynchronous, Pid, Ring, Star,
+    StochasticExponential, Synchronous, SynchronyModel, System,
+)
+from dapy.core.topology import Arbitrary
+from dapy.sim import FileTraceSink, Simulator, TraceReader
+
+SEED = 0
+
+
+def arbitrary(size: int) -> Arbitrary:
+    """
+    Connected graph with a heavy-tailed degree distribution, as an adjacency list.
+    """
+    graph = BarabasiAlbert.of_size(size, min(2, size - 1), seed=SEED)
+    return Arbitrary.from_((pid, neighbor) for pid in graph for neighbor in graph.neighbors_of(pid))
+
+
+TOPOLOGIES: dict[str, Callable[[int], NetworkTopology]] = {
+    "ring": Ring.of_size,
+    "star": Star.of_size,
+    "complete": CompleteGraph.of_size,
+    "arbitrary": arbitrary,
+}
+
+MODELS: dict[str, Callable[[], SynchronyModel]] = {
+    "synchronous": lambda: Synchronous(fixed_delay=timedelta(seconds=1)),
+    "asynchronous": lambda: Asynchronous(base_delay=timedelta(seconds=1)),
+    "partially_synchronous": lambda: PartiallySynchronous(fixed_delay=timedelta(seconds=1), gst=timedelta(seconds=5)),
+    "stochastic_exponential": lambda: StochasticExponential(delta_t=timedelta(seconds=1)),
+}
+
+
+def simulate(topology: str, size: int, model: str, sink: FileTraceSink | None = None) -> Simulator:
+    """
+    Run one simulation of a case to completion.
+    """
+    system = System(topology=TOPOLOGIES[topology](size), synchrony=MODELS[model]())
+    sim = Simulator.from_system(system, LearnGraphAlgorithm(system), sink=sink, seed=SEED)
+    sim.start()
+    sim.schedule_event(timedelta(seconds=0), Start(target=Pid(1)))
+    sim.run_to_completion()
+    return sim
+
+
+def run_case(topology: str, size: int, model: str, repeat: int) -> dict[str, Any]:
+    """
+    Measure one case; meant to run in a fresh process.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        simulate(topology, size, model)
+        best = min(best, time.perf_counter() - start)
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # reported in bytes rather than kilobytes
+        peak_rss_kb //= 1024
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "trace.dapy")
+        with FileTraceSink(path, compress=True) as sink:
+            simulate(topology, size, model, sink)
+        trace_bytes = os.path.getsize(path)
+        with TraceReader(path) as reader:
+            # runs go to completion, so every scheduled event is processed
+            events = reader.event_count()
+
+    return {
+        "topology": topology,
+        "size": size,
+        "model": model,
+        "events": events,
+        "seconds": best,
+        "events_per_sec": events / best if best > 0 else 0.0,
+        "peak_rss_kb": peak_rss_kb,
+        "trace_bytes": trace_bytes,
+    }
+
+
+def environment() -> dict[str, Any]:
+    """
+    Describe the machine and the revision the benchmarks ran on.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="-", help="file to write the JSON results to (default: stdout)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--topologies", nargs="+", choices=list(TOPOLOGIES), default=list(TOPOLOGIES))
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    for topology in args.topologies:
+        for size in args.sizes:
+            for model in args.models:
+                # one process per case, so that peak memory is measured for that case alone
+                with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+                    result = executor.submit(run_case, topology, size, model, args.repeat).result()
+                print(f"{topology:>10} {size:>6} {model:>24} {result['events']:>10,} events "
+                      f"{result['events_per_sec']:>12,.0f} events/s {result['peak_rss_kb']:>10,} KiB "
+                      f"{result['trace_bytes']:>12,} B", file=sys.stderr)
+                results.append(result)
+
+    report = json.dumps({"environment": environment(), "results": results}, indent=2)
+    if args.output == "-":
+        print(report)
+    else:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ from dapy.core import Algorithm, Event, Message, Signal, State
 # Define the State of a process in the algorithm.
 #
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MyState(State):
     # inherited from State
     #   pid: Pid
@@ -17,7 +17,7 @@ class MyState(State):
 # Define the messages and signals used in the algorithm.
 #
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MyMessage(Message):
     # inherited from Message
     #   target: Pid
@@ -25,7 +25,7 @@ class MyMessage(Message):
     # declare any other relevant fields
     ...
     
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MySignal(Signal):
     # inherited from Signal
     #   target: Pid
@@ -10,16 +10,16 @@ from ..core import Algorithm, Channel, ChannelSet, Event, Message, Pid, ProcessS
 #
 # Messages and signals used in the algorithm.
 #
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PositionMsg(Message):
     origin: Pid
     neighbors: ProcessSet = field(default_factory=ProcessSet)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Start(Signal):
     pass
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GraphIsKnown(Signal):
     """Event to signal that the graph is known."""
     pass
@@ -29,12 +29,15 @@ class GraphIsKnown(Signal):
 #
 # State of a process in the algorithm.
 #
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LearnState(State):
     neighbors_i: ProcessSet = field(default_factory=ProcessSet)
     proc_known_i: ProcessSet = field(default_factory=ProcessSet)
     channels_known_i: ChannelSet = field(default_factory=ChannelSet)
     part_i: bool = False
+    # endpoints of known channels that are not known processes yet;
+    # the graph is known when it becomes empty (see line (13) below)
+    unknown_i: ProcessSet = field(default_factory=ProcessSet)
 
 
 
@@ -61,7 +64,7 @@ class LearnGraphAlgorithm(Algorithm):
     def initial_state(self, pid: Pid) -> LearnState:
         return LearnState(
             pid=pid,
-            neighbors_i=self.system.topology.neighbors_of(pid),
+            neighbors_i=self.system.neighbors_of(pid),
             part_i=False,
         )
     
@@ -96,10 +99,12 @@ class LearnGraphAlgorithm(Algorithm):
                     # (8) proc_known_i := proc_known_i ∪ {id}
                     # (9) channels_known_i := channel_known_i ∪ {<id, id_k> | id_k in neighbors>}
                     # add the new position to the state
+                    proc_known_i = new_state.proc_known_i + id
                     new_state = new_state.cloned_with(
-                        proc_known_i=new_state.proc_known_i + id,
+                        proc_known_i=proc_known_i,
                         channels_known_i=new_state.channels_known_i +
                             ChannelSet( Channel(id, neighbor) for neighbor in neighbors ),
+                        unknown_i=(new_state.unknown_i - id) + (neighbors - proc_known_i),
                     )
                     # (10) for each id_y in neighbors_i \ {id_x} do
                     # (11)  send POSITION(id, neighbors) to id_y
@@ -113,10 +118,8 @@ class LearnGraphAlgorithm(Algorithm):
                     # (13) if forall<id_j, id_k> in channels_known_i : {id_j, id_k} in proc_known_i) then
                     # (14)    p_i knowns the communication graph
                     # (15) end if
-                    if all(
-                        c_jk.r in new_state.proc_known_i and c_jk.s in new_state.proc_known_i
-                        for c_jk in new_state.channels_known_i
-                    ):
+                    # the endpoints still unknown are tracked incrementally, instead of checking every channel
+                    if not new_state.unknown_i:
                         new_events.append(GraphIsKnown(target=new_state.pid))
                     
                 # return the new states and all send events
@@ -153,6 +156,7 @@ class LearnGraphAlgorithm(Algorithm):
         state = state.cloned_with(
             proc_known_i=ProcessSet(state.pid),
             channels_known_i=ChannelSet( Channel(state.pid, neighbor) for neighbor in state.neighbors_i ),
+            unknown_i=state.neighbors_i - state.pid,
             part_i=True, # part_i <- true
         )
         return state, events
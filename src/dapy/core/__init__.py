@@ -13,13 +13,17 @@ The core components include:
         - `.event.Message`: Abstract subclass that represents messages sent and received between processes.
 - `.pid`:
     - `.pid.Pid`: Represents process identifiers (PIDs) in the distributed system.
+    - `.pid.PidIndex`: Represents a dense index of a set of PIDs.
     - `.pid.ProcessSet`: Represents a set of process identities.
     - `.pid.Channel`: Represents communication channels between processes.
     - `.pid.ChannelSet`: Represents a set of communication channels.
+- `.rng`:
+    - `.rng.RandomStream`: Represents a seeded, splittable stream of random values.
 - `.state`:
     - `.state.State`: Abstract class to define the state of a process in the distributed system.
 - `.system`:
     - `.system.System`: Represents the distributed system model, including its topology and synchrony model.
+    - `.system.NeighborCacheStats`: Hit and miss counts of the neighbor cache of a system.
     - `.system.SynchronyModel`: Base class to represents a model of synchrony.
         - `.system.Synchronous`: Represents a **synchronous** model (fixed message delays).
         - `.system.Asynchronous`: Represents an **asynchronous** model (unpredictable delays).
@@ -28,12 +32,19 @@ The core components include:
         - `.system.StochasticExponential`: Represents a stochastic exponential model where transmission
             delays follow an exponential distribution.
 - `.topology`:
-    - `.topology.NetworkTopology`: Represents the topology of the distributed system.
+    - `.topology.NetworkTopology`: Represents the topology of the distributed system, with cached analytics
+        (breadth-first layers, eccentricities, diameter and degree histogram).
         - `.topology.CompleteGraph`: Represents a complete graph topology for the distributed system.
         - `.topology.Ring`: Represents a ring topology for the distributed system.
         - `.topology.Star`: Represents a star topology for the distributed system.
         - `.topology.ArbitraryGraph`: Represents an arbitrary graph topology for the distributed system,
             represented by an adjacency list.
+        - `.topology.CSRTopology`: Represents an arbitrary graph topology in compressed sparse row form,
+            suited to large graphs.
+        - `.topology.Grid`, `.topology.Torus`, `.topology.Hypercube`, `.topology.KaryTree`: Represent
+            regular topologies whose neighbors are computed on the fly.
+        - `.topology.ErdosRenyi`, `.topology.BarabasiAlbert`, `.topology.RandomRegular`: Represent
+            seeded random graphs, generated in CSR form.
 
 This module is essential for defining distributed algorithms, which is done as follows:
 ```python
@@ -43,16 +54,16 @@ from dataclasses import dataclass
 from dapy.core import Algorithm, Event, Signal, Message, Pid, State
 
 # 2. Define a state of a process by subclassing the State class.
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MyState(State):
     some_attribute: int = 0
     ...
 
 # 3. Define signal(s) and message(s) by subclassing the relevant class.
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MySignal(Signal):
     pass
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MyMessage(Message):
     some_information: str
     
@@ -77,15 +88,26 @@ from .event import Signal as Signal
 from .pid import Channel as Channel
 from .pid import ChannelSet as ChannelSet
 from .pid import Pid as Pid
+from .pid import PidIndex as PidIndex
 from .pid import ProcessSet as ProcessSet
+from .rng import RandomStream as RandomStream
 from .state import State as State
 from .system import Asynchronous as Asynchronous
+from .system import NeighborCacheStats as NeighborCacheStats
 from .system import PartiallySynchronous as PartiallySynchronous
 from .system import StochasticExponential as StochasticExponential
 from .system import Synchronous as Synchronous
 from .system import SynchronyModel as SynchronyModel
 from .system import System as System
+from .topology import BarabasiAlbert as BarabasiAlbert
 from .topology import CompleteGraph as CompleteGraph
+from .topology import CSRTopology as CSRTopology
+from .topology import ErdosRenyi as ErdosRenyi
+from .topology import Grid as Grid
+from .topology import Hypercube as Hypercube
+from .topology import KaryTree as KaryTree
 from .topology import NetworkTopology as NetworkTopology
+from .topology import RandomRegular as RandomRegular
 from .topology import Ring as Ring
 from .topology import Star as Star
+from .topology import Torus as Torus
@@ -1,11 +1,11 @@
 from abc import ABC
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Self
 
 from .pid import Pid
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Event(ABC):
     """
     Abstract class to represent an event in the system.
@@ -18,6 +18,8 @@ class Event(ABC):
     
     This class is not designed to be instantiated directly, but rather
     by subclassing either one of the two subclasses.
+    Events are slotted dataclasses; subclasses should also be declared with `slots=True`,
+    as an instance of a subclass without slots carries a `__dict__` again.
     
     Attributes:
         target: Pid
@@ -29,7 +31,8 @@ class Event(ABC):
         """
         String representation of the start signal.
         """
-        other_attributes = ', '.join(f"{k}={v!s}" for k,v in self.__dict__.items() if k != 'target' and v is not None)
+        values = ((f.name, getattr(self, f.name)) for f in fields(self) if f.name != 'target')
+        other_attributes = ', '.join(f"{k}={v!s}" for k,v in values if v is not None)
         if other_attributes:
             other_attributes = "; " + other_attributes
         return f"{self.__class__.__name__}(@{self.target}{other_attributes})"
@@ -67,7 +70,7 @@ class Event(ABC):
         return -1 if self.target < other.target else 1
     
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Signal(Event):
     """
     Class to represent a signal event.
@@ -77,7 +80,7 @@ class Signal(Event):
     and is typically issued at some processes at the initialization of the system.
     
     Signals are defined by creating subclasses of this class.
-    The subclass must be frozen (immutable) and can hold additional
+    The subclass must be frozen (immutable), should be slotted, and can hold additional
     attributes that are relevant to the signal.
     
     A signal can hold additional information in its attributes, but it is not mandatory.
@@ -91,7 +94,7 @@ class Signal(Event):
             The process identifier (PID) of the process that the signal targets.
     """
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Message(Event):
     """
     Class to represent a send/receive event.
@@ -100,7 +103,7 @@ class Message(Event):
     The sender and the receiver (target) are both specified.
     
     Messages are defined by creating subclasses of this class.
-    The subclass must be frozen (immutable) and can hold additional
+    The subclass must be frozen (immutable), should be slotted, and can hold additional
     attributes that are relevant to the message.
     
     Attributes:
@@ -1,16 +1,76 @@
+import threading
+import weakref
+
 from dataclasses import dataclass, field
-from typing import Iterable, Self
+from itertools import compress, count as count_from
+from typing import Iterable, Iterator, Optional, Self
 
 
-@dataclass(frozen=True, order=True)
+@dataclass(frozen=True, eq=False, slots=True, weakref_slot=True)
 class Pid:
     """
     Class to represent a process identifier (PID).
     
+    PIDs are interned: while a PID is in use, `Pid(i)` returns the same instance for the same `i`, so that
+    PIDs are compared by identity and hashed by their `id`, without building tuples of fields.
+    Each identifier is also numbered densely in the order in which it is first used, which lets sets
+    (see `ProcessSet`) use bitmasks instead of hashing.
+    
     Attributes:
         id (int): The unique identifier for the process.
     """
     id: int
+    # number of the identifier, in order of first use (set by `__new__`)
+    _bit: int = field(init=False, repr=False, compare=False)
+    
+    def __new__(cls, id: int) -> Self:
+        ref = _interned.get(id)
+        pid = ref() if ref is not None else None
+        if pid is None:
+            with _lock:
+                # another thread may have created the PID in the meantime
+                ref = _interned.get(id)
+                pid = ref() if ref is not None else None
+                if pid is None:
+                    pid = object.__new__(cls)
+                    object.__setattr__(pid, 'id', id)
+                    object.__setattr__(pid, '_bit', _bit_of_id(id))
+                    _interned[id] = _PidRef(pid)
+        return pid
+    
+    def __reduce__(self):
+        # unpickling goes through `__new__`, and hence returns the interned instance
+        return (Pid, (self.id,))
+    
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Pid):
+            return NotImplemented
+        return False
+    
+    def __hash__(self) -> int:
+        return hash(self.id)
+    
+    def __lt__(self, other: Self) -> bool:
+        if not isinstance(other, Pid):
+            return NotImplemented
+        return self.id < other.id
+    
+    def __le__(self, other: Self) -> bool:
+        if not isinstance(other, Pid):
+            return NotImplemented
+        return self.id <= other.id
+    
+    def __gt__(self, other: Self) -> bool:
+        if not isinstance(other, Pid):
+            return NotImplemented
+        return self.id > other.id
+    
+    def __ge__(self, other: Self) -> bool:
+        if not isinstance(other, Pid):
+            return NotImplemented
+        return self.id >= other.id
     
     def __str__(self) -> str:
         return f"p{self.id}"
@@ -19,50 +79,255 @@ class Pid:
         return f"{self.__class__.__name__}({self.id})"
 
 
-@dataclass(frozen=True)
+class PidIndex:
+    """
+    Class to represent a dense index of a fixed set of PIDs, numbered 0..N-1 in increasing order.
+    
+    Positions only depend on the indexed PIDs. When their identifiers are consecutive (e.g., the processes
+    of `Ring.of_size`), looking up the position of a PID is a subtraction, without hashing the PID;
+    otherwise, it is a dictionary lookup.
+    It supports the read-only operations of a `dict[Pid, int]`.
+    
+    Attributes:
+        pids (tuple[Pid, ...]): The indexed PIDs, in increasing order.
+    """
+    def __init__(self, pids: Iterable[Pid]):
+        self.pids = tuple(sorted(set(pids)))
+        # identifier of the first PID if identifiers are consecutive, in which case positions are not stored
+        self._offset: Optional[int] = None
+        self._positions: dict[Pid, int] = {}
+        if self.pids and self.pids[-1].id - self.pids[0].id == len(self.pids) - 1:
+            self._offset = self.pids[0].id
+        else:
+            self._positions = {pid: i for i, pid in enumerate(self.pids)}
+            
+    def get(self, pid: Pid, default: Optional[int] = None) -> Optional[int]:
+        """
+        Get the position of a PID, or `default` if it is not indexed.
+        """
+        if self._offset is None:
+            return self._positions.get(pid, default)
+        try:
+            i = pid.id - self._offset
+        except AttributeError:
+            return default
+        return i if 0 <= i < len(self.pids) and self.pids[i] is pid else default
+    
+    def __getitem__(self, pid: Pid) -> int:
+        i = self.get(pid)
+        if i is None:
+            raise KeyError(pid)
+        return i
+    
+    def __contains__(self, pid: Pid) -> bool:
+        return self.get(pid) is not None
+    
+    def __len__(self) -> int:
+        return len(self.pids)
+    
+    def __iter__(self) -> Iterator[Pid]:
+        return iter(self.pids)
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PidIndex):
+            return NotImplemented
+        return self.pids == other.pids
+    
+    def __hash__(self) -> int:
+        return hash(self.pids)
+    
+    def __reduce__(self):
+        return (PidIndex, (self.pids,))
+    
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self.pids)!r})"
+
+
+@dataclass(frozen=True, slots=True)
 class ProcessSet:
     """
     Class to represent a set of processes.
     
+    A large set is stored as an integer bitmask, where the bit of each PID is its number (see `Pid`). Union,
+    membership, inclusion and size are therefore computed on whole machine words at once, and sets that
+    contain most processes take one bit per process. A small set (e.g., the neighbors of a process) is stored
+    as the tuple of the numbers of its PIDs instead, so that it does not take a bitmask as wide as the largest
+    number. Iteration is in increasing order of PIDs, so that it does not depend on the order in which PIDs
+    were numbered.
+    
     Attributes:
         processes (frozenset[Pid]): A set of unique process identifiers.
     """
-    processes: frozenset[Pid] = field(default_factory=frozenset)
+    # bitmask of a large set, or 0
+    _dense: int = 0
+    # numbers of the PIDs of a set of at most `_SMALL` processes, in increasing order of PIDs, or ()
+    _small: tuple[int, ...] = ()
+    # hash of the set, computed on first use
+    _hash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
     
     def __init__(self, processes: Iterable[Pid] | Pid = frozenset()):
         if isinstance(processes, Pid):
-            processes = {processes}
-        object.__setattr__(self, 'processes', frozenset(processes))
+            processes = (processes,)
+        bits = [pid._bit for pid in processes]
+        if len(bits) <= _SMALL:
+            object.__setattr__(self, '_small', _ordered(set(bits)))
+            object.__setattr__(self, '_dense', 0)
+            object.__setattr__(self, '_hash', None)
+        else:
+            self._set_mask(_mask_of(bits))
+        
+    @classmethod
+    def _of_mask(cls, mask: int) -> Self:
+        """
+        Create a set directly from a bitmask.
+        """
+        s = object.__new__(cls)
+        s._set_mask(mask)
+        return s
+    
+    @classmethod
+    def _of_small(cls, small: tuple[int, ...]) -> Self:
+        """
+        Create a set directly from the ordered numbers of at most `_SMALL` PIDs.
+        """
+        s = object.__new__(cls)
+        object.__setattr__(s, '_small', small)
+        object.__setattr__(s, '_dense', 0)
+        object.__setattr__(s, '_hash', None)
+        return s
+    
+    def _set_mask(self, mask: int) -> None:
+        """
+        Initialize the set from a bitmask, in the representation that suits its size.
+        """
+        if mask.bit_count() <= _SMALL:
+            object.__setattr__(self, '_small', _ordered(_bits_in(mask)))
+            object.__setattr__(self, '_dense', 0)
+        else:
+            object.__setattr__(self, '_small', ())
+            object.__setattr__(self, '_dense', mask)
+        object.__setattr__(self, '_hash', None)
+    
+    @property
+    def _mask(self) -> int:
+        """
+        The bitmask of the set, built on the fly for a small set.
+        """
+        return _mask_of(self._small) if self._small else self._dense
+    
+    def _has_bit(self, bit: int) -> bool:
+        """
+        Check if the PID with the given number is in the set.
+        """
+        small = self._small
+        return bit in small if small else (self._dense >> bit) & 1 == 1
+    
+    @property
+    def processes(self) -> frozenset[Pid]:
+        """
+        The processes in the set, as a `frozenset`.
+        """
+        return frozenset(self)
         
     def __str__(self) -> str:
-        return f"{{{','.join(str(p) for p in sorted(self.processes))}}}"
+        return f"{{{','.join(str(p) for p in self)}}}"
     
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}({{{','.join(repr(p) for p in sorted(self.processes))}}})"
+        return f"{self.__class__.__name__}({{{','.join(repr(p) for p in self)}}})"
     
     def __contains__(self, pid: Pid) -> bool:
-        return pid in self.processes
+        return isinstance(pid, Pid) and self._has_bit(pid._bit)
     
     def __len__(self) -> int:
-        return len(self.processes)
+        return len(self._small) if self._small else self._dense.bit_count()
     
-    def __iter__(self) -> Iterable[Pid]:
-        return iter(self.processes)
+    def __iter__(self) -> Iterator[Pid]:
+        if self._small:
+            return map(_pid_of_bit, self._small)
+        # bits follow the order in which PIDs were numbered, which must not leak into the order of iteration
+        pids = [_pid_of_bit(bit) for bit in _bits_in(self._dense)]
+        if not _numbered_in_order:
+            pids.sort(key=_pid_id)
+        return iter(pids)
     
-    def __eq__(self, other: Self) -> bool:
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, ProcessSet):
             return False
-        return self.processes == other.processes
+        # each set has a single representation
+        return self._small == other._small and self._dense == other._dense
+    
+    def __hash__(self) -> int:
+        if self._hash is None:
+            # hashing a large integer reads all of its digits, hence the cache
+            object.__setattr__(self, '_hash', hash(self._small) if self._small else hash(self._dense))
+        return self._hash
+    
+    def __le__(self, other: Self) -> bool:
+        return self.issubset(other)
+    
+    def issubset(self, other: Self) -> bool:
+        """
+        Check if all processes of this set are in the other set.
+        """
+        if self._small:
+            return all(other._has_bit(bit) for bit in self._small)
+        if other._small:
+            # a large set has more processes than a small one, unless it is empty
+            return not self._dense
+        return self._dense & other._dense == self._dense
     
     def __add__(self, other: Self | Pid | Iterable[Pid]) -> Self:
         if isinstance(other, Pid):
-            return ProcessSet(processes=self.processes.union({other}))
-        elif isinstance(other, ProcessSet):
-            return ProcessSet(processes=self.processes.union(other.processes))
-        elif isinstance(other, Iterable):
-            return ProcessSet(processes=self.processes.union(other))
-        else:
-            raise TypeError("Cannot join ProcessSet with non-ProcessSet object")
+            bit = other._bit
+            if self._has_bit(bit):
+                # sets are immutable, so an unchanged set can be shared
+                return self
+            if self._small and len(self._small) < _SMALL:
+                return ProcessSet._of_small(_ordered((*self._small, bit)))
+            return ProcessSet._of_mask(self._mask | (1 << bit))
+        if not isinstance(other, ProcessSet):
+            if not isinstance(other, Iterable):
+                raise TypeError("Cannot join ProcessSet with non-ProcessSet object")
+            other = ProcessSet(other)
+        if self._small and other._small:
+            bits = set(self._small).union(other._small)
+            if len(bits) == len(self._small):
+                return self
+            if len(bits) <= _SMALL:
+                return ProcessSet._of_small(_ordered(bits))
+        mask = self._mask | other._mask
+        return self if mask == self._mask else ProcessSet._of_mask(mask)
+    
+    def __sub__(self, other: Self | Pid | Iterable[Pid]) -> Self:
+        if isinstance(other, Pid):
+            bit = other._bit
+            if not self._has_bit(bit):
+                return self
+            if self._small:
+                return ProcessSet._of_small(tuple(b for b in self._small if b != bit))
+            return ProcessSet._of_mask(self._dense & ~(1 << bit))
+        if not isinstance(other, ProcessSet):
+            if not isinstance(other, Iterable):
+                raise TypeError("Cannot subtract non-ProcessSet object from ProcessSet")
+            other = ProcessSet(other)
+        if self._small:
+            small = tuple(bit for bit in self._small if not other._has_bit(bit))
+            return self if len(small) == len(self._small) else ProcessSet._of_small(small)
+        mask = self._dense & ~other._mask
+        return self if mask == self._dense else ProcessSet._of_mask(mask)
+    
+    def __reduce__(self):
+        # bits are only meaningful within one interpreter, so sets are pickled as their PIDs
+        return (ProcessSet, (tuple(self),))
+    
+    def all_except(self, pid: Pid) -> Self:
+        """
+        Return a view of this set without the given process, which is not built unless it is combined
+        with another set (see `_AllExcept`).
+        """
+        return _AllExcept(self, pid)
         
     @staticmethod
     def empty() -> Self:
@@ -72,7 +337,53 @@ class ProcessSet:
         return ProcessSet()
 
 
-@dataclass(frozen=True, order=True)
+class _AllExcept(ProcessSet):
+    """
+    Lazy view of all processes of a set except one (e.g., the neighbors of a process in a complete graph).
+    
+    Membership, size and iteration are answered from the underlying set, so creating a view costs O(1).
+    The representation of the view is only built when the view is combined with or compared to another set,
+    and is then kept with the view.
+    """
+    __slots__ = ('_all', '_built_set', '_excluded')
+    
+    def __init__(self, all: ProcessSet, excluded: Pid):
+        object.__setattr__(self, '_all', all)
+        object.__setattr__(self, '_excluded', excluded)
+        object.__setattr__(self, '_built_set', None)
+        object.__setattr__(self, '_hash', None)
+    
+    def _built(self) -> ProcessSet:
+        """
+        The set of the view, built from the underlying set on first use.
+        """
+        if self._built_set is None:
+            object.__setattr__(self, '_built_set', self._all - self._excluded)
+        return self._built_set
+        
+    @property
+    def _dense(self) -> int:
+        return self._built()._dense
+    
+    @property
+    def _small(self) -> tuple[int, ...]:
+        return self._built()._small
+    
+    def _has_bit(self, bit: int) -> bool:
+        return bit != self._excluded._bit and self._all._has_bit(bit)
+    
+    def __contains__(self, pid: Pid) -> bool:
+        return pid is not self._excluded and pid in self._all
+    
+    def __len__(self) -> int:
+        return len(self._all) - (self._excluded in self._all)
+    
+    def __iter__(self) -> Iterator[Pid]:
+        excluded = self._excluded
+        return (pid for pid in self._all if pid is not excluded)
+
+
+@dataclass(frozen=True, order=True, slots=True)
 class Channel:
     """
     Class to represent a communication channel between two processes.
@@ -89,6 +400,8 @@ class Channel:
     s: Pid
     r: Pid
     directed: bool = True
+    # hash of the channel, computed on first use
+    _hash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
     
     def __str__(self) -> str:
         return f"<{self.s.id},{self.r.id}>"
@@ -99,10 +412,13 @@ class Channel:
         return f"{self.__class__.__name__}({self.s!r},{self.r!r}, directed=False)"
 
     def __eq__(self, other: Self) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Channel):
             return False
         if self.directed and other.directed:
-            return self.as_tuple() == other.as_tuple()
+            # PIDs are interned
+            return self.s is other.s and self.r is other.r
         else:
             return self.normalized() == other.normalized()
         
@@ -123,10 +439,13 @@ class Channel:
             return 0
         
     def __hash__(self) -> int:
-        if self.directed:
-            return hash(self.as_tuple())
-        else:
-            return hash(self.normalized())
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(self.as_tuple() if self.directed else self.normalized()))
+        return self._hash
+    
+    def __reduce__(self):
+        # the cached hash is not pickled
+        return (Channel, (self.s, self.r, self.directed))
     
     def as_tuple(self) -> tuple[Pid, Pid]:
         """
@@ -138,54 +457,290 @@ class Channel:
         """
         Return a normalized representation of the channel, where `s` <= `r`.
         """
-        if self.s <= self.r:
+        if self.s.id <= self.r.id:
             return (self.s, self.r)
         else:
             return (self.r, self.s)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChannelSet:
     """
     Class to represent a set of channels.
     
+    Like `ProcessSet`, the set is stored as an integer bitmask, where each channel is given a bit the
+    first time it is added to any set. Undirected channels are identified by their normalized pair of PIDs.
+    The set also keeps the bitmask of the endpoints of its channels, so that `endpoints` costs nothing.
+    
     Attributes:
         channels (frozenset[Channel]): A set of unique channels.
     """
-    channels: frozenset[Channel] = field(init=False)
+    _mask: int = 0
+    _ends: int = 0
+    # hash of the mask, computed on first use: hashing a large integer reads all of its digits
+    _hash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
     
     def __init__(self, channels: Iterable[Channel] | Channel = frozenset()):
         if isinstance(channels, Channel):
-            channels = {channels}
-        object.__setattr__(self, 'channels', frozenset(channels))
+            channels = (channels,)
+        bits = [_bit_of_channel(channel) for channel in channels]
+        object.__setattr__(self, '_mask', _mask_of(bits))
+        object.__setattr__(self, '_ends', _mask_of(_ends_of(bits)))
+        object.__setattr__(self, '_hash', None)
+        
+    @classmethod
+    def _of_mask(cls, mask: int, ends: Optional[int] = None) -> Self:
+        """
+        Create a set directly from a bitmask, and optionally the bitmask of the endpoints of its channels.
+        """
+        s = object.__new__(cls)
+        object.__setattr__(s, '_mask', mask)
+        if ends is None:
+            ends = _mask_of(_ends_of(_bits_in(mask)))
+        object.__setattr__(s, '_ends', ends)
+        object.__setattr__(s, '_hash', None)
+        return s
+    
+    @property
+    def channels(self) -> frozenset[Channel]:
+        """
+        The channels in the set, as a `frozenset`.
+        """
+        return frozenset(self)
         
     def __str__(self) -> str:
-        return f"{{{','.join(str(c) for c in sorted(self.channels))}}}"
+        return f"{{{','.join(str(c) for c in sorted(self))}}}"
     
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}({{{','.join(repr(c) for c in sorted(self.channels))}}})"
+        return f"{self.__class__.__name__}({{{','.join(repr(c) for c in sorted(self))}}})"
     
     def __contains__(self, channel: Channel) -> bool:
-        return channel in self.channels
+        if not isinstance(channel, Channel):
+            return False
+        bit = _channel_bits.get(_channel_key(channel))
+        return bit is not None and (self._mask >> bit) & 1 == 1
     
     def __len__(self) -> int:
-        return len(self.channels)
+        return self._mask.bit_count()
     
-    def __iter__(self) -> Iterable[Channel]:
-        return iter(self.channels)
+    def __iter__(self) -> Iterator[Channel]:
+        channels = [_channel_of_bit(bit) for bit in _bits_in(self._mask)]
+        channels.sort(key=_channel_order)
+        return iter(channels)
+    
+    def endpoints(self) -> ProcessSet:
+        """
+        Get the set of processes at either end of a channel of the set.
+        """
+        return ProcessSet._of_mask(self._ends)
     
     def __eq__(self, other: Self) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, ChannelSet):
             return False
-        return self.channels == other.channels
+        return self._mask == other._mask
+    
+    def __hash__(self) -> int:
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(self._mask))
+        return self._hash
+    
+    def __le__(self, other: Self) -> bool:
+        return self.issubset(other)
+    
+    def issubset(self, other: Self) -> bool:
+        """
+        Check if all channels of this set are in the other set.
+        """
+        return self._mask & other._mask == self._mask
     
     def __add__(self, other: Self | Channel | Iterable[Channel]) -> Self:
+        if isinstance(other, Channel) or (isinstance(other, Iterable) and not isinstance(other, ChannelSet)):
+            other = ChannelSet(other)
+        elif not isinstance(other, ChannelSet):
+            raise TypeError("Cannot join ChannelSet with non-ChannelSet object")
+        mask = self._mask | other._mask
+        return self if mask == self._mask else ChannelSet._of_mask(mask, self._ends | other._ends)
+    
+    def __sub__(self, other: Self | Channel | Iterable[Channel]) -> Self:
         if isinstance(other, Channel):
-            return ChannelSet(channels=self.channels.union({other}))
+            mask = self._mask & ~(1 << _bit_of_channel(other))
         elif isinstance(other, ChannelSet):
-            return ChannelSet(channels=self.channels.union(other.channels))
+            mask = self._mask & ~other._mask
         elif isinstance(other, Iterable):
-            return ChannelSet(channels=self.channels.union(other))
+            mask = self._mask & ~ChannelSet(other)._mask
         else:
-            raise TypeError("Cannot join ChannelSet with non-ChannelSet object")
+            raise TypeError("Cannot subtract non-ChannelSet object from ChannelSet")
+        return self if mask == self._mask else ChannelSet._of_mask(mask)
+    
+    def __reduce__(self):
+        return (ChannelSet, (tuple(self),))
+
 
+#
+# Interned PIDs and numbers of PIDs and channels in the bitmasks of sets.
+# Identifiers are numbered in the order in which they are first used, and channels in the order in which they
+# are first added to a set; numbers are shared by all sets of the interpreter. Bitmasks refer to these numbers,
+# so they are kept for the lifetime of the interpreter, but the registries only hold integers: PIDs are held
+# weakly (and channels not at all), so that they are released once no longer used.
+#
+_lock = threading.Lock()
+_interned: dict[int, '_PidRef'] = {}
+_bits: dict[int, int] = {}
+_ids: list[int] = []
+_channel_bits: dict[tuple[int, int, bool], int] = {}
+_channel_keys: list[tuple[int, int, bool]] = []
+# whether identifiers were numbered in increasing order, so that numbers are ordered like PIDs
+_numbered_in_order = True
+# largest process sets stored as a tuple of numbers rather than a bitmask: a small set of late PIDs would
+# otherwise take as many bits as there are PIDs
+_SMALL = 16
+# largest number of bits for which `_bits_in` isolates them one by one rather than scanning all the digits
+_SPARSE_BITS = 32
+# binary digits as flags for `itertools.compress`
+_DIGIT_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class _PidRef(weakref.ref):
+    """
+    Weak reference to an interned PID, which removes the PID from the interned ones once it is released.
+    """
+    __slots__ = ('id',)
+    
+    def __new__(cls, pid: Pid) -> Self:
+        return super().__new__(cls, pid, _forget)
+    
+    def __init__(self, pid: Pid):
+        super().__init__(pid, _forget)
+        self.id = pid.id
+
+
+def _forget(ref: _PidRef) -> None:
+    """
+    Remove a released PID from the interned ones, unless it was already replaced by a new instance.
+    """
+    if _interned.get(ref.id) is ref:
+        del _interned[ref.id]
+
+
+def _bit_of_id(id: int) -> int:
+    """
+    Get the number of an identifier, assigning the next free one if needed (with the lock held).
+    """
+    global _numbered_in_order
+    bit = _bits.get(id)
+    if bit is None:
+        if _ids and id < _ids[-1]:
+            _numbered_in_order = False
+        bit = _bits[id] = len(_ids)
+        _ids.append(id)
+    return bit
+
+
+def _pid_of_bit(bit: int) -> Pid:
+    """
+    Get the PID with the given number.
+    """
+    id = _ids[bit]
+    ref = _interned.get(id)
+    pid = ref() if ref is not None else None
+    return pid if pid is not None else Pid(id)
+
+
+def _ordered(bits: Iterable[int]) -> tuple[int, ...]:
+    """
+    Numbers of PIDs, in increasing order of the PIDs.
+    """
+    return tuple(sorted(bits) if _numbered_in_order else sorted(bits, key=_ids.__getitem__))
+
+
+def _pid_id(pid: Pid) -> int:
+    return pid.id
+
+
+def _channel_order(channel: Channel) -> tuple[int, int, bool]:
+    return (channel.s.id, channel.r.id, channel.directed)
+
+
+def _channel_key(channel: Channel) -> tuple[int, int, bool]:
+    """
+    Identify a channel by the numbers of its pair of PIDs, normalized if the channel is undirected.
+    """
+    s, r = channel.s, channel.r
+    if channel.directed:
+        return (s._bit, r._bit, True)
+    return (s._bit, r._bit, False) if s.id <= r.id else (r._bit, s._bit, False)
+
+
+def _bit_of_channel(channel: Channel) -> int:
+    """
+    Get the bit of a channel, assigning the next free one if needed.
+    """
+    key = _channel_key(channel)
+    bit = _channel_bits.get(key)
+    if bit is None:
+        with _lock:
+            bit = _channel_bits.get(key)
+            if bit is None:
+                bit = _channel_bits[key] = len(_channel_keys)
+                _channel_keys.append(key)
+    return bit
+
+
+def _channel_of_bit(bit: int) -> Channel:
+    """
+    Get the channel with the given bit.
+    """
+    s, r, directed = _channel_keys[bit]
+    return Channel(_pid_of_bit(s), _pid_of_bit(r), directed)
+
+
+def _ends_of(bits: Iterable[int]) -> Iterator[int]:
+    """
+    Iterate over the numbers of the endpoints of the channels with the given bits.
+    """
+    for bit in bits:
+        s, r, _ = _channel_keys[bit]
+        yield s
+        yield r
+
+
+def _mask_of(bits: Iterable[int]) -> int:
+    """
+    Build the bitmask with the given bits set.
+    """
+    bits = list(bits)
+    if len(bits) < 64:
+        mask = 0
+        for bit in bits:
+            mask |= 1 << bit
+        return mask
+    # setting bits one by one would copy the growing integer each time
+    buffer = bytearray(max(bits) // 8 + 1)
+    for bit in bits:
+        buffer[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _bits_in(mask: int) -> Iterator[int]:
+    """
+    Iterate over the bits set in a bitmask, in increasing order.
+    """
+    count = mask.bit_count()
+    if count <= _SPARSE_BITS:
+        # isolating the lowest bit costs a pass over the integer per bit, which is cheap for a few bits
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+        return
+    digits = bin(mask)[:1:-1]
+    if count * 8 > len(digits):
+        # most digits are set: select them all at once rather than searching for each of them
+        yield from compress(count_from(), digits.encode().translate(_DIGIT_FLAGS))
+        return
+    bit = digits.find("1")
+    while bit >= 0:
+        yield bit
+        bit = digits.find("1", bit + 1)
@@ -0,0 +1,111 @@
+import hashlib
+import random
+
+from array import array
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Optional
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+if TYPE_CHECKING:
+    import numpy
+
+
+class RandomStream:
+    """
+    Class to represent a seeded stream of random values.
+    
+    A stream owns its generators, so that simulations using distinct streams neither interfere with each
+    other nor with the global `random` module. A stream can be split into independent child streams
+    (e.g., one per process), whose seeds are derived deterministically from the seed of the parent.
+    
+    Values are drawn from `random` unless `use_numpy` is set, in which case samplers may draw blocks of
+    values from a NumPy generator when NumPy is installed. NumPy draws different values for the same seed,
+    so the values of a seeded stream only depend on whether NumPy is installed when it is opted in.
+    
+    Pickling a stream only keeps its seed: the unpickled stream starts over from the beginning.
+    
+    Attributes:
+        seed (int): The seed of the stream.
+        random (random.Random): The generator of the stream.
+        use_numpy (bool): Whether the stream provides a NumPy generator (see `numpy`).
+    """
+    def __init__(self, seed: Optional[int] = None, use_numpy: bool = False):
+        # without an explicit seed, seeding the `random` module still makes the stream reproducible
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.use_numpy = use_numpy
+        self.random = random.Random(self.seed)
+        self._numpy: Optional[numpy.random.Generator] = None
+        self._buffers: dict[Hashable, _SampleBuffer] = {}
+        
+    @property
+    def numpy(self) -> Optional['numpy.random.Generator']:
+        """
+        NumPy generator of the stream, or `None` if the stream does not use NumPy or NumPy is not installed.
+        """
+        if self._numpy is None and self.use_numpy and _np is not None:
+            self._numpy = _np.random.default_rng(self.random.getrandbits(64))
+        return self._numpy
+    
+    def split(self, key: Hashable) -> 'RandomStream':
+        """
+        Derive an independent child stream identified by a key (e.g., a PID or a channel).
+        The child only depends on the seed of this stream and on the key, not on values drawn so far,
+        and uses NumPy if this stream does.
+        """
+        digest = hashlib.blake2b(f"{self.seed}:{key!r}".encode(), digest_size=8).digest()
+        return RandomStream(int.from_bytes(digest, "little"), self.use_numpy)
+    
+    def buffer(self, sample: Callable[['RandomStream', int], array], block_size: int = 1024) -> '_SampleBuffer':
+        """
+        Get the buffer of values pre-sampled from this stream with the given sampling function.
+        """
+        buffer = self._buffers.get(sample)
+        if buffer is None:
+            buffer = self._buffers[sample] = _SampleBuffer(lambda n: sample(self, n), block_size)
+        return buffer
+    
+    def __getstate__(self) -> dict[str, Any]:
+        return {'seed': self.seed, 'use_numpy': self.use_numpy}
+    
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state['seed'], state.get('use_numpy', False))
+        
+    def __repr__(self) -> str:
+        if self.use_numpy:
+            return f"{self.__class__.__name__}(seed={self.seed}, use_numpy=True)"
+        return f"{self.__class__.__name__}(seed={self.seed})"
+
+
+class _SampleBuffer:
+    """
+    Buffer of pre-sampled random values, refilled `block_size` values at a time.
+    """
+    def __init__(self, sample: Callable[[int], array], block_size: int = 1024):
+        self._sample = sample
+        self.block_size = block_size
+        self._values = array('d')
+        self._pos = 0
+        
+    def take(self, n: int) -> array:
+        """
+        Return the next `n` values.
+        """
+        if self._pos + n > len(self._values):
+            self._values = self._values[self._pos:] + self._sample(max(self.block_size, n))
+            self._pos = 0
+        values = self._values[self._pos:self._pos + n]
+        self._pos += n
+        return values
+    
+    def take_one(self) -> float:
+        """
+        Return the next value.
+        """
+        if self._pos >= len(self._values):
+            self._values = self._sample(self.block_size)
+            self._pos = 0
+        self._pos += 1
+        return self._values[self._pos - 1]
@@ -1,32 +1,122 @@
 from abc import ABC
-from dataclasses import dataclass
-from typing import Any, Iterable, Optional, Self
+from dataclasses import dataclass, field, fields
+from functools import cache, wraps
+from typing import Any, Callable, Iterable, Optional, Self
 
 from .pid import Pid
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class State(ABC):
     """
     Abstract class to represent the state of an algorithm.
+    
+    States are slotted dataclasses; subclasses should also be declared with `slots=True`,
+    as an instance of a subclass without slots carries a `__dict__` again.
+    
+    The equality and hash generated for slotted subclasses are wrapped (see `__init_subclass__`) so that
+    a state equals itself without comparing its fields, its hash is computed once, and states whose
+    hashes are both known and differ are unequal without comparing their fields.
     """
     pid: Pid
+    # hash of the state, computed on first use
+    _hash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __init_subclass__(cls, **kwargs: object):
+        # no zero-argument `super()`: `dataclass(slots=True)` replaces the class that it would refer to
+        super(State, cls).__init_subclass__(**kwargs)
+        # `dataclass(slots=True)` creates the class anew, with the methods it generated in its namespace
+        if '__eq__' in cls.__dict__:
+            cls.__eq__ = _fast_eq(cls.__dict__['__eq__'])
+        if cls.__dict__.get('__hash__') is not None:
+            cls.__hash__ = _cached_hash(cls.__dict__['__hash__'])
     
     def cloned_with(self, **kwargs: dict[str,Any]) -> Self:
         """
         Create a copy of the state with updated attributes.
         """
-        return self.__class__(**{**self.__dict__, **kwargs})
+        names, clone = _cloner(type(self))
+        if not names.issuperset(kwargs):
+            unknown = ', '.join(sorted(set(kwargs) - names))
+            raise TypeError(f"{type(self).__name__} has no attribute(s) {unknown} to update")
+        return clone(self, kwargs)
     
     def as_str(self, keys: Optional[Iterable[str]] = None) -> str:
         """
         String representation of the state.
         """
-        keys = self.__dict__.keys() if keys is None else keys
-        return f"{self.pid}: " + ", ".join(f"{k}={self.__dict__.get(k)!s}" for k in keys if k != "pid")
+        keys = [f.name for f in fields(self) if f.repr] if keys is None else keys
+        return f"{self.pid}: " + ", ".join(f"{k}={getattr(self, k, None)!s}" for k in keys if k != "pid")
     
     def __str__(self) -> str:
         """
         String representation of the state.
         """
         return self.as_str()
+    
+    def __reduce__(self):
+        # the cached hash depends on the numbering of PIDs in the current interpreter (see `ProcessSet`)
+        names = _stored_names(type(self))
+        return (_restored, (type(self), names, tuple(getattr(self, name) for name in names)))
+
+
+@cache
+def _cloner(cls: type) -> tuple[frozenset[str], Callable[[State, dict[str, Any]], State]]:
+    """
+    Get the names of the fields of a state class that are set by its constructor, and a function that
+    calls the constructor with the values of a state, except for the values given in a dictionary.
+    The function is generated once per class, so that cloning does not iterate over the fields.
+    """
+    names = [f.name for f in fields(cls) if f.init]
+    arguments = ", ".join(f"{name}=values['{name}'] if '{name}' in values else state.{name}" for name in names)
+    namespace = {'cls': cls}
+    exec(f"def clone(state, values):\n    return cls({arguments})", namespace)
+    return frozenset(names), namespace['clone']
+
+
+@cache
+def _stored_names(cls: type) -> tuple[str, ...]:
+    """
+    Names of the fields of a state class that are pickled, i.e., all but the cached hash.
+    """
+    return tuple(f.name for f in fields(cls) if f.name != '_hash')
+
+
+def _restored(cls: type, names: tuple[str, ...], values: tuple) -> State:
+    """
+    Rebuild a pickled state without calling its constructor, as unpickling a dataclass does.
+    """
+    state = object.__new__(cls)
+    for name, value in zip(names, values):
+        object.__setattr__(state, name, value)
+    object.__setattr__(state, '_hash', None)
+    return state
+
+
+def _fast_eq(eq: Callable[[State, object], bool]) -> Callable[[State, object], bool]:
+    """
+    Wrap the equality of a state class with shortcuts on identity and on known hashes.
+    """
+    @wraps(eq)
+    def __eq__(self: State, other: object) -> bool:
+        if self is other:
+            return True
+        if other.__class__ is self.__class__ and self._hash is not None and other._hash is not None \
+                and self._hash != other._hash:
+            return False
+        return eq(self, other)
+    return __eq__
+
+
+def _cached_hash(hash_fn: Callable[[State], int]) -> Callable[[State], int]:
+    """
+    Wrap the hash of a state class so that it is computed once per state.
+    """
+    @wraps(hash_fn)
+    def __hash__(self: State) -> int:
+        h = self._hash
+        if h is None:
+            h = hash_fn(self)
+            object.__setattr__(self, '_hash', h)
+        return h
+    return __hash__
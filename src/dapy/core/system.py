@@ -1,26 +1,90 @@
-import random
-
 from abc import ABC, abstractmethod
+from array import array
 from dataclasses import dataclass, field
 from datetime import time, timedelta
-from typing import Iterable
+from functools import cached_property
+from typing import Any, Iterable, Optional
 
-from .pid import Pid, ProcessSet
+from .pid import Pid, PidIndex, ProcessSet
+from .rng import RandomStream
 from .topology import NetworkTopology
 
 
+def ticks_of(delta: timedelta, ticks_per_second: int) -> int:
+    """
+    Convert a time to an integer number of ticks, rounding down to the resolution of the ticks.
+    """
+    return (delta.days * 86_400 + delta.seconds) * ticks_per_second + delta.microseconds * ticks_per_second // 1_000_000
+
+
+def delay_ticks_of(delay: timedelta, ticks_per_second: int) -> int:
+    """
+    Convert a delay to an integer number of ticks, rounding down, but to at least one tick if the delay is positive,
+    so that a message never arrives at the tick it was sent (which would reorder it with signals issued at that tick).
+    """
+    ticks = ticks_of(delay, ticks_per_second)
+    return ticks if ticks > 0 or delay <= timedelta(0) else 1
+
+
+def timedelta_of(ticks: int, ticks_per_second: int) -> timedelta:
+    """
+    Convert an integer number of ticks to a time, rounding down to the resolution of `timedelta`.
+    """
+    seconds, remainder = divmod(ticks, ticks_per_second)
+    return timedelta(seconds=seconds, microseconds=remainder * 1_000_000 // ticks_per_second)
+
+
 @dataclass(frozen=True)
 class SynchronyModel(ABC):
+    """
+    Base class to represent a model of synchrony, i.e., how message delays are determined.
+    
+    Random delays are drawn from the `RandomStream` given to each method. Without one, the model uses its
+    own default stream, seeded from the `random` module when it is first needed.
+    """
     min_delay: timedelta = field(default=timedelta.resolution)
     def __post_init__(self):
         if self.min_delay < timedelta.resolution:
             raise ValueError("Minimum delay must be strictly positive.")
         
     @abstractmethod
-    def arrival_time_for(self, sent_at: time) -> time:
+    def arrival_time_for(self, sent_at: time, rng: Optional[RandomStream] = None) -> time:
         """
         Given a time when a message is sent, return the time when it should arrives.
         """
+    
+    def arrival_times_for(self, sent_at: time, n: int, rng: Optional[RandomStream] = None) -> list[time]:
+        """
+        Given a time when `n` messages are sent, return the times when each of them should arrive.
+        Subclasses override this method to sample all delays at once.
+        """
+        rng = rng or self._rng
+        return [self.arrival_time_for(sent_at, rng) for _ in range(n)]
+    
+    def arrival_ticks_for(self,
+                          sent_at: int,
+                          n: int,
+                          ticks_per_second: int,
+                          rng: Optional[RandomStream] = None,
+    ) -> list[int]:
+        """
+        Same as `arrival_times_for`, with times expressed as integer numbers of ticks.
+        Subclasses override this method to avoid any conversion to and from `timedelta`.
+        """
+        arrivals = self.arrival_times_for(timedelta_of(sent_at, ticks_per_second), n, rng)
+        # delays are positive: an arrival rounded down to the tick it was sent is moved to the next tick
+        return [max(sent_at + 1, ticks_of(arrival, ticks_per_second)) for arrival in arrivals]
+    
+    @cached_property
+    def _rng(self) -> RandomStream:
+        """
+        Default stream, used when no stream is given explicitly.
+        """
+        return RandomStream()
+    
+    def __getstate__(self) -> dict[str, Any]:
+        # the default stream is not part of the model
+        return {k: v for k, v in self.__dict__.items() if k != '_rng'}
 
     
 @dataclass(frozen=True)
@@ -36,8 +100,19 @@ class Synchronous(SynchronyModel):
         if self.fixed_delay < self.min_delay:
             raise ValueError("The fixed delay must be at least as great as the minimum delay.")
     
-    def arrival_time_for(self, sent_at: time) -> time:
+    def arrival_time_for(self, sent_at: time, rng: Optional[RandomStream] = None) -> time:
         return sent_at + self.fixed_delay
+    
+    def arrival_times_for(self, sent_at: time, n: int, rng: Optional[RandomStream] = None) -> list[time]:
+        return [sent_at + self.fixed_delay] * n
+    
+    def arrival_ticks_for(self,
+                          sent_at: int,
+                          n: int,
+                          ticks_per_second: int,
+                          rng: Optional[RandomStream] = None,
+    ) -> list[int]:
+        return [sent_at + delay_ticks_of(self.fixed_delay, ticks_per_second)] * n
 
 
 @dataclass(frozen=True)
@@ -52,8 +127,25 @@ class Asynchronous(SynchronyModel):
         if self.base_delay < self.min_delay:
             raise ValueError("Base delay must be at least as great as the minimum delay.")
     
-    def arrival_time_for(self, sent_at: time) -> time:
-        return sent_at + self.min_delay + self.base_delay * (random.expovariate(lambd=2) + random.uniform(0, 1))
+    def arrival_time_for(self, sent_at: time, rng: Optional[RandomStream] = None) -> time:
+        delays = (rng or self._rng).buffer(_asynchronous_delays)
+        return sent_at + self.min_delay + self.base_delay * delays.take_one()
+    
+    def arrival_times_for(self, sent_at: time, n: int, rng: Optional[RandomStream] = None) -> list[time]:
+        earliest = sent_at + self.min_delay
+        delays = (rng or self._rng).buffer(_asynchronous_delays)
+        return [earliest + self.base_delay * u for u in delays.take(n)]
+    
+    def arrival_ticks_for(self,
+                          sent_at: int,
+                          n: int,
+                          ticks_per_second: int,
+                          rng: Optional[RandomStream] = None,
+    ) -> list[int]:
+        earliest = sent_at + delay_ticks_of(self.min_delay, ticks_per_second)
+        base_delay = ticks_of(self.base_delay, ticks_per_second)
+        delays = (rng or self._rng).buffer(_asynchronous_delays)
+        return [earliest + round(base_delay * u) for u in delays.take(n)]
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -69,24 +161,25 @@ class PartiallySynchronous(Synchronous):
         if self.gst < timedelta.resolution:
             raise ValueError("Global synchronization time (GST) must be a positive time.")
     
-    def arrival_time_for(self, sent_at: time) -> time:
+    def arrival_time_for(self, sent_at: time, rng: Optional[RandomStream] = None) -> time:
         if sent_at < self.gst:
             # If the message is sent before the global synchronization time (GST),
-            match random.choice(["short", "long", "long", "long", "long", "near lost", "near lost", "lost", "lucky"]):
+            r = (rng or self._rng).random
+            match r.choice(["short", "long", "long", "long", "long", "near lost", "near lost", "lost", "lucky"]):
                 case "short":
-                    return sent_at + timedelta(microseconds=0.001) + self.fixed_delay * random.uniform(0, 2)
+                    return sent_at + timedelta(microseconds=0.001) + self.fixed_delay * r.uniform(0, 2)
                 case "long":
                     return (
                         sent_at
                         + timedelta(microseconds=0.001)
                         + self.fixed_delay
-                            * (1 + random.uniform(0, 1) + random.expovariate(lambd=1/10))
+                            * (1 + r.uniform(0, 1) + r.expovariate(lambd=1/10))
                     )
                 case "near lost":
                     return (
                         self.gst
                         + timedelta(microseconds=0.001)
-                        + self.fixed_delay * (1_000_000 + random.expovariate(lambd=1/1_000_000))
+                        + self.fixed_delay * (1_000_000 + r.expovariate(lambd=1/1_000_000))
                     )
                 case "lost":
                     return max(self.gst, timedelta(days=999_999))
@@ -95,6 +188,23 @@ class PartiallySynchronous(Synchronous):
                     return super().arrival_time_for(sent_at)
         else:
             return super().arrival_time_for(sent_at)
+    
+    def arrival_times_for(self, sent_at: time, n: int, rng: Optional[RandomStream] = None) -> list[time]:
+        if sent_at < self.gst:
+            rng = rng or self._rng
+            return [self.arrival_time_for(sent_at, rng) for _ in range(n)]
+        # after GST, the system behaves synchronously
+        return super().arrival_times_for(sent_at, n)
+    
+    def arrival_ticks_for(self,
+                          sent_at: int,
+                          n: int,
+                          ticks_per_second: int,
+                          rng: Optional[RandomStream] = None,
+    ) -> list[int]:
+        if sent_at < ticks_of(self.gst, ticks_per_second):
+            return SynchronyModel.arrival_ticks_for(self, sent_at, n, ticks_per_second, rng)
+        return super().arrival_ticks_for(sent_at, n, ticks_per_second)
 
 
 @dataclass(frozen=True)
@@ -110,14 +220,58 @@ class StochasticExponential(SynchronyModel):
         if self.delta_t < timedelta.resolution:
             raise ValueError("Delta time must be strictly positive.")
     
-    def arrival_time_for(self, sent_at: time) -> time:
-        return sent_at + self.min_delay + self.delta_t * random.expovariate(lambd=1)
+    def arrival_time_for(self, sent_at: time, rng: Optional[RandomStream] = None) -> time:
+        delays = (rng or self._rng).buffer(_exponential_delays)
+        return sent_at + self.min_delay + self.delta_t * delays.take_one()
+    
+    def arrival_times_for(self, sent_at: time, n: int, rng: Optional[RandomStream] = None) -> list[time]:
+        earliest = sent_at + self.min_delay
+        delays = (rng or self._rng).buffer(_exponential_delays)
+        return [earliest + self.delta_t * u for u in delays.take(n)]
+    
+    def arrival_ticks_for(self,
+                          sent_at: int,
+                          n: int,
+                          ticks_per_second: int,
+                          rng: Optional[RandomStream] = None,
+    ) -> list[int]:
+        earliest = sent_at + delay_ticks_of(self.min_delay, ticks_per_second)
+        delta_t = ticks_of(self.delta_t, ticks_per_second)
+        delays = (rng or self._rng).buffer(_exponential_delays)
+        return [earliest + round(delta_t * u) for u in delays.take(n)]
+
+
+@dataclass(frozen=True)
+class NeighborCacheStats:
+    """
+    Statistics of the neighbor cache of a `System`.
+
+    Attributes:
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups forwarded to the topology.
+        size (int): Number of processes whose neighbors are cached.
+    """
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of the lookups served from the cache, or 0 if there was no lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
 
 
 @dataclass(frozen=True)
 class System:
     """
     Class to represent a system with a network topology and a set of processes.
+
+    Neighbor sets are normally computed by the topology on each call to `neighbors_of`.
+    After `precompute_neighbors`, they are materialized once per process and the same
+    frozen `ProcessSet` is returned on every later call.
     """
     topology: NetworkTopology
     synchrony: SynchronyModel = field(default_factory=Asynchronous)
@@ -132,4 +286,96 @@ class System:
         """
         Get the neighbors of a given process.
         """
-        return self.topology.neighbors_of(pid)
+        return self._neighbor_cache.get(pid)
+    
+    def precompute_neighbors(self, pids: Optional[Iterable[Pid]] = None) -> None:
+        """
+        Materialize the neighbor sets of the given processes (all processes by default), and keep serving
+        cached sets from then on, including for processes that were not precomputed.
+        This trades memory (one set per process) for lookups that no longer depend on the topology.
+        """
+        self._neighbor_cache.fill(self.processes() if pids is None else pids)
+
+    def neighbor_cache_stats(self, reset: bool = False) -> NeighborCacheStats:
+        """
+        Get the statistics of the neighbor cache, and optionally reset the counters.
+        """
+        return self._neighbor_cache.stats(reset)
+    
+    @cached_property
+    def pid_index(self) -> PidIndex:
+        """
+        Dense index of the processes in the system, numbered 0..N-1 in increasing order.
+        """
+        return PidIndex(self.processes())
+
+    @cached_property
+    def _neighbor_cache(self) -> '_NeighborCache':
+        return _NeighborCache(self.topology)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # cached neighbor sets are rebuilt on demand
+        return {k: v for k, v in self.__dict__.items() if k != '_neighbor_cache'}
+
+
+def _asynchronous_delays(rng: RandomStream, n: int) -> array:
+    """
+    Sample delays of an asynchronous system, in multiples of the base delay.
+    """
+    if rng.numpy is not None:
+        return array('d', (rng.numpy.exponential(scale=1/2, size=n) + rng.numpy.uniform(0, 1, size=n)).tobytes())
+    return array('d', (rng.random.expovariate(lambd=2) + rng.random.uniform(0, 1) for _ in range(n)))
+
+
+def _exponential_delays(rng: RandomStream, n: int) -> array:
+    """
+    Sample delays of a stochastic exponential system, in multiples of `delta_t`.
+    """
+    if rng.numpy is not None:
+        return array('d', rng.numpy.exponential(scale=1, size=n).tobytes())
+    return array('d', (rng.random.expovariate(lambd=1) for _ in range(n)))
+
+
+class _NeighborCache:
+    """
+    Cache of the neighbor sets of a topology, counting hits and misses.
+    Lookups are only stored once the cache has been filled (see `System.precompute_neighbors`).
+    """
+    __slots__ = ('_sets', 'enabled', 'hits', 'misses', 'topology')
+
+    def __init__(self, topology: NetworkTopology):
+        self.topology = topology
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+        self._sets: dict[Pid, ProcessSet] = {}
+
+    def get(self, pid: Pid) -> ProcessSet:
+        neighbors = self._sets.get(pid)
+        if neighbors is not None:
+            self.hits += 1
+            return neighbors
+        self.misses += 1
+        neighbors = self.topology.neighbors_of(pid)
+        if self.enabled:
+            neighbors = self._sets[pid] = _frozen(neighbors)
+        return neighbors
+
+    def fill(self, pids: Iterable[Pid]) -> None:
+        self.enabled = True
+        for pid in pids:
+            if pid not in self._sets:
+                self._sets[pid] = _frozen(self.topology.neighbors_of(pid))
+
+    def stats(self, reset: bool) -> NeighborCacheStats:
+        stats = NeighborCacheStats(self.hits, self.misses, len(self._sets))
+        if reset:
+            self.hits = self.misses = 0
+        return stats
+
+
+def _frozen(neighbors: Iterable[Pid]) -> ProcessSet:
+    """
+    Neighbors as an immutable `ProcessSet`, for topologies that return another kind of collection.
+    """
+    return neighbors if isinstance(neighbors, ProcessSet) else ProcessSet(neighbors)
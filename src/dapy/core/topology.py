@@ -1,8 +1,27 @@
+import math
+import mmap
+import struct
+import sys
+
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Iterable, Self
+from functools import cached_property
+from os import PathLike
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterable, Iterator, Optional, Self, Sequence, TextIO
+
+from .pid import Channel, Pid, PidIndex, ProcessSet
+from .rng import RandomStream
 
-from .pid import Channel, Pid, ProcessSet
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+if TYPE_CHECKING:
+    import numpy
 
 
 @dataclass(frozen=True)
@@ -39,17 +58,114 @@ class NetworkTopology(ABC):
         # for the sake of performance
         return iter(self.processes())
     
+    def degree(self, pid: Pid) -> int:
+        # default implementation; expected to be overridden in subclasses
+        # for the sake of performance
+        return len(self.neighbors_of(pid))
+    
+    #
+    # Analytics. They work on the positions of the processes (see `_Adjacency`), so that they run in time
+    # linear in the number of edges without creating PIDs or sets, and their results are cached on the
+    # topology, which is immutable. Regular topologies override them with closed forms where possible.
+    #
+    def bfs_layers(self, sources: Pid | Iterable[Pid]) -> list[list[Pid]]:
+        """
+        Multi-source breadth-first search: the `k`-th layer holds the processes at distance `k` from
+        the nearest source, in increasing order of PID. Processes that cannot be reached are left out.
+        The layers are cached per set of sources.
+        """
+        adjacency = self._adjacency
+        sources = [sources] if isinstance(sources, Pid) else sources
+        positions = frozenset(adjacency.checked_position(pid) for pid in sources)
+        cached = self._analytics.setdefault('bfs_layers', {})
+        if positions not in cached:
+            _, layers = _bfs(adjacency, positions)
+            cached[positions] = tuple(tuple(adjacency.pid_at(i) for i in sorted(layer)) for layer in layers)
+        return [list(layer) for layer in cached[positions]]
+    
+    def eccentricity(self, pid: Pid) -> int:
+        """
+        Get the largest distance from a process to any other process.
+        Raise a `ValueError` if some process cannot be reached from it.
+        """
+        eccentricities = self._analytics.setdefault('eccentricity', {})
+        if pid not in eccentricities:
+            eccentricities[pid] = _eccentricity(self._adjacency, self._adjacency.checked_position(pid))
+        return eccentricities[pid]
+    
+    def diameter(self) -> int:
+        """
+        Get the largest distance between two processes.
+        Raise a `ValueError` if the topology is not (strongly) connected.
+
+        Undirected topologies use the iFUB algorithm, which usually needs only a handful of breadth-first
+        searches; directed ones fall back to computing the eccentricity of every process.
+        """
+        if 'diameter' not in self._analytics:
+            adjacency = self._adjacency
+            self._analytics['diameter'] = _ifub(adjacency) if adjacency.is_undirected() else max(
+                (_eccentricity(adjacency, i) for i in range(adjacency.size)), default=0)
+        return self._analytics['diameter']
+    
+    def degree_histogram(self) -> dict[int, int]:
+        """
+        Get the number of processes of each degree, in increasing order of degree.
+        """
+        if 'degree_histogram' not in self._analytics:
+            adjacency = self._adjacency
+            counts = Counter(adjacency.degree(i) for i in range(adjacency.size))
+            self._analytics['degree_histogram'] = dict(sorted(counts.items()))
+        return dict(self._analytics['degree_histogram'])
+    
+    def _positions(self) -> '_Adjacency':
+        """
+        Build the adjacency of the topology in terms of positions; overridden by topologies that
+        can compute it without materializing their neighbor sets.
+        """
+        index = PidIndex(self.processes())
+        lists = [sorted(j for q in self.neighbors_of(pid) if (j := index.get(q)) is not None) for pid in index.pids]
+        return _Adjacency(len(lists), lists.__getitem__, index.pids.__getitem__, index.get)
+    
+    @cached_property
+    def _adjacency(self) -> '_Adjacency':
+        return self._positions()
+    
+    @cached_property
+    def _analytics(self) -> dict[str, Any]:
+        return {}
+    
+    def __getstate__(self) -> dict[str, Any]:
+        # cached analytics are recomputed on demand
+        return {k: v for k, v in self.__dict__.items() if k not in ('_adjacency', '_analytics')}
+    
 
 
 @dataclass(frozen=True)
 class CompleteGraph(NetworkTopology):
     _processes: frozenset[Pid]
+    _all: ProcessSet = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, '_all', ProcessSet(self._processes))
     
     def neighbors_of(self, pid: Pid) -> ProcessSet:
-        return ProcessSet(self._processes - {pid})
+        # a view of all processes but one, instead of a new set of N-1 processes
+        return self._all.all_except(pid)
+    
+    def degree(self, pid: Pid) -> int:
+        return len(self._processes) - (pid in self._processes)
+
+    def diameter(self) -> int:
+        return 1 if len(self._processes) > 1 else 0
+    
+    def _positions(self) -> '_Adjacency':
+        index = PidIndex(self._processes)
+        n = len(index)
+        return _Adjacency(n, lambda i: [*range(i), *range(i + 1, n)], index.pids.__getitem__, index.get,
+                          degree=lambda i: n - 1, undirected=True)
 
     def processes(self) -> ProcessSet:
-        return ProcessSet(self._processes)
+        return self._all
     
     def __len__(self):
         return len(self._processes)
@@ -75,7 +191,7 @@ class CompleteGraph(NetworkTopology):
 @dataclass(frozen=True)
 class Ring(NetworkTopology):
     _processes: list[Pid] = field()
-    _index: dict[Pid, int] = field()
+    _index: PidIndex = field()
     directed: bool = field(default=False)
     
     def neighbors_of(self, pid: Pid) -> ProcessSet:
@@ -83,25 +199,39 @@ class Ring(NetworkTopology):
         if idx is None:
             raise ValueError(f"Process {pid} not found in the ring topology.")
         if self.directed:
-            return frozenset({self._processes[(idx + 1) % len(self._processes)]})
+            return ProcessSet(self._processes[(idx + 1) % len(self._processes)])
         return ProcessSet({self._processes[(idx - 1)], 
                           self._processes[(idx + 1) % len(self._processes)]})
 
     def processes(self) -> ProcessSet:
         return ProcessSet(self._processes)
 
+    def diameter(self) -> int:
+        n = len(self._processes)
+        return n - 1 if self.directed else n // 2
+    
+    def _positions(self) -> '_Adjacency':
+        n = len(self._processes)
+        if self.directed:
+            def neighbors(i: int) -> Sequence[int]:
+                return ((i + 1) % n,) if n > 1 else ()
+        else:
+            def neighbors(i: int) -> Sequence[int]:
+                return sorted({(i - 1) % n, (i + 1) % n} - {i})
+        return _Adjacency(n, neighbors, self._processes.__getitem__, self._index.get,
+                          undirected=not self.directed or n <= 2)
+
     def __len__(self):
         return len(self._processes)
     def __contains__(self, pid: Pid) -> bool:
-        return pid in self._processes
+        return pid in self._index
     def __iter__(self):
         return iter(self._processes)
         
     @classmethod
     def from_(cls, processes: Iterable[Pid], directed: bool = False) -> Self:
-        processes = sorted(set(processes))
-        index = {pid: i for i, pid in enumerate(processes)}
-        return cls(processes, index, directed)
+        index = PidIndex(processes)
+        return cls(list(index.pids), index, directed)
     
     @classmethod
     def of_size(cls, size: int, directed: bool = False) -> Self:
@@ -180,10 +310,11 @@ class Arbitrary(NetworkTopology):
               channels: Iterable[Pid | tuple[Pid, Pid] | Channel | tuple[int, int]],
               directed: bool = True
     ) -> Self:
-        neighbors: dict[Pid, ProcessSet] = {}
+        # neighbors are collected in plain sets first, as adding to a `ProcessSet` copies it each time
+        neighbors: dict[Pid, set[Pid]] = {}
         for entry in channels:
             if isinstance(entry, Pid):
-                neighbors.setdefault(entry, ProcessSet())
+                neighbors.setdefault(entry, set())
             else:
                 if isinstance(entry, Channel):
                     s, r = entry.as_tuple()
@@ -191,10 +322,707 @@ class Arbitrary(NetworkTopology):
                     s, r = Pid(entry[0]), Pid(entry[1])
                 else:
                     s, r = entry
-                neighbors.setdefault(s, ProcessSet())
-                neighbors[s] = neighbors[s] + r
+                neighbors.setdefault(s, set()).add(r)
                 if not directed:
-                    neighbors.setdefault(r, ProcessSet())
-                    neighbors[r] = neighbors[r] + s
+                    neighbors.setdefault(r, set()).add(s)
                     
-        return cls(neighbors)
+        return cls({pid: ProcessSet(pids) for pid, pids in neighbors.items()})
+
+
+@dataclass(frozen=True)
+class CSRTopology(NetworkTopology):
+    """
+    Class to represent an arbitrary topology in compressed sparse row (CSR) form.
+    
+    Processes are numbered 0..N-1 in increasing order of PID. The neighbors of the process at position `i`
+    are the positions `_targets[_offsets[i]:_offsets[i+1]]`, in increasing order. Both are flat arrays of
+    machine integers, so a graph takes a few bytes per edge, the degree of a process is a subtraction,
+    and `neighbor_positions` returns a view of the arrays without copying them.
+    
+    Unlike `Arbitrary`, every endpoint of an edge is a process of the topology, even in a directed graph.
+    PIDs are only created when they are requested.
+    
+    Topologies can be read from text edge lists and adjacency lists, and saved to a binary file (see
+    `_CSR_HEADER`) that `load` memory-maps: opening it does not depend on its size, and the neighbors
+    of a process are only read from disk when they are queried.
+    """
+    _ids: array | memoryview
+    _offsets: array | memoryview
+    _targets: array | memoryview
+    
+    def __post_init__(self):
+        if len(self._offsets) != len(self._ids) + 1:
+            raise ValueError("There must be one more offset than processes.")
+        
+    @classmethod
+    def from_edges(cls,
+                   edges: Iterable[tuple[Pid | int, Pid | int] | Channel],
+                   directed: bool = True,
+                   processes: Iterable[Pid | int] = (),
+    ) -> Self:
+        """
+        Create a topology from edges given as pairs of PIDs (or of integer ids) or as channels.
+        Processes without any edge can be given separately.
+        """
+        sources = array('q')
+        targets = array('q')
+        for edge in edges:
+            s, r = edge.as_tuple() if isinstance(edge, Channel) else edge
+            sources.append(s.id if isinstance(s, Pid) else s)
+            targets.append(r.id if isinstance(r, Pid) else r)
+        return cls.from_arrays(sources, targets, directed=directed, processes=processes)
+    
+    @classmethod
+    def from_arrays(cls,
+                    sources: Sequence[int] | 'numpy.ndarray',
+                    targets: Sequence[int] | 'numpy.ndarray',
+                    directed: bool = True,
+                    processes: Iterable[Pid | int] = (),
+    ) -> Self:
+        """
+        Create a topology from two sequences of integer ids (e.g., arrays), the `i`-th edge going from
+        `sources[i]` to `targets[i]`. Duplicate edges are ignored.
+        With NumPy installed, the construction is vectorized.
+        """
+        if len(sources) != len(targets):
+            raise ValueError("There must be as many sources as targets.")
+        extra = [p.id if isinstance(p, Pid) else p for p in processes]
+        if _np is not None:
+            return cls._from_numpy(_np.asarray(sources, dtype=_np.int64), _np.asarray(targets, dtype=_np.int64),
+                                   directed, _np.asarray(extra, dtype=_np.int64))
+        ids = sorted(set(sources).union(targets, extra))
+        position = {id: i for i, id in enumerate(ids)}
+        n = len(ids)
+        # edges are encoded as single integers, so that sorting them also groups them by source
+        keys = {position[s] * n + position[r] for s, r in zip(sources, targets)}
+        if not directed:
+            keys.update([(key % n) * n + key // n for key in keys])
+        keys = sorted(keys)
+        offsets = array('q', bytes(8 * (n + 1)))
+        for key in keys:
+            offsets[key // n + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        return cls(array('q', ids), offsets, array('q', [key % n for key in keys]))
+    
+    @classmethod
+    def _from_numpy(cls,
+                    sources: 'numpy.ndarray',
+                    targets: 'numpy.ndarray',
+                    directed: bool,
+                    extra: 'numpy.ndarray',
+    ) -> Self:
+        """
+        Vectorized construction of `from_arrays`.
+        """
+        ids = _np.unique(_np.concatenate([sources, targets, extra]))
+        n = len(ids)
+        s = _np.searchsorted(ids, sources)
+        r = _np.searchsorted(ids, targets)
+        if not directed:
+            s, r = _np.concatenate([s, r]), _np.concatenate([r, s])
+        keys = _np.unique(s * n + r)
+        offsets = _np.zeros(n + 1, dtype=_np.int64)
+        _np.cumsum(_np.bincount(keys // n, minlength=n), out=offsets[1:])
+        return cls(array('q', ids.tobytes()), array('q', offsets.tobytes()), array('q', (keys % n).tobytes()))
+    
+    @classmethod
+    def from_topology(cls, topology: NetworkTopology) -> Self:
+        """
+        Convert any topology to CSR form.
+        """
+        return cls.from_edges(
+            ((pid, neighbor) for pid in topology for neighbor in topology.neighbors_of(pid)),
+            processes=topology,
+        )
+    
+    @classmethod
+    def read_edge_list(cls, file: str | PathLike | TextIO, directed: bool = True, comment: str = "#") -> Self:
+        """
+        Read a topology from a text file with one edge per line, given as two integer ids separated by
+        whitespace or commas. Further columns (e.g., weights) are ignored, a line with a single id declares
+        a process, and empty lines and lines starting with `comment` are skipped.
+        """
+        sources = array('q')
+        targets = array('q')
+        processes = array('q')
+        for fields in _records(file, comment):
+            if len(fields) == 1:
+                processes.append(int(fields[0]))
+            else:
+                sources.append(int(fields[0]))
+                targets.append(int(fields[1]))
+        return cls.from_arrays(sources, targets, directed=directed, processes=processes)
+    
+    @classmethod
+    def read_adjacency_list(cls, file: str | PathLike | TextIO, directed: bool = True, comment: str = "#") -> Self:
+        """
+        Read a topology from a text file with one process per line, given as its integer id followed by
+        the ids of its neighbors, separated by whitespace or commas.
+        """
+        sources = array('q')
+        targets = array('q')
+        processes = array('q')
+        for fields in _records(file, comment):
+            s = int(fields[0])
+            processes.append(s)
+            for r in fields[1:]:
+                sources.append(s)
+                targets.append(int(r))
+        return cls.from_arrays(sources, targets, directed=directed, processes=processes)
+    
+    def save(self, file: str | PathLike | BinaryIO) -> None:
+        """
+        Write the topology to a binary file, which can be memory-mapped by `load`.
+        """
+        if isinstance(file, (str, PathLike)):
+            with open(file, "wb") as f:
+                return self.save(f)
+        file.write(_CSR_HEADER.pack(_CSR_MAGIC, len(self._ids), len(self._targets)))
+        for values in (self._ids, self._offsets, self._targets):
+            if sys.byteorder != "little":
+                values = _as_array(values)
+                values.byteswap()
+            file.write(values.tobytes())
+    
+    @classmethod
+    def load(cls, file: str | PathLike, use_mmap: bool = True) -> Self:
+        """
+        Open a topology saved with `save`.
+        By default, the file is memory-mapped rather than read.
+        """
+        with open(file, "rb") as f:
+            magic, n, m = _CSR_HEADER.unpack(f.read(_CSR_HEADER.size))
+            if magic != _CSR_MAGIC:
+                raise ValueError("Not a dapy CSR topology file.")
+            sizes = (n, n + 1, m)
+            if use_mmap and sys.byteorder == "little":
+                # the views keep the mapping alive after the file is closed
+                buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                start = _CSR_HEADER.size
+                views = []
+                for size in sizes:
+                    views.append(buffer[start:start + 8 * size].cast('q'))
+                    start += 8 * size
+                return cls(*views)
+            arrays = []
+            for size in sizes:
+                values = array('q')
+                values.fromfile(f, size)
+                if sys.byteorder != "little":
+                    values.byteswap()
+                arrays.append(values)
+            return cls(*arrays)
+    
+    def __reduce__(self):
+        # memory-mapped topologies are pickled as plain arrays
+        return (type(self), (_as_array(self._ids), _as_array(self._offsets), _as_array(self._targets)))
+    
+    def position_of(self, pid: Pid) -> Optional[int]:
+        """
+        Get the position of a process, or `None` if it is not in the topology.
+        """
+        ids = self._ids
+        if not ids:
+            return None
+        i = pid.id - ids[0]
+        if not 0 <= i < len(ids) or ids[i] != pid.id:
+            # ids are not contiguous
+            i = bisect_left(ids, pid.id)
+            if i == len(ids) or ids[i] != pid.id:
+                return None
+        return i
+    
+    def pid_at(self, i: int) -> Pid:
+        """
+        Get the process at a given position.
+        """
+        return Pid(self._ids[i])
+    
+    def _checked_position(self, pid: Pid) -> int:
+        i = self.position_of(pid)
+        if i is None:
+            raise ValueError(f"Process {pid} not found in the topology.")
+        return i
+    
+    def neighbor_positions(self, i: int) -> memoryview:
+        """
+        Get the positions of the neighbors of the process at position `i`, as a view of the neighbor array.
+        """
+        return memoryview(self._targets)[self._offsets[i]:self._offsets[i + 1]]
+    
+    def neighbors_of(self, pid: Pid) -> ProcessSet:
+        ids = self._ids
+        return ProcessSet(Pid(ids[j]) for j in self.neighbor_positions(self._checked_position(pid)))
+    
+    def degree(self, pid: Pid) -> int:
+        i = self._checked_position(pid)
+        return self._offsets[i + 1] - self._offsets[i]
+    
+    def _positions(self) -> '_Adjacency':
+        offsets = self._offsets
+        return _Adjacency(len(self._ids), self.neighbor_positions, self.pid_at, self.position_of,
+                          degree=lambda i: offsets[i + 1] - offsets[i])
+    
+    def edge_count(self) -> int:
+        """
+        Get the number of (directed) edges; an undirected edge counts twice.
+        """
+        return len(self._targets)
+    
+    def processes(self) -> ProcessSet:
+        return ProcessSet(self)
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    def __contains__(self, pid: Pid) -> bool:
+        return isinstance(pid, Pid) and self.position_of(pid) is not None
+    def __iter__(self) -> Iterator[Pid]:
+        return (Pid(id) for id in self._ids)
+
+
+@dataclass(frozen=True)
+class _NumberedTopology(NetworkTopology):
+    """
+    Base class of the implicit topologies, whose processes are `Pid(1)`..`Pid(N)` and whose
+    neighbors are computed from the PID when they are queried, without storing any adjacency.
+    """
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+    
+    def _position_of(self, pid: Pid) -> int:
+        """
+        Get the 0-based position of a process, or raise an error if it is not in the topology.
+        """
+        if pid not in self:
+            raise ValueError(f"Process {pid} not found in the {type(self).__name__} topology.")
+        return pid.id - 1
+    
+    @abstractmethod
+    def _neighbor_positions(self, i: int) -> Iterable[int]:
+        """
+        Get the positions of the neighbors of the process at position `i`.
+        """
+        pass
+    
+    def neighbors_of(self, pid: Pid) -> ProcessSet:
+        return ProcessSet(Pid(j + 1) for j in self._neighbor_positions(self._position_of(pid)))
+    
+    def _positions(self) -> '_Adjacency':
+        return _Adjacency(len(self), self._neighbor_positions, lambda i: Pid(i + 1),
+                          lambda pid: pid.id - 1 if pid in self else None, undirected=True)
+    
+    def processes(self) -> ProcessSet:
+        return ProcessSet(self)
+    
+    def __contains__(self, pid: Pid) -> bool:
+        return isinstance(pid, Pid) and 1 <= pid.id <= len(self)
+    def __iter__(self) -> Iterator[Pid]:
+        return (Pid(i + 1) for i in range(len(self)))
+
+
+@dataclass(frozen=True)
+class Grid(_NumberedTopology):
+    """
+    Class to represent a grid of any dimension (typically 2D or 3D), numbered in row-major order.
+    Each process is connected to the adjacent processes along each axis.
+    
+    Attributes:
+        shape (tuple[int, ...]): The number of processes along each axis.
+        periodic (bool): Whether the grid wraps around along each axis (see `Torus`).
+    """
+    shape: tuple[int, ...]
+    periodic: bool = False
+    
+    def __post_init__(self):
+        if not self.shape or any(n <= 0 for n in self.shape):
+            raise ValueError("All dimensions must be positive integers.")
+    
+    def _neighbor_positions(self, i: int) -> Iterable[int]:
+        neighbors = set()
+        stride = 1
+        for n in reversed(self.shape):
+            coordinate = (i // stride) % n
+            for step in (-1, 1):
+                c = coordinate + step
+                if self.periodic:
+                    c %= n
+                elif not 0 <= c < n:
+                    continue
+                neighbors.add(i + (c - coordinate) * stride)
+            stride *= n
+        neighbors.discard(i)
+        return neighbors
+    
+    def diameter(self) -> int:
+        return sum(n // 2 if self.periodic else n - 1 for n in self.shape)
+    
+    def __len__(self) -> int:
+        size = 1
+        for n in self.shape:
+            size *= n
+        return size
+    
+    @classmethod
+    def of_size(cls, *shape: int) -> Self:
+        """
+        Create a grid with the given number of processes along each axis, e.g., `Grid.of_size(10, 20)`.
+        """
+        return cls(tuple(shape))
+
+
+@dataclass(frozen=True)
+class Torus(Grid):
+    """
+    Class to represent a grid that wraps around along each axis.
+    """
+    periodic: bool = True
+
+
+@dataclass(frozen=True)
+class Hypercube(_NumberedTopology):
+    """
+    Class to represent a hypercube, where the positions of neighbors differ by exactly one bit.
+    
+    Attributes:
+        dimension (int): The dimension of the hypercube, which has `2**dimension` processes.
+    """
+    dimension: int
+    
+    def __post_init__(self):
+        if self.dimension < 0:
+            raise ValueError("Dimension must be a non-negative integer.")
+    
+    def _neighbor_positions(self, i: int) -> Iterable[int]:
+        return [i ^ (1 << k) for k in range(self.dimension)]
+    
+    def degree(self, pid: Pid) -> int:
+        self._position_of(pid)
+        return self.dimension
+    
+    def diameter(self) -> int:
+        return self.dimension
+    
+    def __len__(self) -> int:
+        return 1 << self.dimension
+    
+    @classmethod
+    def of_size(cls, dimension: int) -> Self:
+        """
+        Create a hypercube of the given dimension.
+        """
+        return cls(dimension)
+
+
+@dataclass(frozen=True)
+class KaryTree(_NumberedTopology):
+    """
+    Class to represent a complete k-ary tree, numbered in breadth-first order from the root `Pid(1)`.
+    Each process is connected to its parent and its children.
+    
+    Attributes:
+        arity (int): The maximum number of children of a process.
+        size (int): The number of processes.
+    """
+    arity: int
+    size: int
+    
+    def __post_init__(self):
+        if self.arity < 1:
+            raise ValueError("Arity must be a positive integer.")
+        if self.size < 1:
+            raise ValueError("Size must be a positive integer.")
+    
+    def _neighbor_positions(self, i: int) -> Iterable[int]:
+        neighbors = list(range(self.arity * i + 1, min(self.arity * (i + 1) + 1, self.size)))
+        if i > 0:
+            neighbors.append((i - 1) // self.arity)
+        return neighbors
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    @classmethod
+    def of_size(cls, size: int, arity: int = 2) -> Self:
+        """
+        Create a k-ary tree with the given number of processes.
+        """
+        return cls(arity, size)
+
+
+#
+# Random graphs are generated once, in time linear in their number of edges, and stored in CSR form.
+# Processes are `Pid(1)`..`Pid(N)`, and all randomness comes from a `RandomStream`, seeded from the
+# `random` module unless a seed is given.
+#
+@dataclass(frozen=True)
+class ErdosRenyi(CSRTopology):
+    """
+    Class to represent an undirected Erdős-Rényi random graph G(n, p), where each pair of processes is
+    connected independently with probability p.
+    """
+    @classmethod
+    def of_size(cls, size: int, p: float, seed: Optional[int] = None) -> Self:
+        """
+        Generate a graph, skipping over absent edges with geometrically distributed jumps
+        (Batagelj and Brandes), in time O(N + E).
+        """
+        if size <= 0:
+            raise ValueError("Size must be a positive integer.")
+        if not 0 <= p <= 1:
+            raise ValueError("Probability must be between 0 and 1.")
+        r = RandomStream(seed).random
+        sources = array('q')
+        targets = array('q')
+        if p == 1:
+            for v in range(1, size):
+                for w in range(v):
+                    sources.append(v + 1)
+                    targets.append(w + 1)
+        elif p > 0:
+            log_q = math.log(1 - p)
+            v, w = 1, -1
+            while v < size:
+                w += 1 + int(math.log(1 - r.random()) / log_q)
+                while w >= v and v < size:
+                    w -= v
+                    v += 1
+                if v < size:
+                    sources.append(v + 1)
+                    targets.append(w + 1)
+        return cls.from_arrays(sources, targets, directed=False, processes=range(1, size + 1))
+
+
+@dataclass(frozen=True)
+class BarabasiAlbert(CSRTopology):
+    """
+    Class to represent an undirected Barabási-Albert preferential-attachment graph, where each new
+    process connects to `m` existing processes chosen with probability proportional to their degree.
+    """
+    @classmethod
+    def of_size(cls, size: int, m: int, seed: Optional[int] = None) -> Self:
+        """
+        Generate a graph, starting from `m` isolated processes, in expected time O(N * m).
+        """
+        if not 1 <= m < size:
+            raise ValueError("The number of edges per process must be between 1 and the size of the graph.")
+        r = RandomStream(seed).random
+        sources = array('q')
+        targets = array('q')
+        # every process appears in `endpoints` once per incident edge, so that a uniform choice
+        # in it picks a process with probability proportional to its degree
+        endpoints: list[int] = []
+        chosen = list(range(1, m + 1))
+        for v in range(m + 1, size + 1):
+            for w in chosen:
+                sources.append(v)
+                targets.append(w)
+            endpoints.extend(chosen)
+            endpoints.extend([v] * m)
+            picked: set[int] = set()
+            while len(picked) < m:
+                picked.add(endpoints[int(r.random() * len(endpoints))])
+            chosen = list(picked)
+        return cls.from_arrays(sources, targets, directed=False, processes=range(1, size + 1))
+
+
+@dataclass(frozen=True)
+class RandomRegular(CSRTopology):
+    """
+    Class to represent an undirected random regular graph, where every process has the same degree.
+    """
+    @classmethod
+    def of_size(cls, size: int, degree: int, seed: Optional[int] = None) -> Self:
+        """
+        Generate a graph by pairing `degree` stubs per process at random (configuration model),
+        then removing self-loops and duplicate edges with random degree-preserving edge switches.
+        """
+        if not 0 <= degree < size or (size * degree) % 2:
+            raise ValueError("The degree must be less than the size, and their product must be even.")
+        r = RandomStream(seed).random
+        stubs = [v for v in range(1, size + 1) for _ in range(degree)]
+        r.shuffle(stubs)
+        edges = [(stubs[k], stubs[k + 1]) for k in range(0, len(stubs), 2)]
+        seen: set[tuple[int, int]] = set()
+        bad: list[int] = []
+        for k, (a, b) in enumerate(edges):
+            key = (min(a, b), max(a, b))
+            if a == b or key in seen:
+                bad.append(k)
+            else:
+                seen.add(key)
+        attempts = 100 * len(edges) + 1000
+        while bad:
+            attempts -= 1
+            if attempts < 0:
+                raise RuntimeError("Could not remove all self-loops and duplicate edges; try another seed.")
+            k = bad.pop()
+            a, b = edges[k]
+            j = int(r.random() * len(edges))
+            c, d = edges[j]
+            # switch (a, b), (c, d) to (a, c), (b, d) if both are new, distinct edges
+            ac, bd = (min(a, c), max(a, c)), (min(b, d), max(b, d))
+            if j == k or a == c or b == d or ac == bd or ac in seen or bd in seen:
+                bad.append(k)
+                continue
+            if j not in bad:
+                seen.discard((min(c, d), max(c, d)))
+            else:
+                bad.remove(j)
+            seen.update((ac, bd))
+            edges[k], edges[j] = (a, c), (b, d)
+        return cls.from_arrays(
+            array('q', (a for a, _ in edges)), array('q', (b for _, b in edges)),
+            directed=False, processes=range(1, size + 1),
+        )
+
+
+# file header of a saved `CSRTopology`: magic bytes, number of processes, number of edges;
+# followed by the arrays of ids, offsets and neighbor positions, as little-endian 64-bit integers
+_CSR_MAGIC = b"DAPYCSR1"
+_CSR_HEADER = struct.Struct("<8sQQ")
+
+
+def _records(file: str | PathLike | TextIO, comment: str) -> Iterator[list[str]]:
+    """
+    Iterate over the fields of the non-empty, non-comment lines of a text file.
+    """
+    if isinstance(file, (str, PathLike)):
+        with open(file) as f:
+            yield from _records(f, comment)
+        return
+    for line in file:
+        line = line.strip()
+        if line and not line.startswith(comment):
+            yield line.replace(",", " ").split()
+
+
+def _as_array(values: array | memoryview) -> array:
+    """
+    Copy integers from an array or a memory-mapped view into a new array.
+    """
+    return array('q', values.tobytes())
+
+
+# number of candidate centers tried by `_ifub`
+_SWEEPS = 2
+
+
+class _Adjacency:
+    """
+    Adjacency of a topology in terms of positions 0..N-1, numbered in increasing order of PID.
+    """
+    __slots__ = ('_undirected', 'degree', 'neighbors', 'pid_at', 'position_of', 'size')
+
+    def __init__(self,
+                 size: int,
+                 neighbors: Callable[[int], Sequence[int]],
+                 pid_at: Callable[[int], Pid],
+                 position_of: Callable[[Pid], Optional[int]],
+                 degree: Optional[Callable[[int], int]] = None,
+                 undirected: Optional[bool] = None,
+    ):
+        self.size = size
+        self.neighbors = neighbors
+        self.pid_at = pid_at
+        self.position_of = position_of
+        self.degree = degree or (lambda i: len(neighbors(i)))
+        self._undirected = undirected
+
+    def checked_position(self, pid: Pid) -> int:
+        i = self.position_of(pid)
+        if i is None:
+            raise ValueError(f"Process {pid} not found in the topology.")
+        return i
+
+    def is_undirected(self) -> bool:
+        """
+        Check whether every edge goes both ways, relying on neighbors being listed in increasing order.
+        """
+        if self._undirected is None:
+            neighbors = self.neighbors
+            self._undirected = all(
+                (k := bisect_left(row := neighbors(j), i)) < len(row) and row[k] == i
+                for i in range(self.size) for j in neighbors(i)
+            )
+        return self._undirected
+
+
+def _bfs(adjacency: _Adjacency, sources: Iterable[int]) -> tuple[list[int], list[list[int]]]:
+    """
+    Breadth-first search from a set of positions.
+    Return the distance to every position (-1 if unreachable) and the positions at each distance.
+    """
+    distances = [-1] * adjacency.size
+    layer = list(sources)
+    for i in layer:
+        distances[i] = 0
+    layers = [layer] if layer else []
+    neighbors = adjacency.neighbors
+    reached = len(layer)
+    d = 0
+    while layer and reached < adjacency.size:
+        d += 1
+        next_layer = []
+        for i in layer:
+            for j in neighbors(i):
+                if distances[j] < 0:
+                    distances[j] = d
+                    next_layer.append(j)
+        if next_layer:
+            layers.append(next_layer)
+            reached += len(next_layer)
+        layer = next_layer
+    return distances, layers
+
+
+def _eccentricity(adjacency: _Adjacency, i: int) -> int:
+    """
+    Largest distance from position `i`, computed by a breadth-first search.
+    """
+    _, layers = _bfs(adjacency, (i,))
+    if sum(len(layer) for layer in layers) < adjacency.size:
+        raise ValueError(f"Process {adjacency.pid_at(i)} cannot reach every process of the topology.")
+    return len(layers) - 1
+
+
+def _ifub(adjacency: _Adjacency) -> int:
+    """
+    Diameter of an undirected topology, with the iFUB algorithm (Crescenzi et al., 2013).
+
+    The search starts from a process close to the center of the graph, found by a few sweeps: after a
+    breadth-first search from the process of highest degree, the farthest process from the last candidate
+    is searched from, and the process whose largest distance to all processes searched from so far is
+    smallest becomes the next candidate. Processing the layers around the best candidate from the farthest,
+    the eccentricities of the processes in layer `k` bound the diameter from below, while any two processes
+    in closer layers are at distance at most `2(k - 1)`; the search stops as soon as the bounds meet.
+    """
+    n = adjacency.size
+    if n <= 1:
+        return 0
+    bounds, layers = _bfs(adjacency, (max(range(n), key=adjacency.degree),))
+    if sum(len(layer) for layer in layers) < n:
+        raise ValueError("The topology is not connected.")
+    best = layers
+    lower = len(layers) - 1
+    for _ in range(_SWEEPS):
+        distances, far = _bfs(adjacency, (layers[-1][0],))
+        lower = max(lower, len(far) - 1)
+        bounds = list(map(max, bounds, distances))
+        _, layers = _bfs(adjacency, (min(range(n), key=bounds.__getitem__),))
+        best = min(best, layers, key=lambda layers: (len(layers), len(layers[-1])))
+    layers = best
+
+    k = len(layers) - 1
+    lower = max(lower, k)
+    upper = 2 * k
+    while upper > lower:
+        # all of the layer is needed: a process of the layer that is not searched from may be farther
+        lower = max(lower, max(_eccentricity(adjacency, i) for i in layers[k]))
+        if lower > 2 * (k - 1):
+            # no pair of processes in closer layers can be farther apart
+            return lower
+        upper = 2 * (k - 1)
+        k -= 1
+    return lower
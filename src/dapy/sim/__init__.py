@@ -5,21 +5,51 @@ This module defines the runtime environment for simulating distributed algorithm
 
 The main components of this module include:
 - `.simulator.Simulator`: The main class that runs a simulation according to a given system model and an algorithm.
+    - `.rounds.RoundSimulator`: A lockstep variant for synchronous systems, which processes a whole round per step.
 - `.configuration.Configuration`: Represents the state of a system. This is a collection of the state of each process.
 - `.trace.Trace`: When tracing is enabled, this class stores the entire history of the simulation.
+    - `.trace.DeltaHistory`: A compact history that stores only the changes between configurations.
+- `.sink.TraceSink`: Receives the trace while the simulation runs, instead of keeping it in memory.
+    - `.sink.FileTraceSink`: Streams the trace to an append-only file, read back with `.sink.TraceReader`.
+
+- `.batch.run_batch`: Executes many independent runs in parallel and collects summary metrics of each run.
 
 In addition, the module provides a set of utility classes and functions to facilitate the simulation process, including:
 - `.settings.Settings`: Configuration settings for the simulation.
+- `.scheduler.Scheduler`: The queue of scheduled events, either `.scheduler.HeapScheduler` (any model) or
+    `.scheduler.CalendarScheduler` (best for synchronous models).
+- `.clock.Clock`: Internal representation of simulated time, either `.clock.TimedeltaClock` (default) or
+    `.clock.TickClock` (integer ticks).
 - `.timed.TimedEvent`: Represents an event associated with a scheduled time.
 - `.timed.TimedConfiguration`: Represents a configuration with a creation time.
+- `.interner.Interner`: Shares one instance of equal immutable values among states and events (hash-consing).
+- `.metrics.MetricsCollector`: Streaming message and time complexity metrics of a simulation.
+- `.profiler.Profiler`: Counters and timers of the phases of a simulation, exported as a table or a flamegraph.
 
 
 """
 
 # re-exports
+from .batch import RunResult as RunResult
+from .batch import run_batch as run_batch
+from .clock import Clock as Clock
+from .clock import TickClock as TickClock
+from .clock import TimedeltaClock as TimedeltaClock
 from .configuration import Configuration as Configuration
+from .interner import Interner as Interner
+from .interner import InternerStats as InternerStats
+from .metrics import MetricsCollector as MetricsCollector
+from .profiler import Profiler as Profiler
+from .rounds import RoundSimulator as RoundSimulator
+from .scheduler import CalendarScheduler as CalendarScheduler
+from .scheduler import HeapScheduler as HeapScheduler
+from .scheduler import Scheduler as Scheduler
 from .settings import Settings as Settings
 from .simulator import Simulator as Simulator
+from .sink import FileTraceSink as FileTraceSink
+from .sink import TraceReader as TraceReader
+from .sink import TraceSink as TraceSink
 from .timed import TimedConfiguration as TimedConfiguration
 from .timed import TimedEvent as TimedEvent
+from .trace import DeltaHistory as DeltaHistory
 from .trace import Trace as Trace
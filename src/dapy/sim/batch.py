@@ -0,0 +1,154 @@
+"""
+Parallel execution of many independent runs of the same algorithm in the same system.
+
+Each run is identified by its index and gets its own seed, derived deterministically from a base seed,
+so that a batch gives the same results regardless of the number of workers or of how runs are split into
+chunks. The seed of a run is the seed of the random stream of its simulator (see `.simulator.Simulator.rng`).
+Runs are submitted to a `ProcessPoolExecutor` in chunks, and each worker only sends back the
+summary metrics selected by the user, rather than the simulator or its trace.
+
+Example:
+```python
+from operator import attrgetter
+
+results = run_batch(
+    system, LearnGraphAlgorithm(system), runs=1000,
+    metrics={"time": attrgetter("current_time")},
+    initial_events=[(timedelta(0), Start(target=Pid(1)))],
+)
+```
+Metric functions are sent to the worker processes and must therefore be picklable (e.g., module-level functions).
+"""
+
+import hashlib
+import os
+import pickle
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from ..core import Algorithm, Event, System
+from .settings import Settings
+from .simulator import Simulator
+
+
+@dataclass(frozen=True)
+class RunResult:
+    """
+    Class to represent the outcome of one run of a batch.
+    
+    Attributes:
+        index (int): The index of the run in the batch.
+        seed (int): The seed used for the run.
+        steps (int): The number of steps executed.
+        final_time (timedelta): The simulation time at the end of the run.
+        metrics (dict[str, Any]): The values of the metrics selected for the batch.
+    """
+    index: int
+    seed: int
+    steps: int
+    final_time: timedelta
+    metrics: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class _RunSpec:
+    system: System
+    algorithm: Algorithm
+    metrics: Mapping[str, Callable[[Simulator], Any]]
+    initial_events: tuple[tuple[timedelta, Event], ...]
+    settings: Settings
+    step_limit: Optional[int]
+    simulator: type[Simulator]
+
+
+def derive_seed(base_seed: int, index: int) -> int:
+    """
+    Derive the seed of the run with the given index from the base seed of a batch.
+    """
+    digest = hashlib.blake2b(f"{base_seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _run_one(payload: bytes, index: int, seed: int) -> RunResult:
+    """
+    Execute a single run, on a fresh copy of the system and algorithm.
+    """
+    # unpickling gives each run its own copy of the system and algorithm
+    spec: _RunSpec = pickle.loads(payload)
+    sim = spec.simulator.from_system(spec.system, spec.algorithm, settings=spec.settings, seed=seed)
+    sim.start()
+    for at, event in spec.initial_events:
+        sim.schedule_event(at, event)
+    steps = 0
+    while not sim.is_finished() and (spec.step_limit is None or steps < spec.step_limit):
+        sim.advance_step()
+        steps += 1
+    metrics = {name: metric(sim) for name, metric in spec.metrics.items()}
+    return RunResult(index=index, seed=seed, steps=steps, final_time=sim.current_time, metrics=metrics)
+
+
+def _run_chunk(payload: bytes, runs: list[tuple[int, int]]) -> list[RunResult]:
+    """
+    Execute a chunk of runs, given as pairs of index and seed.
+    """
+    return [_run_one(payload, index, seed) for index, seed in runs]
+
+
+def run_batch(
+    system: System,
+    algorithm: Algorithm,
+    runs: int,
+    metrics: Mapping[str, Callable[[Simulator], Any]],
+    *,
+    initial_events: Iterable[tuple[timedelta, Event]] = (),
+    base_seed: int = 0,
+    settings: Settings = Settings(),
+    step_limit: Optional[int] = None,
+    simulator: type[Simulator] = Simulator,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 16,
+) -> list[RunResult]:
+    """
+    Execute independent runs of an algorithm in a system, in parallel, and return their results by index.
+    
+    Args:
+        system: The system in which every run is executed.
+        algorithm: The algorithm executed in every run.
+        runs: The number of runs.
+        metrics: Functions computing the summary metrics of a run from the simulator at the end of the run.
+        initial_events: Events scheduled in every run after the simulator is started.
+        base_seed: The seed from which the seed of each run is derived (see `derive_seed`).
+        settings: The settings of every simulator.
+        step_limit: An optional limit on the number of steps of each run.
+        simulator: The class of simulator to use.
+        max_workers: The number of worker processes (default: number of processors).
+            With a single worker, runs are executed in the current process.
+        chunk_size: The number of runs submitted to a worker at once.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be a positive integer.")
+    spec = _RunSpec(system, algorithm, dict(metrics), tuple(initial_events), settings, step_limit, simulator)
+    payload = pickle.dumps(spec)
+    seeds = [(index, derive_seed(base_seed, index)) for index in range(runs)]
+    chunks = [seeds[i:i + chunk_size] for i in range(0, runs, chunk_size)]
+    
+    if max_workers == 1:
+        return [result for chunk in chunks for result in _run_chunk(payload, chunk)]
+    
+    results: list[RunResult] = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # bound the number of pending chunks, so that large batches are not submitted all at once
+        max_pending = 2 * (max_workers or os.cpu_count() or 1)
+        pending: set[Future] = set()
+        for chunk in chunks:
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results.extend(future.result())
+            pending.add(executor.submit(_run_chunk, payload, chunk))
+        for future in pending:
+            results.extend(future.result())
+    return sorted(results, key=lambda result: result.index)
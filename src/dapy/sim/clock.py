@@ -0,0 +1,96 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional, TypeAlias
+
+from ..core import RandomStream, SynchronyModel
+from ..core.system import ticks_of, timedelta_of
+
+# internal representation of a point in simulated time: a `timedelta` or a number of ticks, depending on the clock
+Instant: TypeAlias = timedelta | int
+
+
+class Clock(ABC):
+    """
+    Abstract class to represent how the simulator keeps track of time internally.
+    
+    Times are converted from and to `timedelta` only when they cross the API of the simulator
+    (scheduling events from outside, reporting the current time, recording the trace).
+    """
+    @abstractmethod
+    def to_internal(self, time: timedelta) -> Instant:
+        """
+        Convert a time to the internal representation.
+        """
+        
+    @abstractmethod
+    def to_timedelta(self, time: Instant) -> timedelta:
+        """
+        Convert a time from the internal representation.
+        """
+        
+    @abstractmethod
+    def arrival_times(self,
+                      synchrony: SynchronyModel,
+                      sent_at: Instant,
+                      n: int,
+                      rng: Optional[RandomStream] = None,
+    ) -> list[Instant]:
+        """
+        Return the internal arrival times of `n` messages sent at the given internal time,
+        with random delays drawn from the given stream.
+        """
+
+
+@dataclass(frozen=True)
+class TimedeltaClock(Clock):
+    """
+    Clock that keeps time as `timedelta` objects (default).
+    """
+    def to_internal(self, time: timedelta) -> timedelta:
+        return time
+    
+    def to_timedelta(self, time: timedelta) -> timedelta:
+        return time
+    
+    def arrival_times(self,
+                      synchrony: SynchronyModel,
+                      sent_at: timedelta,
+                      n: int,
+                      rng: Optional[RandomStream] = None,
+    ) -> list[timedelta]:
+        return synchrony.arrival_times_for(sent_at, n, rng)
+
+
+@dataclass(frozen=True)
+class TickClock(Clock):
+    """
+    Clock that keeps time as an integer number of ticks.
+    
+    Integers are much cheaper than `timedelta` to add and compare, which matters in the event queue.
+    The default resolution is one microsecond, which is also the resolution of `timedelta`;
+    times are rounded down to the resolution of the clock, except that a positive delay lasts at least one tick,
+    so that messages are never delivered at the tick they were sent.
+    
+    Attributes:
+        ticks_per_second (int): The number of ticks in one second of simulated time.
+    """
+    ticks_per_second: int = 1_000_000
+    
+    def __post_init__(self):
+        if self.ticks_per_second < 1:
+            raise ValueError("The number of ticks per second must be a positive integer.")
+    
+    def to_internal(self, time: timedelta) -> int:
+        return ticks_of(time, self.ticks_per_second)
+    
+    def to_timedelta(self, time: int) -> timedelta:
+        return timedelta_of(time, self.ticks_per_second)
+    
+    def arrival_times(self,
+                      synchrony: SynchronyModel,
+                      sent_at: int,
+                      n: int,
+                      rng: Optional[RandomStream] = None,
+    ) -> list[int]:
+        return synchrony.arrival_ticks_for(sent_at, n, self.ticks_per_second, rng)
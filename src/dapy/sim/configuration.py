@@ -1,67 +1,251 @@
-from dataclasses import dataclass
-from typing import Iterable, Self
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Mapping, Optional, Self
 
-from ..core import Pid, State
+from ..core import Pid, PidIndex, State
+
+#
+# Configurations are persistent: the states are stored in a 32-way trie (tuples of tuples)
+# indexed by the position of each process in the sorted list of PIDs (see `PidIndex`).
+# Updating the state of one process copies only the path from the root to the affected leaf,
+# i.e., O(log32 N) tuples of at most 32 entries, while all other nodes are shared with the
+# configuration it was derived from.
+#
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
 
 
 @dataclass(frozen=True)
 class Configuration:
-    states: dict[Pid, State]
+    """
+    Class to represent the configuration of a system, i.e., the state of every process.
+
+    Configurations are immutable. Deriving a new configuration with `updated` shares all unchanged
+    states with the original configuration, so that a step costs O(log N) rather than O(N) for a
+    system of N processes.
+    Two configurations are equal (and have the same hash) when they hold equal states, however they were built.
+    """
+    _pids: tuple[Pid, ...]
+    _index: PidIndex
+    _root: tuple
+    _shift: int
+    _base: Optional[tuple]
+    _delta: frozenset[int]
+    # hash of the states, computed on first use
+    _hash: Optional[int] = field(default=None, repr=False, compare=False)
+
+    def __init__(self, states: Mapping[Pid, State], index: Optional[PidIndex] = None):
+        """
+        Create a configuration from the states of all processes.
+        An index of the processes can be given to share it among configurations (e.g., `System.pid_index`),
+        in which case `states` must hold a state for each indexed process.
+        """
+        if index is None:
+            index = PidIndex(states.keys())
+        pids = index.pids
+        root, shift = _build([states[pid] for pid in pids])
+        object.__setattr__(self, '_pids', pids)
+        object.__setattr__(self, '_index', index)
+        object.__setattr__(self, '_root', root)
+        object.__setattr__(self, '_shift', shift)
+        object.__setattr__(self, '_base', None)
+        object.__setattr__(self, '_delta', frozenset())
+        object.__setattr__(self, '_hash', None)
+
+    def _derived(self, root: tuple, delta: frozenset[int]) -> Self:
+        """
+        Create a configuration over the same processes with a different trie.
+        The new configuration remembers the root of this one and the positions that were updated,
+        so that comparing the two does not require traversing the tries.
+        """
+        config = object.__new__(type(self))
+        object.__setattr__(config, '_pids', self._pids)
+        object.__setattr__(config, '_index', self._index)
+        object.__setattr__(config, '_root', root)
+        object.__setattr__(config, '_shift', self._shift)
+        object.__setattr__(config, '_base', self._root)
+        object.__setattr__(config, '_delta', delta)
+        object.__setattr__(config, '_hash', None)
+        return config
+
+    @property
+    def states(self) -> dict[Pid, State]:
+        """
+        The states of all processes, indexed by their PID.
+        This builds a new dictionary on each access, and hence costs O(N).
+        """
+        return dict(zip(self._pids, _leaves(self._root, self._shift)))
 
     def updated(self, states: Iterable[State]) -> Self:
         """
         Create a new configuration with updated states.
-        """
-        new_states = {state.pid: state for state in states}
-        updated_states = {pid: new_states.get(pid, state) for pid, state in self.states.items()}
-        return Configuration(updated_states)
+        States of processes that are not part of the configuration are ignored.
+        """
+        updates = [(i, state) for state in states if (i := self._index.get(state.pid)) is not None]
+        if not updates:
+            return self
+        if len(updates) * 8 >= len(self._pids):
+            # when a large part of the processes change at once (e.g., a synchronous round),
+            # rebuilding the trie is cheaper than copying a path for each of them
+            values = list(_leaves(self._root, self._shift))
+            for i, state in updates:
+                values[i] = state
+            root, _ = _build(values)
+        else:
+            root = self._root
+            for i, state in updates:
+                root = _assoc(root, self._shift, i, state)
+            if root is self._root:
+                return self
+        return self._derived(root, frozenset(i for i, _ in updates))
 
     def processes(self) -> Iterable[Pid]:
         """
         Get the PIDs of all processes in the configuration.
         """
-        return sorted(self.states.keys())
-    
+        return list(self._pids)
+
     def changed_from(self, other: Self) -> Iterable[Pid]:
         """
         Get the PIDs of processes that have changed between two configurations.
         """
-        return (pid for pid in self.processes() if pid in other and self.states[pid] != other.states[pid])
-    
+        if self._base is other._root or other._base is self._root:
+            # one configuration was derived from the other: only the recorded positions can differ
+            delta = self._delta if self._base is other._root else other._delta
+            return (self._pids[i] for i in sorted(delta) if self._leaf(i) != other._leaf(i))
+        if self._index is other._index or self._pids == other._pids:
+            # subtrees shared between the two configurations are skipped altogether
+            return (self._pids[i] for i in _diff(self._root, other._root, self._shift, 0))
+        return (pid for pid in self._pids if pid in other and self[pid] != other[pid])
+
     def __getitem__(self, pid: Pid) -> State:
         """
         Get the state of a process by its PID.
         """
-        return self.states.get(pid)
+        i = self._index.get(pid)
+        if i is None:
+            return None
+        return self._leaf(i)
+
+    def _leaf(self, i: int) -> State:
+        """
+        Get the state stored at the given position of the trie.
+        """
+        node = self._root
+        shift = self._shift
+        while shift > 0:
+            node = node[(i >> shift) & _MASK]
+            shift -= _BITS
+        return node[i & _MASK]
 
     def __contains__(self, pid: Pid) -> bool:
         """
         Check if a process is in the configuration.
         """
-        return pid in self.states
+        return pid in self._index
 
-    def __iter__(self) -> Iterable[State]:
+    def __iter__(self) -> Iterator[State]:
         """
         Iterate over the states in the configuration.
         """
-        return iter(self.states.values())
-    
+        return _leaves(self._root, self._shift)
+
     def __len__(self) -> int:
         """
         Get the number of states in the configuration.
         """
-        return len(self.states)
+        return len(self._pids)
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Configuration):
+            return NotImplemented
+        if self._root is other._root:
+            return self._pids == other._pids
+        if self._pids is not other._pids and self._pids != other._pids:
+            return False
+        if self._base is other._root or other._base is self._root:
+            # one configuration was derived from the other: only the recorded positions can differ
+            return next(iter(self.changed_from(other)), None) is None
+        return next(_diff(self._root, other._root, self._shift, 0), None) is None
+
+    def __hash__(self) -> int:
+        # the states hold their PID, so they determine the configuration; the internal layout does not
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(tuple(_leaves(self._root, self._shift))))
+        return self._hash
+
+    def __getstate__(self) -> dict:
+        # hashes of strings are salted per process, so the cached hash is not carried over
+        return {**self.__dict__, '_hash': None}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(states={self.states!r})"
 
     @classmethod
-    def from_states(cls, states: Iterable[State]) -> Self:
+    def from_states(cls, states: Iterable[State], index: Optional[PidIndex] = None) -> Self:
         """
         Create a configuration from a list of states.
         """
-        return cls(states={state.pid: state for state in states})
+        return cls(states={state.pid: state for state in states}, index=index)
 
     def __str__(self) -> str:
         """
         String representation of the configuration.
         """
-        states = '\n  '.join(str(self.states[p]) for p in sorted(self.states.keys()) )
+        states = '\n  '.join(str(state) for state in self)
         return f"Configuration:\n  {states if states else '<empty>'}"
+
+
+def _build(values: list[State]) -> tuple[tuple, int]:
+    """
+    Build a trie holding the given values, and return its root and the shift of the root level.
+    """
+    nodes = [tuple(values[i:i + _WIDTH]) for i in range(0, len(values), _WIDTH)]
+    shift = 0
+    while len(nodes) > 1:
+        nodes = [tuple(nodes[i:i + _WIDTH]) for i in range(0, len(nodes), _WIDTH)]
+        shift += _BITS
+    return (nodes[0] if nodes else ()), shift
+
+
+def _assoc(node: tuple, shift: int, i: int, value: State) -> tuple:
+    """
+    Return a copy of the trie where the `i`-th value is replaced, sharing all untouched nodes.
+    """
+    j = (i >> shift) & _MASK
+    if shift == 0:
+        if node[j] is value:
+            return node
+        return (*node[:j], value, *node[j + 1:])
+    child = _assoc(node[j], shift - _BITS, i, value)
+    if child is node[j]:
+        return node
+    return (*node[:j], child, *node[j + 1:])
+
+
+def _leaves(node: tuple, shift: int) -> Iterator[State]:
+    """
+    Iterate over the values of the trie, in index order.
+    """
+    if shift == 0:
+        yield from node
+    else:
+        for child in node:
+            yield from _leaves(child, shift - _BITS)
+
+
+def _diff(a: tuple, b: tuple, shift: int, base: int) -> Iterator[int]:
+    """
+    Iterate over the indices at which two tries of identical shape hold different values.
+    """
+    if a is b:
+        return
+    if shift == 0:
+        for j, (x, y) in enumerate(zip(a, b)):
+            if x is not y and x != y:
+                yield base + j
+    else:
+        for j, (x, y) in enumerate(zip(a, b)):
+            yield from _diff(x, y, shift - _BITS, base + (j << shift))
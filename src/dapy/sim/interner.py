@@ -0,0 +1,127 @@
+"""
+Hash-consing of immutable values.
+
+An `Interner` keeps one canonical instance of each distinct value it has seen, so that equal values produced
+independently (e.g., the same set of known processes reached by many processes, or carried by many messages)
+are stored once. The simulator interns the fields of new states and events when `Settings.intern_values` is set,
+before they are recorded in the trace.
+"""
+
+import sys
+
+from dataclasses import dataclass, fields, is_dataclass
+from functools import cache
+from typing import Any, Iterable, TypeVar
+
+from ..core import ChannelSet, ProcessSet
+
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class InternerStats:
+    """
+    Statistics of an `Interner`.
+
+    Attributes:
+        values (int): Number of distinct values held by the interner.
+        lookups (int): Number of values that were interned.
+        hits (int): Number of values replaced by an equal value that was interned before.
+        bytes_saved (int): Estimated size of the duplicates that were replaced, which no longer need to be kept.
+        table_bytes (int): Size of the table of the interner itself, which offsets the savings.
+    """
+    values: int
+    lookups: int
+    hits: int
+    bytes_saved: int
+    table_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of the lookups that found an equal value, or 0 if there was no lookup.
+        """
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.values} distinct values, {self.hits}/{self.lookups} duplicates ({self.hit_rate:.1%}), "
+                f"~{self.bytes_saved / 1024:.1f} KiB saved, {self.table_bytes / 1024:.1f} KiB of table")
+
+
+class Interner:
+    """
+    Table of canonical instances of immutable values.
+
+    Only values whose exact type is one of `types` are interned; views such as `ProcessSet.all_except`
+    are left alone, as hashing them would materialize the set they avoid building.
+    """
+    def __init__(self, types: Iterable[type] = (ProcessSet, ChannelSet, frozenset)):
+        self.types = frozenset(types)
+        self._table: dict[Any, Any] = {}
+        self.lookups = 0
+        self.hits = 0
+        self.bytes_saved = 0
+
+    def intern(self, value: T) -> T:
+        """
+        Get the canonical instance of a value: the first equal value that was interned.
+        """
+        if type(value) not in self.types:
+            return value
+        self.lookups += 1
+        canonical = self._table.setdefault(value, value)
+        if canonical is not value:
+            self.hits += 1
+            self.bytes_saved += _size_of(value)
+        return canonical
+
+    def intern_fields(self, obj: T) -> T:
+        """
+        Replace the fields of a dataclass instance (e.g., a `State` or an `Event`) by their canonical instances.
+
+        The instance is updated in place and returned: the fields are immutable, and each is replaced by an
+        equal value, so this is only observable through identity.
+        """
+        for name in _field_names(type(obj)):
+            value = getattr(obj, name)
+            if type(value) in self.types:
+                canonical = self.intern(value)
+                if canonical is not value:
+                    object.__setattr__(obj, name, canonical)
+        return obj
+
+    def stats(self) -> InternerStats:
+        """
+        Get the statistics of the interner.
+        """
+        return InternerStats(len(self._table), self.lookups, self.hits, self.bytes_saved, sys.getsizeof(self._table))
+
+    def clear(self) -> None:
+        """
+        Forget all canonical instances and reset the statistics.
+        """
+        self._table.clear()
+        self.lookups = self.hits = self.bytes_saved = 0
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+@cache
+def _field_names(cls: type) -> tuple[str, ...]:
+    """
+    Names of the compared fields of a dataclass (i.e., not caches), or nothing for other classes.
+    """
+    return tuple(f.name for f in fields(cls) if f.compare) if is_dataclass(cls) else ()
+
+
+def _size_of(value: object) -> int:
+    """
+    Estimated size of a value, including the integers that hold the members of process and channel sets.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, ChannelSet):
+        size += sys.getsizeof(value._mask) + sys.getsizeof(value._ends)
+    elif isinstance(value, ProcessSet):
+        size += sys.getsizeof(value._small) + sys.getsizeof(value._dense)
+    return size
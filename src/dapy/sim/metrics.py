@@ -0,0 +1,175 @@
+"""
+Streaming complexity metrics of a simulation.
+
+A `MetricsCollector` is updated by the simulator as events are scheduled and processed, in constant time per
+event, so that the usual measures of a distributed algorithm are available without recording a trace:
+- message complexity: the number of messages, per type and per channel, and optionally their size in bits;
+- time complexity: the length of the longest causal chain of events (Lamport depth), the longest chain of
+    messages (the number of rounds, in asynchronous terms), and the time at which the last event was processed;
+- the load of the simulator: the number of scheduled events (queue size) and of messages in flight.
+
+The simulator collects metrics when `Settings.collect_metrics` is set (or a collector is given).
+
+Example:
+```python
+sim = Simulator.from_system(system, algorithm, settings=Settings(collect_metrics=True))
+sim.start()
+sim.run_to_completion()
+print(sim.metrics.messages, sim.metrics.rounds, sim.metrics.max_queue_size)
+```
+"""
+
+from collections import Counter
+from datetime import timedelta
+from functools import cache
+from typing import Any, Callable, Iterable, Optional
+
+from ..core import Channel, Event, Message, Pid
+
+
+class MetricsCollector:
+    """
+    Counters of the messages and of the causal depth of the events of a simulation.
+
+    The depth of an event is one more than the Lamport clock of the process that issued it when it was issued
+    (events scheduled from outside the algorithm have depth 1); processing an event advances the clock of its
+    target to at least its depth. The hops of an event count the messages in its causal chain in the same way,
+    so that the number of `rounds` is the longest chain of messages.
+
+    In a `.rounds.RoundSimulator`, the events issued by a process during a round are scheduled once the process
+    has handled all its events of the round, and their depth is based on the clock of the process at that point.
+
+    Attributes:
+        messages (int): Number of messages sent.
+        signals (int): Number of signals issued.
+        bits (int): Total size of the messages sent, if a `message_bits` function is given.
+        messages_by_type (Counter[str]): Number of messages sent per message class.
+        messages_by_channel (Counter[Channel]): Number of messages sent per (directed) channel.
+        in_flight (int): Number of messages sent and not yet delivered.
+        max_in_flight (int): Maximum number of messages in flight at the same time.
+        max_queue_size (int): Maximum number of scheduled events at the beginning of a step.
+        steps (int): Number of steps processed.
+        events_processed (int): Number of events processed.
+        max_depth (int): Length of the longest causal chain of processed events (Lamport depth).
+        rounds (int): Length of the longest chain of delivered messages.
+        last_time (timedelta): Simulation time of the last processed event.
+    """
+    def __init__(self, message_bits: Optional[Callable[[Message], int]] = None):
+        self.message_bits = message_bits
+        self.messages = 0
+        self.signals = 0
+        self.bits = 0
+        self.messages_by_type: Counter[str] = Counter()
+        self.messages_by_channel: Counter[Channel] = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.max_queue_size = 0
+        self._queue_size_total = 0
+        self.steps = 0
+        self.events_processed = 0
+        self.max_depth = 0
+        self.rounds = 0
+        self.last_time = timedelta(0)
+        # Lamport clock and message hops of each process
+        self._clocks: dict[Pid, tuple[int, int]] = {}
+        # depth and hops of each scheduled event, by identity, with the number of times it is scheduled
+        self._pending: dict[int, list[int]] = {}
+
+    def issued(self, events: Iterable[Event], sender: Optional[Pid] = None) -> None:
+        """
+        Account for events issued by a process (or from outside the algorithm, without sender).
+        """
+        clock, hops = self._clocks.get(sender, (0, 0)) if sender is not None else (0, 0)
+        for event in events:
+            if _is_message(type(event)):
+                self.messages += 1
+                self.messages_by_type[type(event).__name__] += 1
+                self.messages_by_channel[Channel(event.sender, event.target)] += 1
+                if self.message_bits is not None:
+                    self.bits += self.message_bits(event)
+                self.in_flight += 1
+                if self.in_flight > self.max_in_flight:
+                    self.max_in_flight = self.in_flight
+                self._pend(event, clock + 1, hops + 1)
+            else:
+                self.signals += 1
+                self._pend(event, clock + 1, hops)
+
+    def step(self, queue_size: int, time: timedelta) -> None:
+        """
+        Account for a step of the simulator, with the number of events scheduled before it.
+        """
+        self.steps += 1
+        self._queue_size_total += queue_size
+        if queue_size > self.max_queue_size:
+            self.max_queue_size = queue_size
+        self.last_time = time
+
+    def processed(self, event: Event) -> None:
+        """
+        Account for an event processed by its target process.
+        """
+        self.events_processed += 1
+        key = id(event)
+        pending = self._pending.get(key)
+        if pending is None:
+            depth, hops = 1, 0
+        else:
+            depth, hops, count = pending
+            if count == 1:
+                del self._pending[key]
+            else:
+                pending[2] -= 1
+        if _is_message(type(event)):
+            self.in_flight -= 1
+        clock, known_hops = self._clocks.get(event.target, (0, 0))
+        clock, hops = max(clock + 1, depth), max(known_hops, hops)
+        self._clocks[event.target] = (clock, hops)
+        if clock > self.max_depth:
+            self.max_depth = clock
+        if hops > self.rounds:
+            self.rounds = hops
+
+    @property
+    def mean_queue_size(self) -> float:
+        """
+        Mean number of scheduled events at the beginning of a step, or 0 if there was no step.
+        """
+        return self._queue_size_total / self.steps if self.steps else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Get the scalar metrics as a dictionary (e.g., as the metrics of a run of `.batch.run_batch`).
+        """
+        return {
+            "messages": self.messages,
+            "signals": self.signals,
+            "bits": self.bits,
+            "max_in_flight": self.max_in_flight,
+            "max_queue_size": self.max_queue_size,
+            "mean_queue_size": self.mean_queue_size,
+            "steps": self.steps,
+            "events_processed": self.events_processed,
+            "max_depth": self.max_depth,
+            "rounds": self.rounds,
+            "last_time": self.last_time,
+        }
+
+    def _pend(self, event: Event, depth: int, hops: int) -> None:
+        """
+        Record the depth and hops of a scheduled event until it is processed.
+        """
+        pending = self._pending.get(id(event))
+        if pending is None:
+            self._pending[id(event)] = [depth, hops, 1]
+        else:
+            # the same instance is scheduled again: keep the deepest chain
+            pending[0], pending[1], pending[2] = max(pending[0], depth), max(pending[1], hops), pending[2] + 1
+
+
+@cache
+def _is_message(cls: type) -> bool:
+    """
+    Whether a class of events is a class of messages (cached, as checks against the abstract `Event` are slow).
+    """
+    return issubclass(cls, Message)
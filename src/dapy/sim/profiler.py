@@ -0,0 +1,165 @@
+"""
+Instrumentation of the hot path of a simulation.
+
+A `Profiler` keeps counters and cumulative (wall-clock) timers of the phases of each step of a `Simulator`:
+- `on_start`, `on_event`: the handlers of the algorithm, also broken down per event class and per process;
+- `delays`: the sampling of the arrival times of messages from the synchrony model;
+- `push`, `pop`: the operations on the scheduler;
+- `configuration`: the updates of the configuration with new states;
+- `intern`: the hash-consing of new states and events (see `.interner.Interner`);
+- `trace`: the recording of events and configurations in the trace and the sink.
+
+The simulator only instruments itself when `Settings.profile` is set (or a profiler is given); otherwise,
+the only cost is a test per phase. The results can be printed with `summary` or exported as a collapsed-stack
+file with `write_collapsed`, which flamegraph tools (e.g., `flamegraph.pl`, speedscope) read directly.
+
+Example:
+```python
+sim = Simulator.from_system(system, algorithm, settings=Settings(profile=True))
+sim.start()
+sim.run_to_completion()
+print(sim.profiler.summary())
+sim.profiler.write_collapsed("profile.folded")
+```
+"""
+
+from time import perf_counter_ns
+from typing import Any, Hashable, Iterable
+
+from ..core import Event, Pid
+
+# phases of a simulation, in the order they are listed
+PHASES = ('on_start', 'on_event', 'delays', 'push', 'pop', 'configuration', 'intern', 'trace')
+
+
+class Profiler:
+    """
+    Counters and cumulative timers (in nanoseconds) per phase, per event class and per process.
+
+    Timings are chained: each call to `lap` (or `handled`) records the time since the previous mark and
+    returns the current time, which is the mark of the next phase.
+    """
+    def __init__(self):
+        self.phases: dict[str, list[int]] = {phase: [0, 0] for phase in PHASES}
+        self.event_classes: dict[str, list[int]] = {}
+        self.processes: dict[Pid, list[int]] = {}
+        # time spent in the steps (and start) of the simulator, including what is not broken down in phases
+        self.total_ns = 0
+        self.steps = 0
+
+    @staticmethod
+    def now() -> int:
+        """
+        Get the current time of the timers, in nanoseconds.
+        """
+        return perf_counter_ns()
+
+    def lap(self, phase: str, since: int) -> int:
+        """
+        Record one occurrence of a phase that started at time `since`, and return the current time.
+        """
+        now = perf_counter_ns()
+        _count(self.phases, phase, now - since)
+        return now
+
+    def handled(self, event: Event, since: int) -> int:
+        """
+        Record the handling of an event by the algorithm, that started at time `since`, and return the current time.
+        """
+        now = perf_counter_ns()
+        elapsed = now - since
+        _count(self.phases, 'on_event', elapsed)
+        _count(self.event_classes, type(event).__name__, elapsed)
+        _count(self.processes, event.target, elapsed)
+        return now
+
+    def started(self, pid: Pid, since: int) -> int:
+        """
+        Record the start of a process by the algorithm, that started at time `since`, and return the current time.
+        """
+        now = perf_counter_ns()
+        _count(self.phases, 'on_start', now - since)
+        _count(self.processes, pid, now - since)
+        return now
+
+    def stepped(self, since: int, steps: int = 1) -> None:
+        """
+        Record a whole step of the simulator that started at time `since` (or its start, with no step).
+        """
+        self.total_ns += perf_counter_ns() - since
+        self.steps += steps
+
+    @property
+    def other_ns(self) -> int:
+        """
+        Time spent in the steps of the simulator outside of the instrumented phases.
+        """
+        return max(0, self.total_ns - sum(ns for _, ns in self.phases.values()))
+
+    def summary(self, top: int = 10) -> str:
+        """
+        Format the counters and timers as a table, with the `top` event classes and processes by time.
+        """
+        total = self.total_ns or 1
+        rows = [f"{'':<28} {'count':>10} {'total ms':>11} {'mean us':>9} {'share':>7}"]
+
+        def section(title: str, counters: Iterable[tuple[Hashable, list[int]]]) -> None:
+            rows.append(title)
+            for key, (count, ns) in counters:
+                mean = ns / count / 1000 if count else 0.0
+                rows.append(f"  {key!s:<26} {count:>10,} {ns / 1e6:>11.3f} {mean:>9.2f} {ns / total:>7.1%}")
+
+        section(f"phases ({self.steps:,} steps, {self.total_ns / 1e6:.3f} ms)",
+                [*((phase, counter) for phase, counter in self.phases.items() if counter[0]),
+                 ('other', [self.steps, self.other_ns])])
+        section("event classes", _top(self.event_classes, top))
+        section("processes", _top(self.processes, top))
+        return '\n'.join(rows)
+
+    def collapsed_stacks(self) -> list[str]:
+        """
+        Get the timers as collapsed stacks (`frame;frame value`), with values in microseconds.
+
+        Handlers are broken down per event class (e.g., `simulator;on_event;Message`), and the time of the steps
+        outside of the instrumented phases is attributed to the `simulator` frame itself.
+        """
+        lines = [f"simulator {self.other_ns // 1000}"]
+        for phase, (_, ns) in self.phases.items():
+            if phase == 'on_event':
+                continue
+            if ns:
+                lines.append(f"simulator;{phase} {ns // 1000}")
+        for name, (_, ns) in self.event_classes.items():
+            lines.append(f"simulator;on_event;{name} {ns // 1000}")
+        return lines
+
+    def write_collapsed(self, path: str) -> None:
+        """
+        Write the timers to a collapsed-stack file (see `collapsed_stacks`).
+        """
+        with open(path, 'w') as file:
+            file.writelines(line + '\n' for line in self.collapsed_stacks())
+
+    def clear(self) -> None:
+        """
+        Reset all counters and timers.
+        """
+        self.__init__()
+
+
+def _top(counters: dict[Any, list[int]], top: int) -> list[tuple[Hashable, list[int]]]:
+    """
+    The `top` entries of a table of counters with the highest cumulative time.
+    """
+    return sorted(counters.items(), key=lambda item: item[1][1], reverse=True)[:top]
+
+
+def _count(counters: dict[Any, list[int]], key: Hashable, elapsed: int) -> None:
+    """
+    Add one occurrence, that took `elapsed` nanoseconds, to the counter of a key.
+    """
+    counter = counters.get(key)
+    if counter is None:
+        counter = counters[key] = [0, 0]
+    counter[0] += 1
+    counter[1] += elapsed
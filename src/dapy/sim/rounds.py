@@ -0,0 +1,99 @@
+from ..core import Event, PartiallySynchronous, Pid, State, Synchronous
+from .simulator import Simulator
+
+
+class RoundSimulator(Simulator):
+    """
+    Class to represent a lockstep simulation of an algorithm in a synchronous system.
+    
+    Instead of processing scheduled events one at a time, each step processes a whole round, i.e., all the
+    events scheduled at the earliest pending time. The events of a round are grouped by target process, the
+    handlers of each process are applied to its events in one pass, and the new states of all processes are
+    committed to the configuration at once at the end of the round.
+    
+    Events issued during a round are scheduled in the same order as with the event-driven `Simulator`, and
+    each process handles its events in the same order, so that both simulators produce identical executions.
+    Signals issued during a round are handled within that same round.
+    
+    The only differences are that a step (including `run_to_completion(step_limit)`) is a round rather than
+    a single event, and that the trace records one configuration per round.
+    This simulator requires a `Synchronous` system model.
+    """
+    
+    def __post_init__(self):
+        synchrony = self.system.synchrony
+        if not isinstance(synchrony, Synchronous) or isinstance(synchrony, PartiallySynchronous):
+            raise ValueError("A round-based simulation requires a synchronous system model.")
+        super().__post_init__()
+        
+    def advance_step(self) -> None:
+        """
+        Advance the simulation by one round.
+        """
+        if not self.scheduler:
+            return
+        profiler = self.profiler
+        if profiler is not None:
+            begin = profiler.now()
+        time, events = self.scheduler.pop_batch()
+        if profiler is not None:
+            profiler.lap('pop', begin)
+        if time > self._now:
+            self._now = time
+            self.current_time = self._clock.to_timedelta(time)
+        if self.metrics is not None:
+            self.metrics.step(len(self.scheduler) + len(events), self.current_time)
+        states: dict[Pid, State] = {}
+        while True:
+            self._apply_batch(events, states)
+            # signals issued during the round are due at the same time
+            if not self.scheduler or self.scheduler.peek_time() != time:
+                break
+            if profiler is not None:
+                mark = profiler.now()
+            _, events = self.scheduler.pop_batch()
+            if profiler is not None:
+                profiler.lap('pop', mark)
+        if profiler is not None:
+            mark = profiler.now()
+        self.current_configuration = self.current_configuration.updated(states.values())
+        if profiler is not None:
+            mark = profiler.lap('configuration', mark)
+        if self.trace is not None:
+            self.trace.add_history([(self.current_time, self.current_configuration)])
+        if self.sink is not None:
+            self.sink.add_history([(self.current_time, self.current_configuration)])
+        if profiler is not None:
+            if self.trace is not None or self.sink is not None:
+                profiler.lap('trace', mark)
+            profiler.stepped(begin)
+    
+    def _apply_batch(self, events: list[Event], states: dict[Pid, State]) -> None:
+        """
+        Apply a batch of events, grouped by target process, to the working states of the round.
+        """
+        by_target: dict[Pid, list[int]] = {}
+        for i, event in enumerate(events):
+            by_target.setdefault(event.target, []).append(i)
+        issued: list[list[Event]] = [[]] * len(events)
+        profiler = self.profiler
+        for pid, indices in by_target.items():
+            if pid not in self.current_configuration:
+                raise ValueError(f"{pid} not found in the current configuration.")
+            state = states[pid] if pid in states else self.current_configuration[pid]
+            if profiler is not None:
+                mark = profiler.now()
+            for i in indices:
+                if self.metrics is not None:
+                    self.metrics.processed(events[i])
+                state, issued[i] = self.algorithm.on_event(state, events[i])
+                if profiler is not None:
+                    mark = profiler.handled(events[i], mark)
+            if self.interner is not None:
+                state = self.interner.intern_fields(state)
+                if profiler is not None:
+                    profiler.lap('intern', mark)
+            states[pid] = state
+        # schedule in the order of the events that issued them, as the event-driven simulator would
+        for event, new_events in zip(events, issued):
+            self._schedule_all(new_events, event.target)
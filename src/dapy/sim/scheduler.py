@@ -0,0 +1,153 @@
+import heapq
+import itertools
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Iterator
+
+from ..core import Event, PartiallySynchronous, Synchronous, SynchronyModel
+from .clock import Instant
+
+
+class Scheduler(ABC):
+    """
+    Abstract class to represent the queue of events scheduled by the simulator.
+    
+    Events are returned in increasing order of time, and events scheduled at the same time are returned
+    in the order they were scheduled (FIFO). Times are in the internal representation of the simulator's clock.
+    """
+    @abstractmethod
+    def push(self, time: Instant, event: Event) -> None:
+        """
+        Schedule an event at the given time.
+        """
+    
+    @abstractmethod
+    def pop(self) -> tuple[Instant, Event]:
+        """
+        Remove and return the next event with its time.
+        """
+    
+    @abstractmethod
+    def pop_batch(self) -> tuple[Instant, list[Event]]:
+        """
+        Remove and return all the events scheduled at the earliest time, in FIFO order, with that time.
+        """
+    
+    @abstractmethod
+    def peek_time(self) -> Instant:
+        """
+        Return the time of the next event, without removing it.
+        """
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        Number of scheduled events.
+        """
+    
+    @abstractmethod
+    def __iter__(self) -> Iterator[tuple[Instant, Event]]:
+        """
+        Iterate over the scheduled events with their times, in the order they will be returned.
+        """
+        
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class HeapScheduler(Scheduler):
+    """
+    Scheduler based on a binary heap of `(time, sequence number, event)` tuples.
+    
+    Both `push` and `pop` cost O(log n) tuple comparisons for n scheduled events. Ties are broken by
+    comparing sequence numbers, never events. Suitable for any synchrony model.
+    """
+    def __init__(self):
+        self._heap: list[tuple[Instant, int, Event]] = []
+        self._sequence = itertools.count()
+        
+    def push(self, time: Instant, event: Event) -> None:
+        heapq.heappush(self._heap, (time, next(self._sequence), event))
+        
+    def pop(self) -> tuple[Instant, Event]:
+        time, _, event = heapq.heappop(self._heap)
+        return time, event
+    
+    def pop_batch(self) -> tuple[Instant, list[Event]]:
+        time, _, event = heapq.heappop(self._heap)
+        events = [event]
+        while self._heap and self._heap[0][0] == time:
+            events.append(heapq.heappop(self._heap)[2])
+        return time, events
+    
+    def peek_time(self) -> Instant:
+        return self._heap[0][0]
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def __iter__(self) -> Iterator[tuple[Instant, Event]]:
+        return ((time, event) for time, _, event in sorted(self._heap))
+
+
+class CalendarScheduler(Scheduler):
+    """
+    Scheduler based on buckets of events, one FIFO queue per distinct time.
+    
+    The distinct times are kept in a binary heap, so `push` costs O(1) when some event is already scheduled
+    at the same time and O(log b) otherwise, for b distinct pending times; `pop` costs O(1), plus O(log b)
+    when it empties a bucket, and `pop_batch` returns a whole bucket at once. This is best when events are
+    concentrated on few distinct times, as with a `Synchronous` model where every message arrives exactly one
+    fixed delay after it is sent.
+    """
+    def __init__(self):
+        self._buckets: dict[Instant, deque[Event]] = {}
+        self._times: list[Instant] = []
+        self._size = 0
+        
+    def push(self, time: Instant, event: Event) -> None:
+        bucket = self._buckets.get(time)
+        if bucket is None:
+            bucket = self._buckets[time] = deque()
+            heapq.heappush(self._times, time)
+        bucket.append(event)
+        self._size += 1
+        
+    def pop(self) -> tuple[Instant, Event]:
+        if not self._times:
+            raise IndexError("pop from an empty scheduler")
+        time = self._times[0]
+        bucket = self._buckets[time]
+        event = bucket.popleft()
+        if not bucket:
+            del self._buckets[time]
+            heapq.heappop(self._times)
+        self._size -= 1
+        return time, event
+    
+    def pop_batch(self) -> tuple[Instant, list[Event]]:
+        if not self._times:
+            raise IndexError("pop from an empty scheduler")
+        time = heapq.heappop(self._times)
+        events = list(self._buckets.pop(time))
+        self._size -= len(events)
+        return time, events
+    
+    def peek_time(self) -> Instant:
+        return self._times[0]
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self) -> Iterator[tuple[Instant, Event]]:
+        return ((time, event) for time in sorted(self._times) for event in self._buckets[time])
+
+
+def scheduler_for(synchrony: SynchronyModel) -> Scheduler:
+    """
+    Return the scheduler best suited to the given synchrony model.
+    """
+    if isinstance(synchrony, Synchronous) and not isinstance(synchrony, PartiallySynchronous):
+        return CalendarScheduler()
+    return HeapScheduler()
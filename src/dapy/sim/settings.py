@@ -1,11 +1,44 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass(frozen=True, order=True)
 class Settings:
     """
     Class to represent the settings of a simulation.
+    
+    Attributes:
+        is_verbose (bool): Print additional information during the simulation.
+        is_debug (bool): Enable debugging checks.
+        enable_trace (bool): Record a `Trace` of the simulation.
+        delta_trace (bool): Record the history of the trace as deltas (see `.trace.DeltaHistory`)
+            rather than as a list of full configurations.
+        keyframe_interval (int): Number of steps between two full configurations stored in a delta trace.
+        ticks_per_second (Optional[int]): When set, the simulator keeps time internally as an integer number
+            of ticks of this resolution (see `.clock.TickClock`) instead of `timedelta` objects.
+        rng_per_process (bool): Draw the delays of messages sent by each process from a separate stream,
+            split from the stream of the simulator, so that they do not depend on the activity of other processes.
+        precompute_neighbors (bool): Materialize the neighbor set of every process before the simulation starts
+            (see `System.precompute_neighbors`), so that algorithms share cached sets instead of querying the topology.
+        intern_values (bool): Replace the set-valued fields of new states and events by a single shared instance
+            of each distinct value (see `.interner.Interner`), so that equal values are stored once in the trace.
+        profile (bool): Time the phases of each step of the simulation, per event class and per process
+            (see `.profiler.Profiler`).
+        collect_metrics (bool): Count messages, causal depth and queue sizes while the simulation runs
+            (see `.metrics.MetricsCollector`), without recording a trace.
+        numpy_sampling (bool): Sample random delays in blocks with NumPy when it is installed (see
+            `..core.rng.RandomStream`). Seeded executions then differ depending on whether NumPy is installed,
+            so this is off by default.
     """
     is_verbose: bool = False
     is_debug: bool = False
     enable_trace: bool = False
+    delta_trace: bool = False
+    keyframe_interval: int = 100
+    ticks_per_second: Optional[int] = None
+    rng_per_process: bool = False
+    precompute_neighbors: bool = False
+    intern_values: bool = False
+    profile: bool = False
+    collect_metrics: bool = False
+    numpy_sampling: bool = False
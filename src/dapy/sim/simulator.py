@@ -1,51 +1,123 @@
-import heapq
-
 from dataclasses import dataclass, field
 from datetime import timedelta
 from typing import Optional, Self
 
-from ..core import Algorithm, Event, Message, System
+from ..core import Algorithm, Event, Message, Pid, RandomStream, System
+from .clock import Clock, Instant, TickClock, TimedeltaClock
 from .configuration import Configuration
+from .interner import Interner
+from .metrics import MetricsCollector
+from .profiler import Profiler
+from .scheduler import Scheduler, scheduler_for
 from .settings import Settings
+from .sink import TraceSink
 from .timed import TimedEvent
-from .trace import Trace
+from .trace import DeltaHistory, Trace
 
 
 @dataclass
 class Simulator:
+    """
+    Class to represent a discrete-event simulation of an algorithm in a system.
+    
+    Scheduled events are kept by a `.scheduler.Scheduler`. Events scheduled at the same time are processed
+    in the order they were scheduled (FIFO). Unless a scheduler is given explicitly, the simulator picks the
+    one best suited to the synchrony model of the system (see `.scheduler.scheduler_for`).
+    
+    Random message delays are drawn from the stream `rng` of the simulator, so that two simulators with
+    the same seed produce the same execution, without interfering with each other or with the `random` module.
+    Delays are drawn with `random` whether NumPy is installed or not, unless `Settings.numpy_sampling` opts in.
+    
+    With an `interner` (created when `Settings.intern_values` is set), the fields of new states and events
+    are replaced by shared instances of equal values; `interner.stats()` reports the memory this saves.
+    
+    With a `profiler` (created when `Settings.profile` is set), the simulator times the phases of each step
+    (handlers, delays, scheduler, configuration updates, tracing); see `.profiler.Profiler`.
+    
+    With a `metrics` collector (created when `Settings.collect_metrics` is set), the simulator counts messages,
+    causal depth and queue sizes as it runs, without recording a trace; see `.metrics.MetricsCollector`.
+    """
     system: System
     algorithm: Algorithm
     current_configuration: Configuration
     current_time: timedelta = field(default=timedelta(seconds=0))
     settings: Settings = field(default_factory=Settings)
     trace: Optional[Trace] = field(default=None)
-    scheduled_events: list[TimedEvent] = field(default_factory=list, init=False)
+    sink: Optional[TraceSink] = field(default=None)
+    scheduler: Optional[Scheduler] = field(default=None)
+    rng: Optional[RandomStream] = field(default=None)
+    interner: Optional[Interner] = field(default=None)
+    profiler: Optional[Profiler] = field(default=None)
+    metrics: Optional[MetricsCollector] = field(default=None)
+    # internal representation of time; see `.clock`
+    _clock: Clock = field(init=False, repr=False)
+    _now: Instant = field(init=False, repr=False)
+    _streams: dict[Pid, RandomStream] = field(init=False, repr=False, default_factory=dict)
     
     
     def __post_init__(self):
         """
         Initialize the simulator with the given settings.
         """
+        if self.settings.ticks_per_second is not None:
+            self._clock = TickClock(self.settings.ticks_per_second)
+        else:
+            self._clock = TimedeltaClock()
+        self._now = self._clock.to_internal(self.current_time)
+        if self.scheduler is None:
+            self.scheduler = scheduler_for(self.system.synchrony)
+        if self.rng is None:
+            self.rng = RandomStream(use_numpy=self.settings.numpy_sampling)
+        if self.settings.precompute_neighbors:
+            self.system.precompute_neighbors()
+        if self.interner is None and self.settings.intern_values:
+            self.interner = Interner()
+        if self.interner is not None:
+            for state in self.current_configuration:
+                self.interner.intern_fields(state)
+        if self.profiler is None and self.settings.profile:
+            self.profiler = Profiler()
+        if self.metrics is None and self.settings.collect_metrics:
+            self.metrics = MetricsCollector()
         if self.settings.enable_trace:
             self.trace = Trace(system=self.system, algorithm_name=self.algorithm.name)
+            if self.settings.delta_trace:
+                self.trace.history = DeltaHistory(self.settings.keyframe_interval)
+        if self.sink is not None:
+            self.sink.begin(self.system, self.algorithm.name)
     
     @classmethod
     def from_system(cls,
                     system: System,
                     algorithm: Algorithm,
                     starting_time: timedelta = timedelta(seconds=0),
-                    settings: Settings = Settings()
+                    settings: Settings = Settings(),
+                    sink: Optional[TraceSink] = None,
+                    scheduler: Optional[Scheduler] = None,
+                    seed: Optional[int] = None,
     ) -> Self:
         """
         Create a simulator instance from the given system and algorithm.
+        If a sink is given, the trace is streamed to it while the simulation runs.
+        If a scheduler is given, it is used instead of the one chosen for the synchrony model.
+        If a seed is given, it determines all random delays of the simulation.
         """
-        current_configuration = Configuration.from_states( algorithm.initial_state(p) for p in system.processes())
+        if settings.precompute_neighbors:
+            # before the initial states, so that they hold the shared sets
+            system.precompute_neighbors()
+        current_configuration = Configuration.from_states(
+            (algorithm.initial_state(p) for p in system.processes()),
+            index=system.pid_index,
+        )
         return cls(
             system=system,
             algorithm=algorithm,
             current_configuration=current_configuration,
             current_time=starting_time,
-            settings=settings
+            settings=settings,
+            sink=sink,
+            scheduler=scheduler,
+            rng=RandomStream(seed, settings.numpy_sampling) if seed is not None else None,
         )       
     
     def start(self) -> None:
@@ -53,30 +125,87 @@ class Simulator:
         Start the simulation.
         """
         self.current_time = timedelta(seconds=0)
+        self._now = self._clock.to_internal(self.current_time)
+        profiler = self.profiler
+        if profiler is not None:
+            begin = profiler.now()
         for pid in self.system.processes():
+            if profiler is not None:
+                mark = profiler.now()
             initial_state, events = self.algorithm.on_start(self.current_configuration[pid])
+            if profiler is not None:
+                mark = profiler.started(pid, mark)
+            if self.interner is not None:
+                initial_state = self.interner.intern_fields(initial_state)
+                if profiler is not None:
+                    mark = profiler.lap('intern', mark)
             self.current_configuration = self.current_configuration.updated([initial_state])
-            for event in events:
-                at_time = self._arrival_time_for(event)
-                self.schedule_event(at_time, event)
+            if profiler is not None:
+                profiler.lap('configuration', mark)
+            self._schedule_all(events, pid)
+        if profiler is not None:
+            profiler.stepped(begin, steps=0)
     
-    def _arrival_time_for(self, event: Event) -> timedelta:
+    def _stream_of(self, pid: Pid) -> RandomStream:
         """
-        Calculate the delay for a given event.
+        Get the stream from which the delays of messages sent by a process are drawn.
         """
-        if isinstance(event, Message):
-            return self.system.synchrony.arrival_time_for(self.current_time)
-        else:
-            return self.current_time
+        if not self.settings.rng_per_process:
+            return self.rng
+        stream = self._streams.get(pid)
+        if stream is None:
+            stream = self._streams[pid] = self.rng.split(pid)
+        return stream
+    
+    def _schedule_all(self, events: list[Event], sender: Pid) -> None:
+        """
+        Schedule events issued by a process at the current time.
+        Signals occur immediately, while the arrival times of all messages are sampled in a single call.
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            mark = profiler.now()
+        if self.interner is not None:
+            for event in events:
+                self.interner.intern_fields(event)
+            if profiler is not None:
+                mark = profiler.lap('intern', mark)
+        if self.metrics is not None:
+            self.metrics.issued(events, sender)
+        messages = sum(1 for event in events if isinstance(event, Message))
+        rng = self._stream_of(sender) if messages else None
+        arrival_times = iter(self._clock.arrival_times(self.system.synchrony, self._now, messages, rng))
+        if profiler is not None:
+            profiler.lap('delays', mark)
+        for event in events:
+            at_time = next(arrival_times) if isinstance(event, Message) else self._now
+            self._schedule_at(at_time, event)
         
     def schedule_event(self, at: timedelta, event: Event) -> None:
         """
         Schedule an event to be processed at a specific time.
         """
-        time = max(self.current_time, at)
-        heapq.heappush(self.scheduled_events, TimedEvent(time=time, event=event))
+        if self.metrics is not None:
+            self.metrics.issued([event])
+        self._schedule_at(self._clock.to_internal(at), event)
+        
+    def _schedule_at(self, at: Instant, event: Event) -> None:
+        """
+        Schedule an event at a time given in the internal representation of the clock.
+        """
+        time = max(self._now, at)
+        profiler = self.profiler
+        if profiler is not None:
+            mark = profiler.now()
+        self.scheduler.push(time, event)
+        if profiler is not None:
+            mark = profiler.lap('push', mark)
         if self.trace is not None:
-            self.trace.add_events([(self.current_time, time, event)])
+            self.trace.add_events([(self.current_time, self._clock.to_timedelta(time), event)])
+        if self.sink is not None:
+            self.sink.add_events([(self.current_time, self._clock.to_timedelta(time), event)])
+        if profiler is not None and (self.trace is not None or self.sink is not None):
+            profiler.lap('trace', mark)
 
     def _apply_event(self, event: Event) -> None:
         """
@@ -86,22 +215,49 @@ class Simulator:
         if pid not in self.current_configuration:
             raise ValueError(f"{pid} not found in the current configuration.")
         old_state = self.current_configuration[pid]
+        profiler = self.profiler
+        if profiler is not None:
+            mark = profiler.now()
         new_state, new_events = self.algorithm.on_event(old_state, event)
+        if profiler is not None:
+            mark = profiler.handled(event, mark)
+        if self.interner is not None:
+            new_state = self.interner.intern_fields(new_state)
+            if profiler is not None:
+                mark = profiler.lap('intern', mark)
         self.current_configuration = self.current_configuration.updated([new_state])
-        for new_event in new_events:
-            at_time = self._arrival_time_for(new_event)
-            self.schedule_event(at_time, new_event)
+        if profiler is not None:
+            profiler.lap('configuration', mark)
+        self._schedule_all(new_events, pid)
         
     def advance_step(self) -> None:
         """
         Advance the simulation by one step.
         """
-        if len(self.scheduled_events) > 0:
-            next_event = heapq.heappop(self.scheduled_events)
-            self.current_time = max(self.current_time, next_event.time)
-            self._apply_event(next_event.event)
+        if self.scheduler:
+            profiler = self.profiler
+            if profiler is not None:
+                begin = profiler.now()
+            time, event = self.scheduler.pop()
+            if profiler is not None:
+                profiler.lap('pop', begin)
+            if time > self._now:
+                self._now = time
+                self.current_time = self._clock.to_timedelta(time)
+            if self.metrics is not None:
+                self.metrics.step(len(self.scheduler) + 1, self.current_time)
+                self.metrics.processed(event)
+            self._apply_event(event)
+            if profiler is not None:
+                mark = profiler.now()
             if self.trace is not None:
                 self.trace.add_history([(self.current_time, self.current_configuration)])
+            if self.sink is not None:
+                self.sink.add_history([(self.current_time, self.current_configuration)])
+            if profiler is not None:
+                if self.trace is not None or self.sink is not None:
+                    profiler.lap('trace', mark)
+                profiler.stepped(begin)
 
     def run_to_completion(self, step_limit: Optional[int] = None) -> None:
         """
@@ -111,19 +267,28 @@ class Simulator:
         while not self.is_finished() and (step_limit is None or step_count < step_limit):
             self.advance_step()
             step_count += 1
+        if self.sink is not None:
+            self.sink.flush()
 
     def is_finished(self) -> bool:
         """
         Check if the simulation has finished.
         """
-        return len(self.scheduled_events) == 0
+        return not self.scheduler
+    
+    @property
+    def scheduled_events(self) -> list[TimedEvent]:
+        """
+        The events that are scheduled but not yet processed, in the order they will be processed.
+        """
+        return [TimedEvent(time=self._clock.to_timedelta(time), event=event) for time, event in self.scheduler]
 
     def __str__(self) -> str:
         """
         String representation of the simulator.
         """
         scheduled = '\n'.join( f"  {timed_event.time}: {timed_event.event}" for timed_event in self.scheduled_events )
-        return f"""Simulator ({self.algorithm.name()}) @{self.current_time}:
+        return f"""Simulator ({self.algorithm.name}) @{self.current_time}:
 {self.current_configuration}
 Scheduled Events:
 {scheduled}"""
@@ -0,0 +1,302 @@
+"""
+Streaming trace recording.
+
+A `TraceSink` receives the events and configurations of a simulation while it runs, instead of keeping
+them in memory like `.trace.Trace`. The `FileTraceSink` appends them to a file in length-prefixed chunks
+that can optionally be compressed, and the `TraceReader` iterates over or seeks through such a file without
+loading all of it.
+
+File format:
+- the magic bytes `DAPYTRC1`,
+- followed by a sequence of chunks, each consisting of a header (see `_CHUNK_HEADER`) and a payload.
+  The header holds the length of the payload, flags, the index of the first step recorded in the chunk,
+  and the number of steps and events it contains. The payload is a pickled list of records:
+    - `("h", system, algorithm_name)`: information about the simulation (first chunk only),
+    - `("e", start, end, event)`: a scheduled event,
+    - `("k", time, states)`: a step with the states of all processes (keyframe),
+    - `("d", time, states)`: a step with only the states that changed since the previous step.
+
+A keyframe is always the first step of its chunk, so that any step can be rebuilt by reading forward from
+the chunk of the nearest preceding keyframe.
+"""
+
+import pickle
+import struct
+import zlib
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import timedelta
+from os import PathLike
+from typing import BinaryIO, Iterable, Iterator, Optional, Self
+
+from ..core import Event, System
+from .configuration import Configuration
+from .timed import TimedConfiguration
+from .trace import LocalTimedEvent, Trace
+
+_MAGIC = b"DAPYTRC1"
+_CHUNK_HEADER = struct.Struct("<IBQII")  # payload length, flags, first step, number of steps, number of events
+
+_FLAG_COMPRESSED = 0x01
+_FLAG_HEADER = 0x02
+_FLAG_KEYFRAME = 0x04
+
+
+class TraceSink(ABC):
+    """
+    Abstract class to represent a destination for the trace of a simulation, filled while the simulation runs.
+    """
+    def begin(self, system: System, algorithm_name: str) -> None:
+        """
+        Called once by the simulator before anything else is recorded.
+        """
+
+    @abstractmethod
+    def add_events(self, events: Iterable[tuple[timedelta, timedelta, Event]]) -> None:
+        """
+        Record scheduled events, given as tuples `(time of creation, scheduled time, event)`.
+        """
+
+    @abstractmethod
+    def add_history(self, history: Iterable[tuple[timedelta, Configuration]]) -> None:
+        """
+        Record configurations reached by the simulation.
+        """
+
+    def flush(self) -> None:
+        """
+        Write out any buffered data.
+        """
+
+    def close(self) -> None:
+        """
+        Flush and release any resource held by the sink.
+        """
+        self.flush()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class FileTraceSink(TraceSink):
+    """
+    Trace sink that streams the trace to an append-only file.
+
+    Records are buffered in memory until `chunk_size` of them are pending, at which point they are written
+    as one chunk. Configurations are stored as deltas, with a full configuration every `keyframe_interval` steps.
+    Memory usage is therefore bounded by the size of a chunk, regardless of the length of the simulation.
+    """
+    def __init__(self,
+                 file: str | PathLike | BinaryIO,
+                 compress: bool = False,
+                 chunk_size: int = 4096,
+                 keyframe_interval: int = 1000,
+    ):
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be a positive integer.")
+        if keyframe_interval < 1:
+            raise ValueError("Keyframe interval must be a positive integer.")
+        if isinstance(file, (str, PathLike)):
+            self._file = open(file, "wb")
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        self.compress = compress
+        self.chunk_size = chunk_size
+        self.keyframe_interval = keyframe_interval
+        self._file.write(_MAGIC)
+        self._records: list[tuple] = []
+        self._flags = 0
+        self._step = 0
+        self._first_step = 0
+        self._steps = 0
+        self._events = 0
+        self._last: Optional[Configuration] = None
+
+    def begin(self, system: System, algorithm_name: str) -> None:
+        self._records.append(("h", system, algorithm_name))
+        self._flags |= _FLAG_HEADER
+        self.flush()
+
+    def add_events(self, events: Iterable[tuple[timedelta, timedelta, Event]]) -> None:
+        for start, end, event in events:
+            self._records.append(("e", start, end, event))
+            self._events += 1
+            if len(self._records) >= self.chunk_size:
+                self.flush()
+
+    def add_history(self, history: Iterable[tuple[timedelta, Configuration]]) -> None:
+        for time, configuration in history:
+            if self._step % self.keyframe_interval == 0 or self._last is None:
+                # keyframes always start a new chunk
+                self.flush()
+                self._records.append(("k", time, tuple(configuration)))
+                self._flags |= _FLAG_KEYFRAME
+            else:
+                changes = tuple(configuration[pid] for pid in configuration.changed_from(self._last))
+                self._records.append(("d", time, changes))
+            self._last = configuration
+            self._step += 1
+            self._steps += 1
+            if len(self._records) >= self.chunk_size:
+                self.flush()
+
+    def flush(self) -> None:
+        if self._records:
+            payload = pickle.dumps(self._records, protocol=pickle.HIGHEST_PROTOCOL)
+            flags = self._flags
+            if self.compress:
+                payload = zlib.compress(payload)
+                flags |= _FLAG_COMPRESSED
+            self._file.write(_CHUNK_HEADER.pack(len(payload), flags, self._first_step, self._steps, self._events))
+            self._file.write(payload)
+            self._records = []
+            self._flags = 0
+            self._first_step = self._step
+            self._steps = 0
+            self._events = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+
+
+@dataclass(frozen=True)
+class _ChunkInfo:
+    offset: int
+    length: int
+    flags: int
+    first_step: int
+    steps: int
+    events: int
+
+
+class TraceReader:
+    """
+    Class to read a trace written by a `FileTraceSink`.
+
+    Opening a file only reads the chunk headers. Events and configurations are then read one chunk at a time,
+    and the configuration at any step is rebuilt from the nearest preceding keyframe.
+    A file that was truncated (e.g., because the simulation crashed) is read up to its last complete chunk.
+    """
+    def __init__(self, file: str | PathLike | BinaryIO):
+        if isinstance(file, (str, PathLike)):
+            self._file = open(file, "rb")
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        if self._file.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError("Not a dapy trace file.")
+        self._chunks: list[_ChunkInfo] = []
+        while True:
+            header = self._file.read(_CHUNK_HEADER.size)
+            if len(header) < _CHUNK_HEADER.size:
+                break
+            length, flags, first_step, steps, events = _CHUNK_HEADER.unpack(header)
+            offset = self._file.tell()
+            self._file.seek(length, 1)
+            self._chunks.append(_ChunkInfo(offset, length, flags, first_step, steps, events))
+        # the last chunk may have been partially written
+        end = self._file.seek(0, 2)
+        while self._chunks and self._chunks[-1].offset + self._chunks[-1].length > end:
+            self._chunks.pop()
+        self.system: Optional[System] = None
+        self.algorithm_name: Optional[str] = None
+        for chunk in self._chunks:
+            if chunk.flags & _FLAG_HEADER:
+                _, self.system, self.algorithm_name = self._read_chunk(chunk)[0]
+                break
+
+    def _read_chunk(self, chunk: _ChunkInfo) -> list[tuple]:
+        """
+        Read and decode the records of a chunk.
+        """
+        self._file.seek(chunk.offset)
+        payload = self._file.read(chunk.length)
+        if chunk.flags & _FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+        return pickle.loads(payload)
+
+    def __len__(self) -> int:
+        """
+        Number of steps (configurations) recorded in the trace.
+        """
+        return sum(chunk.steps for chunk in self._chunks)
+
+    def event_count(self) -> int:
+        """
+        Number of events recorded in the trace.
+        """
+        return sum(chunk.events for chunk in self._chunks)
+
+    def events(self) -> Iterator[LocalTimedEvent]:
+        """
+        Iterate over the recorded events, in the order they were scheduled.
+        """
+        for chunk in self._chunks:
+            if chunk.events:
+                for record in self._read_chunk(chunk):
+                    if record[0] == "e":
+                        yield LocalTimedEvent(*record[1:])
+
+    def history(self, start: int = 0) -> Iterator[TimedConfiguration]:
+        """
+        Iterate over the recorded configurations, from step `start` onwards.
+        """
+        first = 0
+        for k, chunk in enumerate(self._chunks):
+            if chunk.flags & _FLAG_KEYFRAME and chunk.first_step <= start:
+                first = k
+        step = self._chunks[first].first_step if self._chunks else 0
+        configuration = None
+        for chunk in self._chunks[first:]:
+            if not chunk.steps:
+                continue
+            for record in self._read_chunk(chunk):
+                match record:
+                    case ("k", time, states):
+                        configuration = Configuration.from_states(states)
+                    case ("d", time, states):
+                        configuration = configuration.updated(states)
+                    case _:
+                        continue
+                if step >= start:
+                    yield TimedConfiguration(time, configuration)
+                step += 1
+
+    def __getitem__(self, i: int) -> TimedConfiguration:
+        """
+        Return the configuration at step `i`, reading only from the nearest preceding keyframe.
+        """
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("trace index out of range")
+        return next(self.history(start=i))
+
+    def to_trace(self) -> Trace:
+        """
+        Load the entire file into a `Trace`.
+        """
+        trace = Trace(system=self.system, algorithm_name=self.algorithm_name)
+        trace.events_list.extend(self.events())
+        trace.history.extend(self.history())
+        return trace
+
+    def close(self) -> None:
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
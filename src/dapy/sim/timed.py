@@ -6,7 +6,7 @@ from ..core import Event
 from .configuration import Configuration
 
 
-@dataclass(frozen=True, order=True)
+@dataclass(frozen=True, order=True, slots=True)
 class Timed(ABC):
     """
     Abstract base class to represent a timed object.
@@ -14,7 +14,7 @@ class Timed(ABC):
     time: timedelta
 
 
-@dataclass(frozen=True, order=True)
+@dataclass(frozen=True, order=True, slots=True)
 class TimedEvent(Timed):
     """
     Class to represent a timed event.
@@ -22,7 +22,7 @@ class TimedEvent(Timed):
     event: Event
 
 
-@dataclass(frozen=True, order=True)
+@dataclass(frozen=True, order=True, slots=True)
 class TimedConfiguration(Timed):
     """
     Class to represent a timed configuration.
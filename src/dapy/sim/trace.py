@@ -1,11 +1,15 @@
-from dataclasses import dataclass, field
+from collections.abc import Sequence
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import timedelta
-from typing import Iterable, Self
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Self
 
-from ..core import Event, Message, Pid, Signal, System
+from ..core import ChannelSet, Event, Message, Pid, PidIndex, ProcessSet, Signal, State, System
 from .configuration import Configuration
 from .timed import TimedConfiguration
 
+if TYPE_CHECKING:
+    from classifiedjson import Factory
+
 
 @dataclass(frozen=True, order=True)
 class LocalTimedEvent:
@@ -41,6 +45,107 @@ class LocalTimedEvent:
         return self.event.target
 
 
+class DeltaHistory(Sequence[TimedConfiguration]):
+    """
+    Class to represent a history of configurations stored as deltas.
+    
+    Only the states that changed at each step are stored, together with a full configuration (keyframe)
+    every `keyframe_interval` steps. The configuration at some step is rebuilt on demand from the nearest
+    preceding keyframe, so that `history[i]` costs at most `keyframe_interval` updates.
+    Configurations rebuilt from one another answer `Configuration.changed_from` directly from the deltas.
+    """
+    def __init__(self, keyframe_interval: int = 100, history: Iterable[TimedConfiguration] = ()):
+        if keyframe_interval < 1:
+            raise ValueError("Keyframe interval must be a positive integer.")
+        self.keyframe_interval = keyframe_interval
+        self._times: list[timedelta] = []
+        self._deltas: list[tuple[State, ...]] = []
+        self._keyframes: list[Configuration] = []
+        self._last: Optional[Configuration] = None
+        self._cache: dict[int, Configuration] = {}
+        self.extend(history)
+        
+    def append(self, timed_configuration: TimedConfiguration) -> None:
+        """
+        Add a configuration at the end of the history.
+        """
+        configuration = timed_configuration.configuration
+        if self._last is None:
+            delta = ()
+        else:
+            delta = tuple(configuration[pid] for pid in configuration.changed_from(self._last))
+        if len(self._times) % self.keyframe_interval == 0:
+            self._keyframes.append(configuration)
+        self._times.append(timed_configuration.time)
+        self._deltas.append(delta)
+        self._last = configuration
+
+    def extend(self, history: Iterable[TimedConfiguration]) -> None:
+        """
+        Add configurations at the end of the history.
+        """
+        for timed_configuration in history:
+            self.append(timed_configuration)
+            
+    def delta(self, i: int) -> tuple[State, ...]:
+        """
+        Return the states that changed at step `i` with respect to step `i-1`.
+        """
+        return self._deltas[i]
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def __getitem__(self, i: int | slice) -> TimedConfiguration | list[TimedConfiguration]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("history index out of range")
+        return TimedConfiguration(self._times[i], self._configuration_at(i))
+    
+    def __iter__(self) -> Iterator[TimedConfiguration]:
+        configuration = None
+        for i, (time, delta) in enumerate(zip(self._times, self._deltas)):
+            if i % self.keyframe_interval == 0:
+                configuration = self._keyframes[i // self.keyframe_interval]
+            else:
+                configuration = configuration.updated(delta)
+            yield TimedConfiguration(time, configuration)
+
+    def _configuration_at(self, i: int) -> Configuration:
+        """
+        Rebuild the configuration at step `i`, from the nearest keyframe or recently rebuilt step.
+        """
+        if i in self._cache:
+            return self._cache[i]
+        start = i - i % self.keyframe_interval
+        cached = [j for j in self._cache if start <= j < i]
+        if cached:
+            start = max(cached)
+            configuration = self._cache[start]
+        else:
+            configuration = self._keyframes[start // self.keyframe_interval]
+        previous = configuration
+        for j in range(start + 1, i + 1):
+            previous, configuration = configuration, configuration.updated(self._deltas[j])
+        # keep the last two steps, since consecutive steps are typically compared with one another
+        self._cache = {i - 1: previous, i: configuration} if i > start else {i: configuration}
+        return configuration
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (DeltaHistory, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+    
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(keyframe_interval={self.keyframe_interval}, len={len(self)})"
+    
+    def __getstate__(self) -> dict[str, Any]:
+        return {**self.__dict__, '_cache': {}}
+
+
 @dataclass
 class Trace:
     """
@@ -49,7 +154,7 @@ class Trace:
     system: System
     algorithm_name: str
     
-    history: list[TimedConfiguration] = field(default_factory=list)
+    history: list[TimedConfiguration] | DeltaHistory = field(default_factory=list)
     events_list: list[LocalTimedEvent] = field(default_factory=list)
 
     def add_events(self, events: Iterable[tuple[timedelta, timedelta, Event]]) -> None:
@@ -100,7 +205,7 @@ class Trace:
                 return NotImplemented
             return repr(obj)
         
-        return dumps(self, custom_hooks=[_timedelta_serialize])
+        return dumps(self, custom_hooks=[_timedelta_serialize, _json_serialize])
 
     @classmethod
     def load_json(cls, data: str) -> Self:
@@ -120,8 +225,38 @@ class Trace:
                 return NotImplemented
             return _parse_timedelta(obj)
         
-        return loads(data, custom_hooks=[_timedelta_deserialize])
+        return loads(data, custom_hooks=[_timedelta_deserialize, _json_deserialize])
+
+
+def _json_serialize(obj: object) -> object:
+    """
+    Serialize the values that the JSON dataclass hook cannot handle. Configurations, sets and indexes are
+    serialized as their members, and dataclasses as their init fields: slotted dataclasses (e.g., PIDs,
+    states and events) have no `__dict__`, and the `__dict__` of others holds caches (e.g., of topologies).
+    """
+    if isinstance(obj, (Configuration, ProcessSet, ChannelSet)):
+        return list(obj)
+    if isinstance(obj, PidIndex):
+        return list(obj.pids)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj) if f.init}
+    return NotImplemented
+
 
+def _json_deserialize(factory: 'Factory', obj: object) -> object:
+    """
+    Deserialize the values serialized by `_json_serialize`.
+    """
+    if factory.is_match(Configuration):
+        return Configuration.from_states(obj)
+    if factory.is_match(ProcessSet):
+        # views of sets (see `ProcessSet.all_except`) are deserialized as plain sets
+        return ProcessSet(obj)
+    if factory.is_match([ChannelSet, PidIndex]):
+        return factory(obj)
+    if isinstance(obj, dict) and is_dataclass(factory._get_cls()):
+        return factory(**obj)
+    return NotImplemented
 
 
 def _parse_timedelta(timedelta_str: str) -> timedelta:
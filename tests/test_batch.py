@@ -0,0 +1,41 @@
+from datetime import timedelta
+from operator import attrgetter
+
+from dapy.core import Asynchronous, Pid, Ring, System
+from dapy.algo.learn import LearnGraphAlgorithm, Start
+from dapy.sim import run_batch
+
+
+def batch(**kwargs: object):
+    system = System(topology=Ring.of_size(4), synchrony=Asynchronous())
+    return run_batch(
+        system,
+        LearnGraphAlgorithm(system),
+        runs=7,
+        metrics={"time": attrgetter("current_time"), "configuration": attrgetter("current_configuration")},
+        initial_events=[(timedelta(seconds=0), Start(target=Pid(1)))],
+        **kwargs,
+    )
+
+
+def test_batch_is_deterministic():
+    """
+    Test that the results of a batch only depend on the base seed.
+    """
+    serial = batch(max_workers=1, chunk_size=3)
+    parallel = batch(max_workers=2, chunk_size=2)
+    assert [result.index for result in parallel] == list(range(7))
+    assert parallel == serial
+    assert len({result.seed for result in serial}) == 7
+    assert len({result.final_time for result in serial}) > 1
+    for result in serial:
+        assert result.metrics["time"] == result.final_time
+        assert all(state.part_i for state in result.metrics["configuration"])
+
+    other = batch(max_workers=1, base_seed=1)
+    assert [result.seed for result in other] != [result.seed for result in serial]
+
+
+def test_step_limit():
+    for result in batch(max_workers=1, step_limit=5):
+        assert result.steps == 5
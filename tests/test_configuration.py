@@ -0,0 +1,99 @@
+import pickle
+
+from dataclasses import dataclass
+
+from dapy.core import Pid, State
+from dapy.sim import Configuration
+
+
+@dataclass(frozen=True)
+class CounterState(State):
+    count: int = 0
+
+
+def _configuration(size: int) -> Configuration:
+    return Configuration.from_states(CounterState(Pid(i+1)) for i in range(size))
+
+
+def test_access():
+    """
+    Test that states can be retrieved from configurations of various sizes.
+    """
+    for size in [0, 1, 31, 32, 33, 1500]:
+        config = _configuration(size)
+        assert len(config) == size
+        assert config.processes() == [Pid(i+1) for i in range(size)]
+        assert [state.pid for state in config] == [Pid(i+1) for i in range(size)]
+        for i in range(size):
+            assert Pid(i+1) in config
+            assert config[Pid(i+1)] == CounterState(Pid(i+1))
+        assert Pid(size+1) not in config
+        assert config[Pid(size+1)] is None
+        assert config.states == {Pid(i+1): CounterState(Pid(i+1)) for i in range(size)}
+
+
+def test_updated():
+    """
+    Test that updating a configuration leaves the original untouched and shares unchanged states.
+    """
+    config = _configuration(1500)
+    new_config = config.updated([CounterState(Pid(7), 1), CounterState(Pid(1200), 2), CounterState(Pid(9999), 3)])
+    assert config[Pid(7)].count == 0
+    assert new_config[Pid(7)].count == 1
+    assert new_config[Pid(1200)].count == 2
+    assert Pid(9999) not in new_config
+    assert len(new_config) == 1500
+    assert new_config[Pid(8)] is config[Pid(8)]
+    assert new_config != config
+    assert new_config == config.updated([CounterState(Pid(1200), 2)]).updated([CounterState(Pid(7), 1)])
+    assert config.updated([]) is config
+
+
+def test_changed_from():
+    """
+    Test that changed processes are reported in increasing order of PIDs.
+    """
+    config = _configuration(1500)
+    new_config = config.updated([CounterState(Pid(1200), 2), CounterState(Pid(7), 1), CounterState(Pid(8), 0)])
+    assert list(new_config.changed_from(config)) == [Pid(7), Pid(1200)]
+    assert list(config.changed_from(new_config)) == [Pid(7), Pid(1200)]
+    assert list(new_config.changed_from(new_config)) == []
+    assert list(_configuration(10).changed_from(_configuration(20))) == []
+
+
+def test_pickle():
+    """
+    Test that configurations survive a round trip through pickle.
+    """
+    config = _configuration(100).updated([CounterState(Pid(50), 5)])
+    config2 = pickle.loads(pickle.dumps(config))
+    assert config2 == config
+    assert config2[Pid(50)].count == 5
+    assert hash(config2) == hash(config)
+
+
+def test_hash():
+    """
+    Test that equal configurations have equal hashes, whether they were derived or built from scratch.
+    """
+    config = _configuration(100)
+    derived = config.updated([CounterState(Pid(50), 5)])
+    rebuilt = Configuration.from_states(derived)
+    back = derived.updated([CounterState(Pid(50), 0)])
+    assert rebuilt == derived and hash(rebuilt) == hash(derived)
+    assert back == config and hash(back) == hash(config)
+    assert len({config, derived, rebuilt, back, _configuration(100)}) == 2
+
+
+def test_state_hash_and_equality():
+    """
+    Test that the cached hash of states agrees with their equality, and is not pickled.
+    """
+    a, b, c = CounterState(Pid(1), 1), CounterState(Pid(1), 1), CounterState(Pid(1), 2)
+    assert a == a and a == b and a != c
+    assert hash(a) == hash(b) != hash(c)
+    assert a == b and a != c
+    assert str(a) == "p1: count=1"
+    copy = pickle.loads(pickle.dumps(a))
+    assert copy == a and copy._hash is None
+    assert a.cloned_with(count=2) == c
@@ -0,0 +1,41 @@
+from dataclasses import dataclass, field
+
+from dapy.core import ChannelSet, Pid, ProcessSet, State
+from dapy.sim import Interner
+
+
+@dataclass(frozen=True, slots=True)
+class SetState(State):
+    known: ProcessSet = field(default_factory=ProcessSet)
+    count: int = 0
+
+
+def test_intern():
+    interner = Interner()
+    a = ProcessSet([Pid(1), Pid(2)])
+    b = ProcessSet([Pid(2), Pid(1)])
+    assert interner.intern(a) is a
+    assert interner.intern(b) is a
+    assert interner.intern(ChannelSet()) == ChannelSet()
+    # views and other types are not interned
+    everyone = a.all_except(Pid(1))
+    assert interner.intern(everyone) is everyone
+    assert interner.intern(3) == 3
+    stats = interner.stats()
+    assert (stats.values, stats.lookups, stats.hits) == (2, 3, 1)
+    assert stats.hit_rate == 1 / 3
+    assert stats.bytes_saved > 0
+
+    interner.clear()
+    assert len(interner) == 0
+    assert interner.stats().lookups == 0
+
+
+def test_intern_fields():
+    interner = Interner()
+    first = interner.intern_fields(SetState(Pid(1), ProcessSet([Pid(1), Pid(2)]), 1))
+    second = SetState(Pid(2), ProcessSet([Pid(1), Pid(2)]), 2)
+    assert interner.intern_fields(second) is second
+    assert second.known is first.known
+    assert second == SetState(Pid(2), ProcessSet([Pid(1), Pid(2)]), 2)
+    assert interner.intern_fields(Pid(3)) == Pid(3)
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from datetime import timedelta
+
+from dapy.core import (
+    Algorithm, Asynchronous, Channel, ChannelSet, CompleteGraph, Event, Pid, ProcessSet, Ring, Star, Synchronous,
+    System,
+)
+from dapy.core.topology import Arbitrary
+from dapy.algo.learn import GraphIsKnown, LearnGraphAlgorithm, LearnState, PositionMsg, Start
+from dapy.sim import Settings, Simulator
+
+
+@dataclass(frozen=True)
+class ScanningLearnAlgorithm(Algorithm):
+    """
+    Reference implementation, which checks every known channel on each new position.
+    """
+    def initial_state(self, pid: Pid) -> LearnState:
+        return LearnState(pid=pid, neighbors_i=self.system.topology.neighbors_of(pid))
+
+    def on_event(self, old_state: LearnState, event: Event) -> tuple[LearnState, list[Event]]:
+        match event:
+            case Start(_):
+                return self._do_start(old_state) if not old_state.part_i else (old_state, [])
+            case PositionMsg(_, id_x, id, neighbors):
+                new_state, new_events = old_state, []
+                if not new_state.part_i:
+                    new_state, new_events = self._do_start(new_state)
+                if id not in new_state.proc_known_i:
+                    new_state = new_state.cloned_with(
+                        proc_known_i=new_state.proc_known_i + id,
+                        channels_known_i=new_state.channels_known_i + ChannelSet(Channel(id, n) for n in neighbors),
+                    )
+                    new_events = new_events + [
+                        PositionMsg(target=n, sender=old_state.pid, origin=id, neighbors=neighbors)
+                        for n in old_state.neighbors_i
+                        if n != id_x
+                    ]
+                    if all(
+                        c.r in new_state.proc_known_i and c.s in new_state.proc_known_i
+                        for c in new_state.channels_known_i
+                    ):
+                        new_events.append(GraphIsKnown(target=new_state.pid))
+                return new_state, new_events
+            case GraphIsKnown(_):
+                return old_state, []
+
+    def _do_start(self, state: LearnState) -> tuple[LearnState, list[Event]]:
+        events = [
+            PositionMsg(target=n, sender=state.pid, origin=state.pid, neighbors=state.neighbors_i)
+            for n in state.neighbors_i
+        ]
+        state = state.cloned_with(
+            proc_known_i=ProcessSet(state.pid),
+            channels_known_i=ChannelSet(Channel(state.pid, n) for n in state.neighbors_i),
+            part_i=True,
+        )
+        return state, events
+
+
+def _run(system: System, algorithm: Algorithm) -> Simulator:
+    sim = Simulator.from_system(system, algorithm, settings=Settings(enable_trace=True), seed=5)
+    sim.start()
+    sim.schedule_event(timedelta(seconds=0), Start(target=Pid(1)))
+    sim.run_to_completion()
+    return sim
+
+
+def test_incremental_graph_is_known():
+    """
+    Test that tracking unknown endpoints produces the same executions as checking every known channel.
+    """
+    topologies = [
+        Ring.of_size(7),
+        Ring.of_size(6, directed=True),
+        Star.of_size(6),
+        CompleteGraph.of_size(5),
+        Arbitrary.from_([(1, 2), (2, 3), (3, 1), (3, 4), (4, 5), (5, 6), (6, 4)], directed=False),
+    ]
+    for topology in topologies:
+        for synchrony in [Synchronous(), Asynchronous()]:
+            system = System(topology=topology, synchrony=synchrony)
+            sim = _run(system, LearnGraphAlgorithm(system))
+            reference = _run(system, ScanningLearnAlgorithm(system))
+            assert sim.trace.events_list == reference.trace.events_list
+            assert len(sim.trace.history) == len(reference.trace.history)
+            for step, expected in zip(sim.trace.history, reference.trace.history):
+                assert step.time == expected.time
+                states = [state.cloned_with(unknown_i=ProcessSet()) for state in step.configuration]
+                assert states == list(expected.configuration)
+            assert sum(isinstance(e.event, GraphIsKnown) for e in sim.trace.events_list) == len(topology)
+            assert all(not state.unknown_i for state in sim.current_configuration)
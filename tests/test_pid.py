@@ -0,0 +1,180 @@
+import dataclasses
+import pickle
+import sys
+
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+
+from dapy.core import Channel, ChannelSet, CompleteGraph, Pid, PidIndex, ProcessSet, Ring, System
+from dapy.core.pid import _interned
+
+
+def test_interning():
+    """
+    Test that PIDs are singletons, also through pickling.
+    """
+    assert Pid(12) is Pid(12)
+    assert pickle.loads(pickle.dumps(Pid(12))) is Pid(12)
+    assert Pid(12) != Pid(13) and Pid(12) < Pid(13)
+    assert sorted([Pid(3), Pid(1), Pid(2)]) == [Pid(1), Pid(2), Pid(3)]
+    with ThreadPoolExecutor(8) as executor:
+        assert len({id(pid) for pid in executor.map(Pid, [424242] * 1000)}) == 1
+    
+    # unused PIDs are released, and get the same number when used again
+    bit = Pid(424243)._bit
+    assert 424243 not in _interned
+    assert Pid(424243)._bit == bit
+
+
+def test_pid_index():
+    """
+    Test that indexes number PIDs densely in increasing order.
+    """
+    index = PidIndex([Pid(30), Pid(10), Pid(20), Pid(10)])
+    assert len(index) == 3
+    assert list(index) == [Pid(10), Pid(20), Pid(30)]
+    assert [index[pid] for pid in index] == [0, 1, 2]
+    assert index.get(Pid(15)) is None and Pid(15) not in index and Pid(20) in index
+    assert index.get(Pid(987654)) is None and index.get("p1") is None
+    assert pickle.loads(pickle.dumps(index)) == index
+
+    
+    # positions only depend on the indexed PIDs, whatever the other PIDs in use
+    late = PidIndex(Pid(i) for i in range(5_000_000, 5_000_004))
+    assert [late[pid] for pid in late] == [0, 1, 2, 3] and late._positions == {}
+    assert late.get(Pid(4_999_999)) is None and late.get(Pid(5_000_004)) is None and late.get(None) is None
+    assert PidIndex([]).get(Pid(1)) is None
+    
+    system = System(topology=Ring.of_size(5))
+    assert system.pid_index is system.pid_index
+    assert list(system.pid_index) == [Pid(i) for i in range(1, 6)]
+
+
+def test_process_set():
+    """
+    Test the set operations of process sets.
+    """
+    a = ProcessSet(Pid(i) for i in range(1, 200, 2))
+    b = ProcessSet(Pid(i) for i in range(1, 200))
+    assert len(a) == 100
+    assert Pid(3) in a and Pid(4) not in a and Pid(123456) not in a
+    assert a == ProcessSet(reversed(list(a)))
+    assert hash(a) == hash(ProcessSet(reversed(list(a))))
+    assert a <= b and a.issubset(b) and not b <= a
+    assert a + b == b
+    assert b + a is b
+    assert a + Pid(3) is a
+    assert a + Pid(4) == a + {Pid(4)} == ProcessSet([*a, Pid(4)]) == a + ProcessSet(Pid(4))
+    assert len(b - a) == 99
+    assert (b - a) + a == b
+    assert a.processes == frozenset(Pid(i) for i in range(1, 200, 2))
+    assert sorted(a) == [Pid(i) for i in range(1, 200, 2)]
+    assert ProcessSet() == ProcessSet.empty() and len(ProcessSet()) == 0
+    assert str(ProcessSet({Pid(2), Pid(1)})) == "{p1,p2}"
+    assert pickle.loads(pickle.dumps(a)) == a
+
+
+def test_sparse_process_set():
+    """
+    Test that small sets of late PIDs do not take a bitmask as wide as the number of PIDs, and that sets
+    iterate in increasing order of PIDs whatever the order in which PIDs were first used.
+    """
+    late = [Pid(i) for i in range(1_000_000, 1_020_000)][-2:]
+    small = ProcessSet(late)
+    assert sys.getsizeof(small._small) + sys.getsizeof(small._dense) < 100
+    assert list(small) == late and list(small + Pid(7)) == [Pid(7), *late]
+    assert list(ProcessSet([Pid(-5), Pid(-7)])) == [Pid(-7), Pid(-5)]
+    
+    # the representation changes with the size of the set
+    pids = [Pid(i) for i in range(3000, 2900, -1)]
+    grown = ProcessSet()
+    for i, pid in enumerate(pids, start=1):
+        grown += pid
+        assert len(grown) == i and pid in grown
+    assert grown == ProcessSet(pids) and hash(grown) == hash(ProcessSet(pids))
+    assert list(grown) == sorted(pids)
+    shrunk = grown
+    for i, pid in enumerate(pids, start=1):
+        shrunk -= pid
+        assert len(shrunk) == len(pids) - i and pid not in shrunk
+        assert shrunk == ProcessSet(pids[i:]) and shrunk <= grown
+    assert list(ProcessSet(pids) - pids[:-20]) == sorted(pids[-20:])
+
+
+def test_channel_set():
+    """
+    Test the set operations of channel sets.
+    """
+    channels = ChannelSet(Channel(Pid(i), Pid(i + 1)) for i in range(1, 100))
+    assert len(channels) == 99
+    assert Channel(Pid(1), Pid(2)) in channels
+    assert Channel(Pid(2), Pid(1)) not in channels
+    assert Channel(Pid(3), Pid(2), directed=False) in ChannelSet(Channel(Pid(2), Pid(3), directed=False))
+    assert channels + Channel(Pid(1), Pid(2)) is channels
+    more = channels + Channel(Pid(2), Pid(1))
+    assert len(more) == 100 and channels <= more and not more <= channels
+    assert more - channels == ChannelSet(Channel(Pid(2), Pid(1)))
+    assert more.channels == channels.channels | {Channel(Pid(2), Pid(1))}
+    assert pickle.loads(pickle.dumps(more)) == more
+    assert more.endpoints() == ProcessSet(Pid(i) for i in range(1, 101))
+    assert (more - channels).endpoints() == ProcessSet({Pid(1), Pid(2)})
+    assert Pid(1) not in channels and (Pid(1), Pid(2)) not in channels
+
+
+def test_all_except():
+    """
+    Test that views of all processes except one behave as process sets.
+    """
+    all = ProcessSet(Pid(i) for i in range(1, 11))
+    view = all.all_except(Pid(4))
+    expected = ProcessSet(Pid(i) for i in range(1, 11) if i != 4)
+    assert len(view) == 9
+    assert view._built_set is None
+    assert Pid(4) not in view and Pid(5) in view and Pid(11) not in view
+    assert list(view) == list(expected)
+    assert view == expected and expected == view and hash(view) == hash(expected)
+    built = view._built_set
+    assert built == expected and view + Pid(4) == all and view._built() is built
+    assert view + Pid(4) == all
+    assert view - Pid(5) == expected - Pid(5)
+    assert view <= all and not all <= view
+    assert pickle.loads(pickle.dumps(view)) == expected
+    assert len(all.all_except(Pid(11))) == 10
+    
+    topology = CompleteGraph.of_size(1000)
+    neighbors = topology.neighbors_of(Pid(1))
+    assert neighbors._all is topology.processes()
+    assert len(neighbors) == topology.degree(Pid(1)) == 999
+
+
+def test_hash_and_equality():
+    """
+    Test that cached hashes agree with equality, and are not carried through pickling.
+    """
+    assert sorted([Pid(3), Pid(1), Pid(2)]) == [Pid(1), Pid(2), Pid(3)]
+    assert Pid(1) <= Pid(1) and Pid(2) >= Pid(1) and Pid(2) > Pid(1)
+    assert hash(Pid(5)) == hash(5)
+    assert Pid(1) != 1
+
+    undirected = Channel(Pid(2), Pid(1), directed=False)
+    assert undirected == Channel(Pid(1), Pid(2), directed=False)
+    assert hash(undirected) == hash(Channel(Pid(1), Pid(2), directed=False))
+    assert Channel(Pid(1), Pid(2)) != Channel(Pid(2), Pid(1))
+    assert pickle.loads(pickle.dumps(undirected)) == undirected
+    assert Channel(Pid(1), Pid(2)) < Channel(Pid(1), Pid(3))
+
+    processes = ProcessSet(Pid(i) for i in range(1, 100))
+    assert hash(processes) == hash(processes) == hash(ProcessSet(Pid(i) for i in range(99, 0, -1)))
+    assert processes - Pid(1) != processes
+    copy = pickle.loads(pickle.dumps(processes))
+    assert copy == processes and hash(copy) == hash(processes)
+    channels = ChannelSet(Channel(Pid(i), Pid(i + 1)) for i in range(1, 50))
+    assert hash(channels) == hash(ChannelSet(reversed(list(channels))))
+    assert hash(processes.all_except(Pid(1))) == hash(processes - Pid(1))
+    
+    # caches have a value before the hash is computed, for the functions that read all fields
+    for value in [Channel(Pid(1), Pid(2)), ProcessSet(reversed(list(processes))), processes - Pid(2),
+                  ProcessSet(Pid(1)) + Pid(2), ChannelSet(channels), channels + Channel(Pid(2), Pid(1))]:
+        assert dataclasses.astuple(value)[-1] is None
+        assert dataclasses.asdict(value)['_hash'] is None
+        assert deepcopy(value) == value and hash(deepcopy(value)) == hash(value)
@@ -0,0 +1,57 @@
+import pytest
+
+from datetime import timedelta
+
+from dapy.core import Asynchronous, CompleteGraph, NetworkTopology, Pid, Ring, Star, Synchronous, System
+from dapy.algo.learn import LearnGraphAlgorithm, Start
+from dapy.sim import RoundSimulator, Settings, Simulator
+
+
+def run(simulator: type[Simulator], topology: NetworkTopology) -> Simulator:
+    system = System(topology=topology, synchrony=Synchronous(fixed_delay=timedelta(seconds=1)))
+    sim = simulator.from_system(system, LearnGraphAlgorithm(system), settings=Settings(enable_trace=True))
+    sim.start()
+    sim.schedule_event(timedelta(seconds=0), Start(target=Pid(2)))
+    sim.schedule_event(timedelta(milliseconds=500), Start(target=Pid(1)))
+    sim.run_to_completion()
+    return sim
+
+
+def test_identical_executions():
+    """
+    Test that the round-based simulator produces the same execution as the event-driven one.
+    """
+    for topology in [Ring.of_size(7), Star.of_size(6), CompleteGraph.of_size(5)]:
+        sim = run(Simulator, topology)
+        round_sim = run(RoundSimulator, topology)
+        assert round_sim.current_time == sim.current_time
+        assert round_sim.current_configuration == sim.current_configuration
+        assert round_sim.trace.events_list == sim.trace.events_list
+        # one configuration per round, equal to the last configuration reached at that time
+        last_of_round = {timed.time: timed for timed in sim.trace.history}
+        assert round_sim.trace.history == list(last_of_round.values())
+
+
+def test_requires_synchronous_model():
+    system = System(topology=Ring.of_size(3), synchrony=Asynchronous())
+    with pytest.raises(ValueError):
+        RoundSimulator.from_system(system, LearnGraphAlgorithm(system))
+
+
+def test_metrics():
+    """
+    Test that the round-based simulator collects the same message counts as the event-driven one.
+    """
+    metrics = []
+    for simulator in [Simulator, RoundSimulator]:
+        system = System(topology=Ring.of_size(7), synchrony=Synchronous(fixed_delay=timedelta(seconds=1)))
+        sim = simulator.from_system(system, LearnGraphAlgorithm(system), settings=Settings(collect_metrics=True))
+        sim.start()
+        sim.schedule_event(timedelta(seconds=0), Start(target=Pid(2)))
+        sim.run_to_completion()
+        metrics.append(sim.metrics)
+    events, rounds = metrics
+    assert rounds.messages_by_channel == events.messages_by_channel
+    assert rounds.events_processed == events.events_processed
+    assert (rounds.rounds, rounds.max_in_flight, rounds.in_flight) == (events.rounds, events.max_in_flight, 0)
+    assert rounds.steps < events.steps
@@ -0,0 +1,225 @@
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional
+
+from dapy.core import (
+    Asynchronous, Channel, Message, PartiallySynchronous, Pid, System, Ring, StochasticExponential, Synchronous,
+    SynchronyModel,
+)
+from dapy.algo.learn import LearnGraphAlgorithm, Start
+from dapy.sim import CalendarScheduler, HeapScheduler, MetricsCollector, Scheduler, Settings, Simulator
+
+
+def run_learn(
+    synchrony: SynchronyModel,
+    settings: Settings,
+    size: int = 6,
+    scheduler: Optional[Scheduler] = None,
+    seed: Optional[int] = None,
+) -> Simulator:
+    system = System(topology=Ring.of_size(size), synchrony=synchrony)
+    sim = Simulator.from_system(system, LearnGraphAlgorithm(system), settings=settings, scheduler=scheduler, seed=seed)
+    sim.start()
+    sim.schedule_event(timedelta(seconds=0), Start(target=Pid(1)))
+    sim.run_to_completion()
+    return sim
+
+
+def test_tick_clock():
+    """
+    Test that the integer clock produces the same execution as the default clock.
+    """
+    synchrony = Synchronous(fixed_delay=timedelta(milliseconds=1500))
+    sim = run_learn(synchrony, Settings(enable_trace=True))
+    for ticks_per_second in [1_000, 1_000_000, 1_000_000_000]:
+        tick_sim = run_learn(synchrony, Settings(enable_trace=True, ticks_per_second=ticks_per_second))
+        assert tick_sim.current_time == sim.current_time
+        assert tick_sim.current_configuration == sim.current_configuration
+        assert tick_sim.trace == sim.trace
+
+
+def test_tick_clock_random_delays():
+    """
+    Test that random delays are converted to ticks.
+    """
+    synchrony = StochasticExponential(delta_t=timedelta(milliseconds=3))
+    sim = run_learn(synchrony, Settings(enable_trace=True, ticks_per_second=1_000))
+    assert sim.is_finished()
+    for timed_event in sim.trace.events_list:
+        assert timed_event.end >= timed_event.start
+        assert timed_event.end.microseconds % 1_000 == 0
+
+
+def test_fifo_ties():
+    """
+    Test that events scheduled at the same time are processed in the order they were scheduled.
+    """
+    system = System(topology=Ring.of_size(4), synchrony=Synchronous(fixed_delay=timedelta(seconds=10)))
+    sim = Simulator.from_system(system, LearnGraphAlgorithm(system))
+    for pid in [Pid(3), Pid(1), Pid(4), Pid(2)]:
+        sim.schedule_event(timedelta(seconds=1), Start(target=pid))
+    sim.schedule_event(timedelta(seconds=0), Start(target=Pid(2)))
+    order = [Pid(2), Pid(3), Pid(1), Pid(4), Pid(2)]
+    assert [timed.event.target for timed in sim.scheduled_events] == order
+    
+    processed = []
+    for _ in range(4):
+        previous = sim.current_configuration
+        sim.advance_step()
+        processed.extend(sim.current_configuration.changed_from(previous))
+    assert processed == order[:4]
+
+
+def test_schedulers():
+    """
+    Test that both schedulers return events in time order, FIFO for equal times.
+    """
+    for scheduler in [HeapScheduler(), CalendarScheduler()]:
+        entries = [(3, Start(Pid(1))), (1, Start(Pid(2))), (3, Start(Pid(3))), (1, Start(Pid(4))), (2, Start(Pid(5)))]
+        for time, event in entries:
+            scheduler.push(time, event)
+        expected = sorted(entries, key=lambda entry: entry[0])
+        assert len(scheduler) == 5
+        assert list(scheduler) == expected
+        popped = [scheduler.pop()]
+        scheduler.push(1, Start(Pid(6)))
+        while scheduler:
+            popped.append(scheduler.pop())
+        assert popped == [*expected[:2], (1, Start(Pid(6))), *expected[2:]]
+        assert len(scheduler) == 0
+
+
+def test_scheduler_choice():
+    """
+    Test that the scheduler is chosen according to the synchrony model, and does not affect the execution.
+    """
+    synchronous = Synchronous(fixed_delay=timedelta(seconds=1))
+    assert isinstance(run_learn(synchronous, Settings()).scheduler, CalendarScheduler)
+    assert isinstance(run_learn(Asynchronous(), Settings()).scheduler, HeapScheduler)
+    partially = PartiallySynchronous(gst=timedelta(seconds=1))
+    assert isinstance(run_learn(partially, Settings()).scheduler, HeapScheduler)
+    
+    calendar = run_learn(synchronous, Settings(enable_trace=True))
+    heap = run_learn(synchronous, Settings(enable_trace=True), scheduler=HeapScheduler())
+    assert isinstance(heap.scheduler, HeapScheduler)
+    assert calendar.trace == heap.trace
+
+
+def test_seeded_runs():
+    """
+    Test that the seed of a simulator determines its execution, with a shared or per-process streams.
+    """
+    synchrony = Asynchronous()
+    for settings in [Settings(enable_trace=True), Settings(enable_trace=True, rng_per_process=True)]:
+        traces = [run_learn(synchrony, settings, seed=seed).trace for seed in [1, 1, 2]]
+        assert traces[0] == traces[1]
+        assert traces[0] != traces[2]
+    shared = run_learn(synchrony, Settings(enable_trace=True), seed=1).trace
+    per_process = run_learn(synchrony, Settings(enable_trace=True, rng_per_process=True), seed=1).trace
+    assert shared != per_process
+    # NumPy is only used on request, so that seeded runs do not depend on whether it is installed
+    assert not run_learn(synchrony, Settings(), seed=1).rng.use_numpy
+    assert run_learn(synchrony, Settings(numpy_sampling=True), seed=1).rng.use_numpy
+
+
+def test_interned_values():
+    """
+    Test that interning shares equal values without changing the execution.
+    """
+    synchrony = Synchronous(fixed_delay=timedelta(seconds=1))
+    sim = run_learn(synchrony, Settings(enable_trace=True), size=8)
+    interned = run_learn(synchrony, Settings(enable_trace=True, intern_values=True), size=8)
+    assert interned.trace == sim.trace
+    stats = interned.interner.stats()
+    assert stats.hits > 0
+    assert stats.bytes_saved > 0
+    assert stats.values == len(interned.interner)
+    final = list(interned.current_configuration)
+    assert all(state.proc_known_i is final[0].proc_known_i for state in final)
+    assert all(state.channels_known_i is final[0].channels_known_i for state in final)
+
+
+def test_profiler(tmp_path: Path):
+    """
+    Test that profiling counts the phases of each step without changing the execution.
+    """
+    synchrony = Asynchronous()
+    sim = run_learn(synchrony, Settings(enable_trace=True), seed=1)
+    profiled = run_learn(synchrony, Settings(enable_trace=True, profile=True), seed=1)
+    assert sim.profiler is None
+    assert profiled.trace == sim.trace
+    profiler = profiled.profiler
+    steps = len(sim.trace.events_list)
+    assert profiler.steps == steps
+    assert profiler.phases['pop'][0] == profiler.phases['on_event'][0] == steps
+    assert profiler.phases['on_start'][0] == 6
+    assert sum(count for count, _ in profiler.event_classes.values()) == steps
+    assert sum(count for count, _ in profiler.processes.values()) == steps + 6
+    assert profiler.total_ns >= sum(ns for _, ns in profiler.phases.values())
+    assert "on_event" in profiler.summary()
+
+    path = tmp_path / "profile.folded"
+    profiler.write_collapsed(str(path))
+    lines = path.read_text().splitlines()
+    assert "simulator;on_event;Start" in {line.rsplit(" ", 1)[0] for line in lines}
+    assert all(int(line.rsplit(" ", 1)[1]) >= 0 for line in lines)
+
+
+def test_metrics():
+    """
+    Test that the streaming metrics match those computed from the trace.
+    """
+    synchrony = Synchronous(fixed_delay=timedelta(seconds=1))
+    sim = run_learn(synchrony, Settings(enable_trace=True), size=8)
+    collected = run_learn(synchrony, Settings(collect_metrics=True), size=8)
+    assert collected.trace is None
+    metrics = collected.metrics
+    events = [timed.event for timed in sim.trace.events_list]
+    messages = [event for event in events if isinstance(event, Message)]
+    assert metrics.messages == len(messages)
+    assert metrics.signals == len(events) - len(messages)
+    assert metrics.messages_by_type == Counter(type(message).__name__ for message in messages)
+    assert metrics.messages_by_channel == Counter(Channel(m.sender, m.target) for m in messages)
+    assert metrics.steps == metrics.events_processed == len(events)
+    assert metrics.in_flight == 0
+    assert 0 < metrics.max_in_flight <= metrics.max_queue_size
+    assert 0 < metrics.mean_queue_size <= metrics.max_queue_size
+    # every message takes one round
+    assert metrics.rounds == sim.current_time // timedelta(seconds=1)
+    assert metrics.last_time == sim.current_time
+    assert metrics.max_depth >= metrics.rounds + 1
+    assert metrics.as_dict()["messages"] == len(messages)
+
+    assert run_learn(synchrony, Settings(), size=8).metrics is None
+    sized = MetricsCollector(message_bits=lambda message: 8)
+    system = System(topology=Ring.of_size(8), synchrony=Asynchronous())
+    sim = Simulator.from_system(system, LearnGraphAlgorithm(system), seed=1)
+    sim.metrics = sized
+    sim.start()
+    sim.schedule_event(timedelta(seconds=0), Start(target=Pid(1)))
+    sim.run_to_completion()
+    assert sized.bits == 8 * sized.messages > 0
+
+
+def test_sub_tick_delays():
+    """
+    Test that delays shorter than a tick still deliver messages after the tick they were sent,
+    so that events are processed in the same order as with the default clock.
+    """
+    synchrony = Synchronous(fixed_delay=timedelta(microseconds=500))
+    assert synchrony.arrival_ticks_for(10, 2, 1_000) == [11, 11]
+    assert Asynchronous().arrival_ticks_for(10, 1, 1)[0] > 10
+    assert SynchronyModel.arrival_ticks_for(Asynchronous(base_delay=timedelta.resolution), 10, 3, 1) == [11] * 3
+    orders = []
+    for settings in [Settings(), Settings(ticks_per_second=1_000)]:
+        system = System(topology=Ring.of_size(5), synchrony=synchrony)
+        sim = Simulator.from_system(system, LearnGraphAlgorithm(system), settings=settings)
+        sim.start()
+        sim.schedule_event(timedelta(seconds=0), Start(target=Pid(1)))
+        order = []
+        while not sim.is_finished():
+            order.append(sim.scheduled_events[0].event)
+            sim.advance_step()
+        orders.append(order)
+    assert orders[0] == orders[1]
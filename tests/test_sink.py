@@ -0,0 +1,51 @@
+from datetime import timedelta
+from pathlib import Path
+
+from dapy.core import Pid, System, Ring, Synchronous
+from dapy.algo.learn import LearnGraphAlgorithm, Start
+from dapy.sim import FileTraceSink, Settings, Simulator, TraceReader
+
+
+def run_with_sink(sink: FileTraceSink) -> Simulator:
+    system = System(
+        topology=Ring.of_size(5),
+        synchrony=Synchronous(fixed_delay=timedelta(seconds=1)),
+    )
+    algorithm = LearnGraphAlgorithm(system)
+    sim = Simulator.from_system(system, algorithm, settings=Settings(enable_trace=True), sink=sink)
+    sim.start()
+    sim.schedule_event(timedelta(seconds=0), Start(target=Pid(1)))
+    sim.run_to_completion()
+    return sim
+
+
+def test_file_sink(tmp_path: Path):
+    for compress in [False, True]:
+        path = tmp_path / f"trace-{compress}.dapy"
+        with FileTraceSink(path, compress=compress, chunk_size=7, keyframe_interval=5) as sink:
+            sim = run_with_sink(sink)
+
+        with TraceReader(path) as reader:
+            assert reader.system == sim.system
+            assert reader.algorithm_name == sim.algorithm.name
+            assert len(reader) == len(sim.trace.history)
+            assert reader.event_count() == len(sim.trace.events_list)
+            assert list(reader.events()) == sim.trace.events_list
+            assert list(reader.history()) == sim.trace.history
+            for i in [0, 4, 5, 6, 13, len(reader) - 1, -1]:
+                assert reader[i] == sim.trace.history[i]
+            assert list(reader.history(start=12)) == sim.trace.history[12:]
+            assert reader.to_trace() == sim.trace
+
+
+def test_truncated_file(tmp_path: Path):
+    path = tmp_path / "trace.dapy"
+    with FileTraceSink(path, chunk_size=4, keyframe_interval=3) as sink:
+        sim = run_with_sink(sink)
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+
+    with TraceReader(path) as reader:
+        steps = len(reader)
+        assert 0 < steps < len(sim.trace.history)
+        assert list(reader.history()) == sim.trace.history[:steps]
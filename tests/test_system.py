@@ -0,0 +1,111 @@
+import pickle
+import random
+
+from datetime import timedelta
+
+from dapy.core import (
+    Asynchronous, NeighborCacheStats, PartiallySynchronous, Pid, ProcessSet, RandomStream, Ring,
+    StochasticExponential, Synchronous, System,
+)
+
+
+def test_synchronous_arrival_times():
+    model = Synchronous(fixed_delay=timedelta(seconds=2))
+    sent_at = timedelta(seconds=5)
+    assert model.arrival_times_for(sent_at, 3) == [timedelta(seconds=7)] * 3
+    assert model.arrival_times_for(sent_at, 0) == []
+
+
+def test_partially_synchronous_arrival_times():
+    model = PartiallySynchronous(fixed_delay=timedelta(seconds=1), gst=timedelta(seconds=10))
+    assert model.arrival_times_for(timedelta(seconds=10), 4) == [timedelta(seconds=11)] * 4
+    arrivals = model.arrival_times_for(timedelta(seconds=1), 50)
+    assert len(arrivals) == 50
+    assert all(arrival > timedelta(seconds=1) for arrival in arrivals)
+
+
+def test_random_arrival_times():
+    sent_at = timedelta(seconds=3)
+    for model in [
+        Asynchronous(base_delay=timedelta(seconds=1)),
+        StochasticExponential(delta_t=timedelta(milliseconds=10)),
+    ]:
+        arrivals = model.arrival_times_for(sent_at, 3000)
+        assert len(arrivals) == 3000
+        assert all(arrival >= sent_at + model.min_delay for arrival in arrivals)
+        assert len(set(arrivals)) > 1
+        assert model.arrival_time_for(sent_at) >= sent_at + model.min_delay
+
+
+def test_random_arrival_times_are_reproducible():
+    sent_at = timedelta(seconds=0)
+    samples = []
+    for _ in range(2):
+        random.seed(42)
+        model = Asynchronous()
+        samples.append([*model.arrival_times_for(sent_at, 10), model.arrival_time_for(sent_at)])
+    assert samples[0] == samples[1]
+    
+    # the default stream is not carried over by pickling
+    model2 = pickle.loads(pickle.dumps(model))
+    assert model2 == model
+    assert '_rng' in model.__dict__
+    assert '_rng' not in model2.__dict__
+
+
+def test_random_streams():
+    """
+    Test that explicit streams determine the delays, independently of the `random` module.
+    """
+    sent_at = timedelta(seconds=0)
+    for model in [
+        Asynchronous(),
+        StochasticExponential(),
+        PartiallySynchronous(fixed_delay=timedelta(seconds=1), gst=timedelta(seconds=10)),
+    ]:
+        samples = []
+        for seed in [7, 7, 8]:
+            random.seed(seed)
+            random.random()
+            samples.append(model.arrival_times_for(sent_at, 20, RandomStream(7)))
+        assert samples[0] == samples[1] == samples[2]
+        assert model.arrival_times_for(sent_at, 20, RandomStream(8)) != samples[0]
+        
+    stream = RandomStream(3)
+    stream.random.random()
+    assert stream.split("a").random.random() == RandomStream(3).split("a").random.random()
+    assert stream.split("a").seed != stream.split("b").seed
+    stream2 = pickle.loads(pickle.dumps(stream))
+    assert stream2.seed == 3
+    assert stream2.random.random() == RandomStream(3).random.random()
+    
+    # seeded delays do not depend on whether NumPy is installed, unless it is opted in
+    reference = random.Random(7)
+    model = Asynchronous()
+    expected = [model.min_delay + model.base_delay * (reference.expovariate(2) + reference.uniform(0, 1))
+                for _ in range(20)]
+    assert RandomStream(7).numpy is None and RandomStream(7).split("a").numpy is None
+    assert model.arrival_times_for(sent_at, 20, RandomStream(7)) == expected
+    numpy_stream = pickle.loads(pickle.dumps(RandomStream(7, use_numpy=True)))
+    assert numpy_stream.use_numpy and numpy_stream.split("a").use_numpy
+
+
+def test_neighbor_cache():
+    system = System(topology=Ring.of_size(10))
+    assert system.neighbors_of(Pid(1)) == ProcessSet([Pid(2), Pid(10)])
+    assert system.neighbor_cache_stats() == NeighborCacheStats(hits=0, misses=1, size=0)
+
+    system.precompute_neighbors()
+    neighbors = system.neighbors_of(Pid(3))
+    assert neighbors == ProcessSet([Pid(2), Pid(4)])
+    assert system.neighbors_of(Pid(3)) is neighbors
+    stats = system.neighbor_cache_stats(reset=True)
+    assert stats == NeighborCacheStats(hits=2, misses=1, size=10)
+    assert stats.hit_rate == 2 / 3
+    assert system.neighbor_cache_stats().hit_rate == 0.0
+
+    # the cache is not part of the system
+    assert system == System(topology=Ring.of_size(10))
+    copy = pickle.loads(pickle.dumps(system))
+    assert copy == system
+    assert copy.neighbor_cache_stats().size == 0
@@ -1,4 +1,6 @@
+import pickle
 import pytest
+from pathlib import Path
 from typing import Optional
 
 from dapy.core.topology import Pid, ProcessSet, Channel, NetworkTopology, CompleteGraph, Ring, Star, Arbitrary
@@ -181,4 +183,225 @@ def test_arbitrary():
     topology = Arbitrary.from_(channels, directed=False)
     _check_any_topology(topology, 3, processes)
     _check_ring_validity(topology, 3, processes)
-    
\ No newline at end of file
+    
+
+def test_csr(monkeypatch: pytest.MonkeyPatch):
+    """
+    Test the CSRTopology topology, with and without NumPy.
+    """
+    from dapy.core import topology as module
+    from dapy.core.topology import CSRTopology
+    
+    for numpy in {module._np, None}:
+        monkeypatch.setattr(module, "_np", numpy)
+        
+        # undirected ring of 5 processes, with duplicate edges
+        edges = [(i, i % 5 + 1) for i in range(1, 6)] + [(2, 1), (Pid(1), Pid(2))]
+        topology = CSRTopology.from_edges(edges, directed=False)
+        _check_any_topology(topology, 5)
+        _check_ring_validity(topology, 5)
+        assert topology.edge_count() == 10
+        assert topology.degree(Pid(3)) == 2
+        assert topology.position_of(Pid(3)) == 2 and topology.pid_at(2) == Pid(3)
+        view = topology.neighbor_positions(2)
+        assert isinstance(view, memoryview) and view.obj is topology._targets
+        assert list(view) == [1, 3]
+        
+        # directed graph with non-contiguous ids and an isolated process
+        topology = CSRTopology.from_edges([Channel(Pid(10), Pid(30)), (Pid(30), Pid(20))], processes=[Pid(40)])
+        processes = ProcessSet({Pid(10), Pid(20), Pid(30), Pid(40)})
+        _check_any_topology(topology, 4, processes)
+        assert topology.neighbors_of(Pid(10)) == ProcessSet(Pid(30))
+        assert topology.neighbors_of(Pid(20)) == ProcessSet()
+        assert topology.degree(Pid(40)) == 0
+        assert Pid(25) not in topology
+        with pytest.raises(ValueError):
+            topology.neighbors_of(Pid(25))
+        
+        # conversion from another topology
+        star = Star.of_size(6)
+        topology = CSRTopology.from_topology(star)
+        for pid in star:
+            assert topology.neighbors_of(pid) == star.neighbors_of(pid)
+
+
+def test_csr_files(tmp_path: Path):
+    """
+    Test reading topologies from text files, and saving and memory-mapping them.
+    """
+    import pickle
+    from dapy.core.topology import CSRTopology
+    
+    path = tmp_path / "edges.txt"
+    path.write_text("# ring\n1 2\n2,3,0.5\n\n3 1\n4\n")
+    topology = CSRTopology.read_edge_list(path, directed=False)
+    processes = ProcessSet(Pid(i) for i in range(1, 5))
+    _check_any_topology(topology, 4, processes)
+    assert topology.neighbors_of(Pid(1)) == ProcessSet({Pid(2), Pid(3)})
+    assert topology.degree(Pid(4)) == 0
+    
+    path = tmp_path / "adjacency.txt"
+    path.write_text("1 2 3\n2 3\n3\n")
+    adjacency = CSRTopology.read_adjacency_list(path)
+    assert adjacency.neighbors_of(Pid(1)) == ProcessSet({Pid(2), Pid(3)})
+    assert adjacency.neighbors_of(Pid(3)) == ProcessSet()
+    
+    path = tmp_path / "topology.csr"
+    topology.save(path)
+    for use_mmap in [True, False]:
+        loaded = CSRTopology.load(path, use_mmap=use_mmap)
+        assert isinstance(loaded._targets, memoryview) == use_mmap
+        assert loaded == topology
+        for pid in topology:
+            assert loaded.neighbors_of(pid) == topology.neighbors_of(pid)
+        assert pickle.loads(pickle.dumps(loaded)) == topology
+    CSRTopology.load(path).save(tmp_path / "copy.csr")
+    assert (tmp_path / "copy.csr").read_bytes() == path.read_bytes()
+    
+    path.write_bytes(b"NOTATOPOLOGY" * 4)
+    with pytest.raises(ValueError):
+        CSRTopology.load(path)
+
+
+def _check_undirected(topology: NetworkTopology):
+    for pid in topology:
+        for neighbor in topology.neighbors_of(pid):
+            assert pid in topology.neighbors_of(neighbor)
+
+
+def test_implicit_topologies():
+    """
+    Test the grid, torus, hypercube and k-ary tree topologies.
+    """
+    from dapy.core import Grid, Hypercube, KaryTree, Torus
+    
+    grid = Grid.of_size(3, 4)
+    _check_any_topology(grid, 12)
+    _check_undirected(grid)
+    assert grid.neighbors_of(Pid(1)) == ProcessSet({Pid(2), Pid(5)})
+    assert grid.neighbors_of(Pid(6)) == ProcessSet({Pid(2), Pid(5), Pid(7), Pid(10)})
+    torus = Torus.of_size(3, 4, 5)
+    _check_any_topology(torus, 60)
+    _check_undirected(torus)
+    assert all(torus.degree(pid) == 6 for pid in torus)
+    assert Torus.of_size(2, 1).neighbors_of(Pid(1)) == ProcessSet(Pid(2))
+    with pytest.raises(ValueError):
+        grid.neighbors_of(Pid(13))
+    
+    cube = Hypercube.of_size(4)
+    _check_any_topology(cube, 16)
+    _check_undirected(cube)
+    assert cube.neighbors_of(Pid(1)) == ProcessSet({Pid(2), Pid(3), Pid(5), Pid(9)})
+    
+    tree = KaryTree.of_size(10, arity=3)
+    _check_any_topology(tree, 10)
+    _check_undirected(tree)
+    assert tree.neighbors_of(Pid(1)) == ProcessSet({Pid(2), Pid(3), Pid(4)})
+    assert tree.neighbors_of(Pid(3)) == ProcessSet({Pid(1), Pid(8), Pid(9), Pid(10)})
+    assert tree.neighbors_of(Pid(4)) == ProcessSet(Pid(1))
+
+
+def test_random_topologies():
+    """
+    Test that random graphs have the expected structure and only depend on their seed.
+    """
+    from dapy.core import BarabasiAlbert, ErdosRenyi, RandomRegular
+    
+    for make in [
+        lambda seed: ErdosRenyi.of_size(200, 0.05, seed=seed),
+        lambda seed: BarabasiAlbert.of_size(200, 3, seed=seed),
+        lambda seed: RandomRegular.of_size(200, 4, seed=seed),
+    ]:
+        topology = make(1)
+        _check_any_topology(topology, 200)
+        _check_undirected(topology)
+        assert topology == make(1)
+        assert topology != make(2)
+        copy = pickle.loads(pickle.dumps(topology))
+        assert copy == topology and type(copy) is type(topology)
+        
+    assert all(RandomRegular.of_size(200, 4, seed=1).degree(pid) == 4 for pid in Ring.of_size(200))
+    assert all(RandomRegular.of_size(6, 5, seed=1).degree(pid) == 5 for pid in Ring.of_size(6))
+    assert BarabasiAlbert.of_size(200, 3, seed=1).edge_count() == 2 * 3 * 197
+    edges = ErdosRenyi.of_size(200, 0.05, seed=1).edge_count() // 2
+    assert 0.8 * 995 < edges < 1.2 * 995
+    assert ErdosRenyi.of_size(10, 1).edge_count() == 90
+    assert ErdosRenyi.of_size(10, 0).edge_count() == 0
+
+
+def _brute_force_diameter(topology: NetworkTopology) -> int:
+    return max(len(topology.bfs_layers(pid)) - 1 for pid in topology)
+
+
+def test_analytics():
+    """
+    Test breadth-first layers, eccentricities, diameters and degree histograms.
+    """
+    from dapy.core import BarabasiAlbert, CSRTopology, ErdosRenyi, Grid, Hypercube, KaryTree, RandomRegular, Torus
+    
+    grid = Grid.of_size(3, 3)
+    assert grid.bfs_layers([Pid(1), Pid(9)]) == [
+        [Pid(1), Pid(9)], [Pid(2), Pid(4), Pid(6), Pid(8)], [Pid(3), Pid(5), Pid(7)],
+    ]
+    assert grid.bfs_layers(Pid(5)) == [[Pid(5)], [Pid(2), Pid(4), Pid(6), Pid(8)], [Pid(1), Pid(3), Pid(7), Pid(9)]]
+    assert grid.eccentricity(Pid(1)) == 4
+    assert grid.eccentricity(Pid(5)) == 2
+    assert grid.degree_histogram() == {2: 4, 3: 4, 4: 1}
+    with pytest.raises(ValueError):
+        grid.bfs_layers(Pid(10))
+    
+    for topology, diameter in [
+        (Ring.of_size(7), 3),
+        (Ring.of_size(7, directed=True), 6),
+        (Star.of_size(5), 2),
+        (CompleteGraph.of_size(6), 1),
+        (CompleteGraph.of_size(1), 0),
+        (Grid.of_size(4, 6), 8),
+        (Torus.of_size(4, 6), 5),
+        (Hypercube.of_size(5), 5),
+        (KaryTree.of_size(40, arity=3), 6),
+        (Arbitrary.from_([(1, 2), (2, 3), (3, 4), (4, 5), (5, 1), (2, 5)], directed=False), 2),
+        (CSRTopology.from_topology(Grid.of_size(5, 5)), 8),
+        (CSRTopology.from_topology(Torus.of_size(4, 7)), 5),
+        (CSRTopology.from_topology(Ring.of_size(7, directed=True)), 6),
+    ]:
+        assert topology.diameter() == diameter
+    
+    for topology in [
+        BarabasiAlbert.of_size(300, 2, seed=1),
+        RandomRegular.of_size(200, 3, seed=2),
+        ErdosRenyi.of_size(200, 0.05, seed=3),
+    ]:
+        assert topology.diameter() == _brute_force_diameter(topology)
+        assert sum(topology.degree_histogram().values()) == len(topology)
+    
+    # the bounds of iFUB only meet on some graphs after whole layers are searched
+    assert ErdosRenyi.of_size(56, 0.15, seed=0).diameter() == 4
+    for seed in range(25):
+        for size in (12, 31, 56):
+            for topology in [
+                ErdosRenyi.of_size(size, 6 / size, seed=seed),
+                BarabasiAlbert.of_size(size, 1 + seed % 3, seed=seed),
+                RandomRegular.of_size(size, 4 if size % 2 else 3 + seed % 2, seed=seed),
+            ]:
+                if sum(map(len, topology.bfs_layers(Pid(1)))) == size:
+                    assert topology.diameter() == _brute_force_diameter(topology)
+    
+    assert CompleteGraph.of_size(50).degree_histogram() == {49: 50}
+    assert RandomRegular.of_size(100, 3, seed=1).degree_histogram() == {3: 100}
+    with pytest.raises(ValueError):
+        ErdosRenyi.of_size(10, 0).diameter()
+    with pytest.raises(ValueError):
+        Arbitrary.from_([(1, 2), (2, 3)]).eccentricity(Pid(3))
+    
+    # results are cached on the topology, but not part of it
+    tree = KaryTree.of_size(40, arity=3)
+    assert tree.diameter() == 6
+    assert tree._analytics['diameter'] == 6
+    layers = tree.bfs_layers([Pid(2), Pid(1)])
+    assert tree._analytics['bfs_layers'].keys() == {frozenset({0, 1})}
+    layers[0].clear()
+    assert tree.bfs_layers({Pid(1), Pid(2)}) == tree.bfs_layers([Pid(1), Pid(2), Pid(1)]) != layers
+    assert len(tree._analytics['bfs_layers']) == 1
+    assert tree == KaryTree.of_size(40, arity=3)
+    assert '_analytics' not in pickle.loads(pickle.dumps(tree)).__dict__
@@ -1,13 +1,13 @@
 import pytest
 
-from dapy.core import Pid, System, Ring, Synchronous
+from dapy.core import Asynchronous, ChannelSet, CompleteGraph, Pid, System, Ring, Synchronous
+from dapy.core.topology import Arbitrary, CSRTopology
 from dapy.algo.learn import LearnGraphAlgorithm, Start
-from dapy.sim import Simulator, Settings, Trace
+from dapy.sim import DeltaHistory, Simulator, Settings, Trace
 from datetime import timedelta
 
 
-def generate_trace():
-    settings = Settings(enable_trace=True)
+def generate_trace(settings: Settings = Settings(enable_trace=True)):
     
     # define system, algorithm and simulator
     system = System(
@@ -43,6 +43,28 @@ def test_trace_generation_json():
     trace2 = Trace.load_json(trace_json)
     assert trace2 == trace
 
+def test_trace_json_values():
+    """
+    Test that JSON traces round-trip the slotted values, sets, views and cached fields of the core types.
+    """
+    for topology in [
+        CompleteGraph.of_size(4),
+        Arbitrary.from_([(1, 2), (2, 3), (3, 1), (3, 4)], directed=False),
+        CSRTopology.from_topology(Ring.of_size(4)),
+    ]:
+        system = System(topology=topology, synchrony=Asynchronous())
+        topology.diameter()
+        system.neighbors_of(Pid(1))
+        sim = Simulator.from_system(system, LearnGraphAlgorithm(system), settings=Settings(enable_trace=True), seed=1)
+        sim.start()
+        sim.schedule_event(timedelta(seconds=0), Start(target=Pid(1)))
+        sim.run_to_completion()
+        trace = Trace.load_json(sim.trace.dump_json())
+        assert trace == sim.trace
+        assert trace.history[-1].configuration == sim.current_configuration
+        assert all(isinstance(state.channels_known_i, ChannelSet) for state in trace.history[-1].configuration)
+    
+
 def test_trace_generation_pickle():
     trace = generate_trace()
     
@@ -50,7 +72,28 @@ def test_trace_generation_pickle():
     trace2 = Trace.load_pickle(trace_bytes)
     assert trace2 == trace
 
+def test_delta_trace():
+    trace = generate_trace()
+    delta_trace = generate_trace(Settings(enable_trace=True, delta_trace=True, keyframe_interval=4))
+    assert isinstance(delta_trace.history, DeltaHistory)
+    assert delta_trace.history == trace.history
+    assert delta_trace == trace
+    assert list(delta_trace.history) == trace.history
+    for i in reversed(range(len(trace.history))):
+        assert delta_trace.history[i] == trace.history[i]
+    for i in range(1, len(trace.history)):
+        expected = list(trace.history[i].configuration.changed_from(trace.history[i-1].configuration))
+        changed = delta_trace.history[i].configuration.changed_from(delta_trace.history[i-1].configuration)
+        assert list(changed) == expected
+        assert [state.pid for state in delta_trace.history.delta(i)] == expected
+    assert delta_trace.history[-1] == trace.history[-1]
+    assert delta_trace.history[2:5] == trace.history[2:5]
+    
+    trace2 = Trace.load_pickle(delta_trace.dump_pickle())
+    assert trace2 == trace
+
 
 if __name__ == "__main__":
     test_trace_generation_json()
     test_trace_generation_pickle()
+    test_delta_trace()